@@ -1,17 +1,173 @@
 const API_URL = import.meta.env.VITE_API_URL || 'http://localhost:8080';
 
+// Each browser keeps its own save on the server, keyed by this id.
+function getSessionId() {
+  let sessionId = localStorage.getItem('minima_session_id');
+  if (!sessionId) {
+    sessionId = crypto.randomUUID();
+    localStorage.setItem('minima_session_id', sessionId);
+  }
+  return sessionId;
+}
+
+function sessionHeaders(extra = {}) {
+  return { 'X-Session-Id': getSessionId(), ...extra };
+}
+
+// Last full state the server sent us. Requests ask for changes since its
+// version and the server answers with JSON-patch ops instead of the state.
+let cachedState = null;
+let cachedVersion = null;
+
+function stateUrl(path) {
+  return cachedVersion === null ? `${API_URL}${path}` : `${API_URL}${path}?since=${cachedVersion}`;
+}
+
+function applyPatch(document, ops) {
+  let result = structuredClone(document);
+  for (const op of ops) {
+    if (op.path === '') {
+      result = structuredClone(op.value);
+      continue;
+    }
+    const tokens = op.path.split('/').slice(1).map((t) => t.replace(/~1/g, '/').replace(/~0/g, '~'));
+    const last = tokens.pop();
+    const parent = tokens.reduce((node, token) => node[Array.isArray(node) ? Number(token) : token], result);
+    if (Array.isArray(parent)) {
+      const index = last === '-' ? parent.length : Number(last);
+      if (op.op === 'add') parent.splice(index, 0, structuredClone(op.value));
+      else if (op.op === 'remove') parent.splice(index, 1);
+      else parent[index] = structuredClone(op.value);
+    } else if (op.op === 'remove') {
+      delete parent[last];
+    } else {
+      parent[last] = structuredClone(op.value);
+    }
+  }
+  return result;
+}
+
+// Node text/choices are static and cached by content hash; /state only sends
+// {node_id, node_hash, choices: [available choice indices]}.
+const nodeCache = new Map();
+
+async function fetchNode(nodeId, nodeHash) {
+  const key = `${nodeId}:${nodeHash}`;
+  if (!nodeCache.has(key)) {
+    const request = fetch(`${API_URL}/nodes/${encodeURIComponent(nodeId)}?v=${nodeHash}`)
+      .then((response) => {
+        if (!response.ok) throw new Error('Failed to fetch node');
+        return response.json();
+      });
+    nodeCache.set(key, request);
+    request.catch(() => nodeCache.delete(key));
+  }
+  return nodeCache.get(key);
+}
+
+// Expand the node reference into the {node_id, text, choices} the UI renders.
+async function hydrate(state) {
+  const ref = state?.narrative;
+  if (!ref?.node_hash) return state;
+  const node = await fetchNode(ref.node_id, ref.node_hash);
+  const choices = ref.choices.map((index) => ({ ...node.choices[index], _index: index }));
+  return { ...state, narrative: { node_id: ref.node_id, text: node.text || '', choices } };
+}
+
+// Turn any versioned response (full state, delta or resync) into the full state.
+async function resolveState(payload) {
+  const { version, ...rest } = payload;
+  if (rest.ops && rest.since !== cachedVersion) {
+    // Another reply moved our cache on since this request was sent
+    cachedState = null;
+    cachedVersion = null;
+    return fetchGameState();
+  }
+  let state;
+  if (rest.ops) {
+    state = applyPatch(cachedState, rest.ops);
+  } else if (rest.state) {
+    state = rest.state;
+  } else {
+    state = rest;
+  }
+  cachedState = state;
+  cachedVersion = version;
+  return hydrate(state);
+}
+
+// Actions go over a single WebSocket while it is open; HTTP is the fallback.
+const WS_URL = API_URL.replace(/^http/, 'ws');
+const SOCKET_RETRY_MS = 5000;
+let socket = null;
+let socketOpening = null;
+let socketRetryAt = 0;
+let nextMessageId = 1;
+const pendingReplies = new Map();
+
+function openSocket() {
+  if (socket?.readyState === WebSocket.OPEN) return Promise.resolve(socket);
+  if (socketOpening) return socketOpening;
+  if (typeof WebSocket === 'undefined' || Date.now() < socketRetryAt) return Promise.resolve(null);
+
+  socketOpening = new Promise((resolve) => {
+    const ws = new WebSocket(`${WS_URL}/ws?session_id=${encodeURIComponent(getSessionId())}`);
+    ws.onopen = () => {
+      socket = ws;
+      socketOpening = null;
+      resolve(ws);
+    };
+    ws.onerror = () => {
+      socketRetryAt = Date.now() + SOCKET_RETRY_MS;
+      socketOpening = null;
+      resolve(null);
+    };
+    ws.onclose = () => {
+      if (socket === ws) socket = null;
+      // The action may or may not have been applied, so don't retry it over HTTP
+      for (const { reject } of pendingReplies.values()) reject(new Error('Connection lost'));
+      pendingReplies.clear();
+    };
+    ws.onmessage = (event) => {
+      const reply = JSON.parse(event.data);
+      const pending = pendingReplies.get(reply.id);
+      if (!pending) return;
+      pendingReplies.delete(reply.id);
+      if (reply.ok) pending.resolve(reply);
+      else pending.reject(new Error(reply.error || 'Request failed'));
+    };
+  });
+  return socketOpening;
+}
+
+// Resolves to the server's reply, or null if no socket is available.
+async function socketRequest(type, body = {}) {
+  const ws = await openSocket();
+  if (!ws) return null;
+  const id = nextMessageId++;
+  const reply = new Promise((resolve, reject) => pendingReplies.set(id, { resolve, reject }));
+  ws.send(JSON.stringify({ id, type, since: cachedVersion, ...body }));
+  return reply;
+}
+
 export async function fetchGameState() {
-  const response = await fetch(`${API_URL}/state`);
+  const reply = await socketRequest('state');
+  if (reply) return await resolveState(reply.state);
+
+  const response = await fetch(stateUrl('/state'), { headers: sessionHeaders() });
   if (!response.ok) {
     throw new Error('Failed to fetch game state');
   }
-  return response.json();
+  return await resolveState(await response.json());
 }
 
 export async function makeChoice(choiceIndex) {
-  const response = await fetch(`${API_URL}/choice`, {
+  const reply = await socketRequest('choice', { choice_index: choiceIndex });
+  if (reply) return { ...reply.result, new_state: await resolveState(reply.state) };
+
+  const response = await fetch(stateUrl('/choice'), {
     method: 'POST',
-    headers: { 'Content-Type': 'application/json' },
+    headers: sessionHeaders({ 'Content-Type': 'application/json' }),
     body: JSON.stringify({ choice_index: choiceIndex }),
   });
   
@@ -19,13 +175,17 @@ export async function makeChoice(choiceIndex) {
     const error = await response.json();
     throw new Error(error.detail || 'Failed to make choice');
   }
-  return response.json();
+  const result = await response.json();
+  return { ...result, new_state: await resolveState(result.new_state) };
 }
 
 export async function allocateStat(statName) {
-  const response = await fetch(`${API_URL}/allocate`, {
+  const reply = await socketRequest('allocate', { stat_name: statName });
+  if (reply) return await resolveState(reply.state);
+
+  const response = await fetch(stateUrl('/allocate'), {
     method: 'POST',
-    headers: { 'Content-Type': 'application/json' },
+    headers: sessionHeaders({ 'Content-Type': 'application/json' }),
     body: JSON.stringify({ stat_name: statName }),
   });
   
@@ -33,26 +193,29 @@ export async function allocateStat(statName) {
     const error = await response.json();
     throw new Error(error.detail || 'Failed to allocate stat');
   }
-  return response.json();
+  return await resolveState(await response.json());
 }
 
 export async function resetGame() {
-  const response = await fetch(`${API_URL}/reset`, {
+  const response = await fetch(stateUrl('/reset'), {
     method: 'POST',
-    headers: { 'Content-Type': 'application/json' },
+    headers: sessionHeaders({ 'Content-Type': 'application/json' }),
     body: JSON.stringify({ confirm: true }),
   });
   
   if (!response.ok) {
     throw new Error('Failed to reset game');
   }
-  return response.json();
+  return await resolveState(await response.json());
 }
 
 export async function sendCombatAction(action) {
-  const response = await fetch(`${API_URL}/combat/action`, {
+  const reply = await socketRequest('combat_action', { action });
+  if (reply) return await resolveState(reply.state);
+
+  const response = await fetch(stateUrl('/combat/action'), {
     method: 'POST',
-    headers: { 'Content-Type': 'application/json' },
+    headers: sessionHeaders({ 'Content-Type': 'application/json' }),
     body: JSON.stringify({ action }),
   });
   
@@ -60,21 +223,25 @@ export async function sendCombatAction(action) {
      const error = await response.json();
      throw new Error(error.detail || 'Failed to perform action');
   }
-  return response.json();
+  return await resolveState(await response.json());
 }
 
 export async function debugStartCombat() {
-  const response = await fetch(`${API_URL}/debug/combat`, {
+  const response = await fetch(stateUrl('/debug/combat'), {
     method: 'POST',
+    headers: sessionHeaders(),
   });
   if (!response.ok) return;
-  return response.json();
+  return await resolveState(await response.json());
 }
 
 export async function equipItem(itemIndex) {
-  const response = await fetch(`${API_URL}/equip`, {
+  const reply = await socketRequest('equip', { item_index: itemIndex });
+  if (reply) return await resolveState(reply.state);
+
+  const response = await fetch(stateUrl('/equip'), {
     method: 'POST',
-    headers: { 'Content-Type': 'application/json' },
+    headers: sessionHeaders({ 'Content-Type': 'application/json' }),
     body: JSON.stringify({ item_index: itemIndex }),
   });
   
@@ -82,5 +249,5 @@ export async function equipItem(itemIndex) {
      const error = await response.json();
      throw new Error(error.detail || 'Failed to equip item');
   }
-  return response.json();
+  return await resolveState(await response.json());
 }
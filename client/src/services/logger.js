@@ -1,9 +1,18 @@
 const API_URL = import.meta.env.VITE_API_URL || 'http://localhost:8080';
 
+// Entries are queued and sent together to /log/batch
+const FLUSH_INTERVAL_MS = 2000;
+const MAX_BATCH_SIZE = 50;
+
 class LoggerService {
   constructor() {
     this.originalConsoleError = console.error;
     this.originalConsoleLog = console.log;
+    this.queue = [];
+    this.flushTimer = null;
+
+    // Send whatever is left when the tab is hidden or closed
+    window.addEventListener('pagehide', () => this.flush({ keepalive: true }));
     
     // Override console methods to capture logs
     console.error = (...args) => {
@@ -28,28 +37,43 @@ class LoggerService {
     };
   }
 
-  async log(level, message) {
+  log(level, message) {
     try {
       if (typeof message !== 'string') {
         message = JSON.stringify(message);
       }
       
       const timestamp = new Date().toISOString();
-      
-      // Fire and forget - don't await to avoid blocking UI
-      fetch(`${API_URL}/log`, {
-        method: 'POST',
-        headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify({ level, message, timestamp }),
-      }).catch(err => {
-        // Fallback to original console if server is unreachable to avoid infinite loop
-        this.originalConsoleError('Failed to send log to server:', err);
-      });
-      
+      this.queue.push({ level, message, timestamp });
+
+      if (this.queue.length >= MAX_BATCH_SIZE) {
+        this.flush();
+      } else if (!this.flushTimer) {
+        this.flushTimer = setTimeout(() => this.flush(), FLUSH_INTERVAL_MS);
+      }
     } catch (e) {
       this.originalConsoleError('Logger internal error:', e);
     }
   }
+
+  flush({ keepalive = false } = {}) {
+    clearTimeout(this.flushTimer);
+    this.flushTimer = null;
+    if (this.queue.length === 0) return;
+
+    const entries = this.queue.splice(0, this.queue.length);
+      
+    // Fire and forget - don't await to avoid blocking UI
+    fetch(`${API_URL}/log/batch`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify({ entries }),
+      keepalive,
+    }).catch(err => {
+      // Fallback to original console if server is unreachable to avoid infinite loop
+      this.originalConsoleError('Failed to send logs to server:', err);
+    });
+  }
 }
 
 export const logger = new LoggerService();
@@ -0,0 +1,67 @@
+"""
+XP Minima RPG - Content Analyzer
+
+Checks the merged node graph from the start node: unreachable nodes, dead
+ends, flag/item soft-locks, and the minimum stats needed to reach each node
+with the starting free stat points.
+
+Usage: python analyze_content.py [--budget 5] [--start intro_01] [--json] [--strict]
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from engine.state_manager import StateManager
+from engine.graph_analyzer import analyze_graph
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Reachability and dead-end analysis for story nodes")
+    parser.add_argument("--budget", type=int, help="Free stat points to spend (default: the template's)")
+    parser.add_argument("--start", default="intro_01", help="Start node ID")
+    parser.add_argument("--json", action="store_true", help="Print the full report as JSON")
+    parser.add_argument("--strict", action="store_true", help="Exit 1 if any problem is found")
+    args = parser.parse_args()
+
+    settings_path = Path(__file__).parent / "config" / "settings.json"
+    state_manager = StateManager(str(settings_path))
+    enemies = state_manager.load_enemies()
+    graph = state_manager.load_node_graph(enemy_ids={enemy["id"] for enemy in enemies})
+    template = state_manager._load_json(str(state_manager.player_state_path.parent / "player_template.json"))
+
+    budget = args.budget if args.budget is not None else template["stats"].get("free_stat_points", 0)
+    report = analyze_graph(graph.nodes, template["stats"], budget, start=args.start)
+
+    if args.json:
+        print(json.dumps(report.to_dict(), indent=2))
+    else:
+        print(f"{len(graph.nodes)} nodes, {len(report.reachable)} reachable from {report.start} "
+              f"with {budget} stat points ({report.states_explored} states explored)")
+        sections = [
+            ("Unreachable", report.unreachable),
+            ("Dead ends", report.dead_ends),
+            ("Soft-locks (no usable choice for some flags/items)", report.soft_locks)
+        ]
+        for title, node_ids in sections:
+            if node_ids:
+                print(f"\n{title}:")
+                for node_id in node_ids:
+                    print(f"  {node_id:<28} {graph.sources.get(node_id, '')}")
+        if report.over_budget:
+            print("\nNeeds more stat points than the budget:")
+            for node_id, points in report.over_budget.items():
+                stats = ", ".join(f"{name} {value}" for name, value in report.min_stats[node_id].items())
+                print(f"  {node_id:<28} {points:>3} points ({stats})")
+
+    if args.strict and not report.ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
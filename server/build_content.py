@@ -0,0 +1,47 @@
+"""
+XP Minima RPG - Content Bundle Builder
+
+Validates every node, enemy and item file and compiles them into the binary
+bundle the server loads at startup (see engine/content_bundle.py). Re-run
+after editing content; until then the server notices the bundle is stale
+and loads the JSON instead.
+
+Usage: python build_content.py [--output data/content.bundle]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from engine.state_manager import StateManager
+from engine.node_graph import ContentValidationError
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Compile static content into a binary bundle")
+    parser.add_argument("--output", type=Path, help="Bundle path (default: paths.content_bundle)")
+    args = parser.parse_args()
+
+    settings_path = Path(__file__).parent / "config" / "settings.json"
+    state_manager = StateManager(str(settings_path))
+    output = args.output or state_manager.content_bundle_path
+
+    start = time.perf_counter()
+    try:
+        size = state_manager.build_content_bundle(output)
+    except ContentValidationError as e:
+        print(f"[ERROR] {e}")
+        sys.exit(1)
+    elapsed = time.perf_counter() - start
+
+    sources = len(state_manager.content_source_files())
+    print(f"Wrote {output} ({size:,} bytes from {sources} files) in {elapsed * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,7 +5,13 @@ Encapsulates combat mechanics, turn order, and battle outcomes.
 
 from typing import Dict, Any, Optional, List
 from enum import Enum
+import json
 import random
+import secrets
+from bisect import bisect_right
+
+from engine.item_registry import ITEM_REGISTRY
+from engine.stats import StatBlock, json_default
 
 
 class CombatAction(Enum):
@@ -20,27 +26,52 @@ class CombatAction(Enum):
 class Enemy:
     """Represents an enemy in combat."""
     
+    __slots__ = ("name", "stats", "exp_reward", "loot", "is_alive", "enemy_id")
+    
     def __init__(self, name: str, hp: int, attack_power: int, defence: int, 
-                 exp_reward: int, loot: Optional[List[Dict[str, Any]]] = None):
+                 exp_reward: int, loot: Optional[List[Dict[str, Any]]] = None,
+                 enemy_id: Optional[str] = None):
         self.name = name
-        self.max_hp = hp
-        self.hp = hp
-        self.attack_power = attack_power
-        self.defence = defence
+        self.enemy_id = enemy_id  # Template ID, needed to replay the fight
+        self.stats = StatBlock()
+        self.stats.max_hp = hp
+        self.stats.hp = hp
+        self.stats.attack_power = attack_power
+        self.stats.defence = defence
         self.exp_reward = exp_reward
         self.loot = loot or []
         self.is_alive = True
     
+    @property
+    def hp(self) -> int:
+        return self.stats.hp
+    
+    @hp.setter
+    def hp(self, value: int) -> None:
+        self.stats.hp = value
+    
+    @property
+    def max_hp(self) -> int:
+        return self.stats.max_hp
+    
+    @property
+    def attack_power(self) -> int:
+        return self.stats.attack_power
+    
+    @property
+    def defence(self) -> int:
+        return self.stats.defence
+    
     def take_damage(self, damage: int) -> None:
         """Apply damage to enemy."""
         self.hp = max(0, self.hp - damage)
         if self.hp <= 0:
             self.is_alive = False
     
-    def get_action(self) -> CombatAction:
+    def get_action(self, rng: Optional[random.Random] = None) -> CombatAction:
         """Enemy AI: choose an action."""
         # Simple AI: attack with 70% chance, defend with 30%
-        return CombatAction.ATTACK if random.random() < 0.7 else CombatAction.DEFEND
+        return CombatAction.ATTACK if (rng or random).random() < 0.7 else CombatAction.DEFEND
 
 
 from dataclasses import dataclass, field
@@ -52,18 +83,53 @@ class CombatState:
     turn_count: int = 0
     is_active: bool = True
     victory: bool = False
+    # Every random roll in the fight comes from rng, seeded with seed, so
+    # (enemy_id, seed, actions) is enough to replay it exactly.
+    seed: int = 0
+    rng: random.Random = field(default=None, repr=False, compare=False)
+    actions: List[str] = field(default_factory=list)
+    # The player's stats, inventory and equipment as the fight started (plain
+    # JSON), so the replay record alone can reproduce the fight
+    player: Optional[Dict[str, Any]] = field(default=None, repr=False)
     
+    def __post_init__(self):
+        if self.rng is None:
+            self.rng = random.Random(self.seed)
+    
+    def to_replay(self) -> Dict[str, Any]:
+        """Compact record of the fight for logging or CombatEngine.replay."""
+        record = {
+            "enemy_id": self.enemy.enemy_id,
+            "seed": self.seed,
+            "actions": list(self.actions)
+        }
+        if self.player is not None:
+            record["player"] = self.player
+        return record
+    
+# Spawned when no loaded enemy fits the difficulty. A real template (always
+# resolvable by spawn) so fights against it can be replayed like any other.
+FALLBACK_ENEMY = {
+    "id": "rat_fallback", "name": "Rat", "hp": 10, "attack_power": 3, "defence": 0,
+    "exp_reward": 5, "difficulty": 0
+}
+
+
 class CombatEngine:
     """Manages turn-based combat statefully."""
     
     """Manages turn-based combat statefully."""
     
-    def __init__(self, rules_engine, data_dir=None):
+    def __init__(self, rules_engine, data_dir=None, content=None):
         self.rules_engine = rules_engine
         self.enemies = []
         self.items = {}
         
-        if data_dir:
+        if content is not None:
+            # Shared, read-only templates from the process-wide ContentStore
+            self.enemies = content.enemies
+            self.items = content.items
+        elif data_dir:
             import json
             from pathlib import Path
             
@@ -80,31 +146,101 @@ class CombatEngine:
                     # indexed by ID
                     items_list = json.load(f)
                     self.items = {item['id']: item for item in items_list}
+        
+        self._index_enemies()
 
-    def get_random_enemy(self, difficulty: int) -> Enemy:
+    def _index_enemies(self) -> None:
+        """Build the id lookup and difficulty-sorted buckets used for spawning."""
+        self.enemies_by_id = {e["id"]: e for e in self.enemies if "id" in e}
+        self.enemies_by_id.setdefault(FALLBACK_ENEMY["id"], FALLBACK_ENEMY)
+        
+        # Enemies sorted by difficulty; the first bisect_right(...) of them
+        # are exactly the candidates at or below a given difficulty.
+        self._by_difficulty = sorted(self.enemies, key=lambda e: e.get("difficulty", 1))
+        self._difficulty_keys = [e.get("difficulty", 1) for e in self._by_difficulty]
+
+    def get_random_enemy(self, difficulty: int, rng: Optional[random.Random] = None) -> Enemy:
         """Get a random enemy appropriate for the difficulty."""
-        candidates = [e for e in self.enemies if e.get("difficulty", 1) <= difficulty]
-        if not candidates:
-            # Fallback
-            return Enemy("Rat", 10, 3, 0, 5)
+        candidate_count = bisect_right(self._difficulty_keys, difficulty)
+        if not candidate_count:
+            return self._instantiate(FALLBACK_ENEMY)
             
-        data = random.choice(candidates)
+        return self._instantiate(self._by_difficulty[(rng or random).randrange(candidate_count)])
+
+    def spawn(self, enemy_id: str) -> Optional[Enemy]:
+        """Create a fresh Enemy from its template ID, or None if unknown."""
+        data = self.enemies_by_id.get(enemy_id)
+        if data is None:
+            return None
+        return self._instantiate(data)
+
+    @staticmethod
+    def _instantiate(data: Dict[str, Any]) -> Enemy:
+        """Build an Enemy instance from a template."""
         return Enemy(
             name=data["name"],
             hp=data["hp"],
             attack_power=data["attack_power"],
             defence=data["defence"],
             exp_reward=data["exp_reward"],
-            loot=data.get("loot_table", [])
+            loot=data.get("loot_table", []),
+            enemy_id=data.get("id")
         )
     
-    def initialize_combat(self, enemy: Enemy) -> CombatState:
-        """Start a new combat encounter."""
+    def initialize_combat(self, enemy: Enemy, seed: Optional[int] = None,
+                          player_stats: Optional[Dict[str, Any]] = None,
+                          player_inventory: Optional[List[Dict[str, Any]]] = None,
+                          player_equipment: Optional[Dict[str, Any]] = None) -> CombatState:
+        """
+        Start a new combat encounter. Without a seed, a fresh one is drawn.
+        
+        If the player's stats are given, a copy of them (and of the inventory
+        and equipment) is kept for the fight's replay record.
+        """
+        player = None
+        if player_stats is not None:
+            player = json.loads(json.dumps({
+                "stats": player_stats,
+                "inventory": player_inventory or [],
+                "equipment": player_equipment
+            }, default=json_default))
         return CombatState(
             enemy=enemy,
             log=[f"You encounter a {enemy.name}!"],
-            is_active=True
+            is_active=True,
+            seed=secrets.randbits(63) if seed is None else seed,
+            player=player
         )
+    
+    def replay(self, replay: Dict[str, Any], player_stats: Optional[Dict[str, Any]] = None,
+               player_inventory: Optional[List[Dict[str, Any]]] = None,
+               player_equipment: Dict[str, Any] = None) -> CombatState:
+        """
+        Re-run a recorded fight from CombatState.to_replay().
+        
+        The player arguments must hold the state the player had when the
+        fight started; they are mutated exactly as in the original fight.
+        Without them, the player snapshot in the record is used.
+        """
+        enemy = self.spawn(replay["enemy_id"])
+        if enemy is None:
+            raise ValueError(f"Cannot replay fight against unknown enemy '{replay['enemy_id']}'")
+        if player_stats is None:
+            player = replay.get("player")
+            if player is None:
+                raise ValueError("Replay record has no player state; pass the player's starting state")
+            player = json.loads(json.dumps(player))
+            player_stats, player_inventory, player_equipment = (
+                player["stats"], player["inventory"], player["equipment"])
+        if player_inventory is None:
+            player_inventory = []
+        
+        state = self.initialize_combat(enemy, seed=replay["seed"])
+        for action in replay["actions"]:
+            if not state.is_active:
+                break
+            self.process_turn(state, player_stats, player_inventory, CombatAction(action), player_equipment)
+        return state
         
     def process_turn(self, state: CombatState, player_stats: Dict[str, Any], 
                     player_inventory: List[Dict[str, Any]], player_action: CombatAction,
@@ -117,20 +253,22 @@ class CombatEngine:
             return {"error": "Combat is not active"}
             
         enemy = state.enemy
+        rng = state.rng
         log = []
         state.turn_count += 1
+        state.actions.append(player_action.value)
         
         # Player Turn
         player_defending = player_action == CombatAction.DEFEND
         
         if player_action == CombatAction.ATTACK:
-            damage = self.rules_engine.calculate_damage(player_stats, {"defence": enemy.defence}, player_equipment)
+            damage = self.rules_engine.calculate_damage(player_stats, enemy.stats, player_equipment)
             enemy.take_damage(damage)
             log.append(f"You attack {enemy.name} for {damage} damage!")
         elif player_action == CombatAction.DEFEND:
             log.append("You take a defensive stance.")
         elif player_action == CombatAction.FLEE:
-            if self.can_flee(player_stats.get("agility", 5), enemy.defence):
+            if self.can_flee(player_stats.get("agility", 5), enemy.defence, rng):
                 state.is_active = False
                 log.append("You managed to escape!")
                 state.log.extend(log)
@@ -149,12 +287,12 @@ class CombatEngine:
             # Loot Logic
             if enemy.loot:
                 for drop in enemy.loot:
-                    if random.random() < drop["chance"]:
+                    if rng.random() < drop["chance"]:
                         item_id = drop["item_id"]
                         item_data = self.items.get(item_id)
                         if item_data:
-                            # Clone item to avoid ref issues
-                            new_item = item_data.copy()
+                            # Shared immutable ref (a private copy if the registry lacks it)
+                            new_item = ITEM_REGISTRY.intern(item_data)
                             player_inventory.append(new_item)
                             log.append(f"Loot dropped: {new_item['name']}")
             
@@ -162,9 +300,9 @@ class CombatEngine:
             return self._build_turn_result(state, log)
             
         # Enemy Turn
-        enemy_action = enemy.get_action()
+        enemy_action = enemy.get_action(rng)
         if enemy_action == CombatAction.ATTACK:
-            damage = random.randint(1, 3) + max(0, enemy.attack_power - 5) # Reduced randomness base
+            damage = rng.randint(1, 3) + max(0, enemy.attack_power - 5) # Reduced randomness base
             if player_defending:
                 damage = max(1, damage // 2)
                 log.append("Your defence reduced the damage!")
@@ -193,7 +331,7 @@ class CombatEngine:
             "turn_log": current_turn_log
         }
 
-    def can_flee(self, player_agility: int, enemy_defence: int) -> bool:
+    def can_flee(self, player_agility: int, enemy_defence: int, rng: Optional[random.Random] = None) -> bool:
         """Attempt to flee."""
         flee_chance = max(0.2, (player_agility - enemy_defence) * 0.05 + 0.3)
-        return random.random() < flee_chance
+        return (rng or random).random() < flee_chance
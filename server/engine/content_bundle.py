@@ -0,0 +1,184 @@
+"""
+Content Bundle: Precompiled, versioned binary file holding all static content.
+Built by build_content.py from the JSON sources. The server loads it instead
+of parsing pretty-printed JSON, and falls back to JSON when it is missing or
+older than its sources (e.g. while writers are editing nodes).
+
+Layout (little-endian):
+    header  magic, format version, metadata length, text length
+    meta    compact UTF-8 JSON: sources, nodes (without text), node hashes,
+            text index, enemies, items
+    text    every node's text, UTF-8, addressed by [offset, length]
+The text section is memory-mapped and decoded per node on demand, so node
+text costs page cache (shared between workers), not per-process memory.
+No pickle or marshal: a bundle can only ever produce plain JSON data.
+"""
+
+import json
+import mmap
+import os
+import struct
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from engine.content_store import content_hash
+
+MAGIC = b"ECRBNDL\x00"
+FORMAT_VERSION = 2
+HEADER = struct.Struct("<8sIQQ")
+
+
+class BundleError(ValueError):
+    """Raised when a file is not a readable bundle of this format version."""
+
+
+def source_files(nodes_path: Path, extra: Iterable[Path]) -> List[Path]:
+    """Every JSON file a bundle is compiled from, in a stable order."""
+    nodes_path = Path(nodes_path)
+    files = [nodes_path] if nodes_path.is_file() else sorted(nodes_path.glob("*.json"))
+    return files + [Path(path) for path in extra if Path(path).exists()]
+
+
+def fingerprint(files: Iterable[Path], base_path: Path) -> Dict[str, List[int]]:
+    """Relative path -> [size, mtime_ns] for freshness checks."""
+    result = {}
+    for path in files:
+        stat = Path(path).stat()
+        result[Path(os.path.relpath(path, base_path)).as_posix()] = [stat.st_size, stat.st_mtime_ns]
+    return result
+
+
+def write_bundle(path: Path, nodes: Dict[str, Dict[str, Any]], enemies: List[Dict[str, Any]],
+                 items: List[Dict[str, Any]], sources: Dict[str, List[int]]) -> int:
+    """
+    Write a bundle atomically.
+
+    Args:
+        path: Output file
+        nodes: Validated node graph
+        enemies: Enemy templates
+        items: Item definitions
+        sources: fingerprint() of the files the content came from
+
+    Returns:
+        Size of the written bundle in bytes
+    """
+    text = bytearray()
+    text_index = {}
+    metadata_nodes = {}
+    for node_id, node in nodes.items():
+        if "text" in node:
+            encoded = node["text"].encode("utf-8")
+            text_index[node_id] = [len(text), len(encoded)]
+            text.extend(encoded)
+        metadata_nodes[node_id] = {key: value for key, value in node.items() if key != "text"}
+
+    meta = json.dumps({
+        "sources": sources,
+        "nodes": metadata_nodes,
+        "node_hashes": {node_id: content_hash(node) for node_id, node in nodes.items()},
+        "text_index": text_index,
+        "enemies": enemies,
+        "items": items
+    }, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(HEADER.pack(MAGIC, FORMAT_VERSION, len(meta), len(text)))
+            f.write(meta)
+            f.write(text)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return HEADER.size + len(meta) + len(text)
+
+
+class ContentBundle:
+    """Parsed bundle: metadata in memory, node text memory-mapped and decoded on demand."""
+
+    def __init__(self, path: Path):
+        """
+        Initialize ContentBundle.
+
+        Args:
+            path: Bundle file written by write_bundle()
+
+        Raises:
+            BundleError: Wrong magic, unsupported version or truncated file
+        """
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            header = f.read(HEADER.size)
+            if len(header) < HEADER.size:
+                raise BundleError(f"{self.path} is truncated")
+            magic, version, meta_length, text_length = HEADER.unpack(header)
+            if magic != MAGIC:
+                raise BundleError(f"{self.path} is not a content bundle")
+            if version != FORMAT_VERSION:
+                raise BundleError(f"{self.path} is bundle format {version}, expected {FORMAT_VERSION}")
+            meta = f.read(meta_length)
+            self._text_start = HEADER.size + meta_length
+            if len(meta) != meta_length or os.fstat(f.fileno()).st_size < self._text_start + text_length:
+                raise BundleError(f"{self.path} is truncated")
+            # The map keeps its own handle, so the file can be closed (and replaced) now
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        meta = json.loads(meta)
+        self.sources: Dict[str, List[int]] = meta["sources"]
+        self.node_hashes: Dict[str, str] = meta["node_hashes"]
+        self.text_index: Dict[str, List[int]] = meta["text_index"]
+        self.enemies: List[Dict[str, Any]] = meta["enemies"]
+        self.items: List[Dict[str, Any]] = meta["items"]
+        self._nodes: Dict[str, Dict[str, Any]] = meta["nodes"]
+
+    def node_text(self, node_id: str) -> str:
+        """Decode one node's text from the mapped blob ("" if it has none)."""
+        entry = self.text_index.get(node_id)
+        if entry is None:
+            return ""
+        start = self._text_start + entry[0]
+        return self._map[start:start + entry[1]].decode("utf-8")
+
+    def node_metadata(self) -> Dict[str, Dict[str, Any]]:
+        """Nodes without their text (choices, requirements, effects...)."""
+        return self._nodes
+
+    def nodes(self) -> Dict[str, Dict[str, Any]]:
+        """Nodes with their text filled back in."""
+        nodes = {}
+        for node_id, node in self._nodes.items():
+            nodes[node_id] = {"text": self.node_text(node_id), **node} if node_id in self.text_index else dict(node)
+        return nodes
+
+    def is_fresh(self, files: Iterable[Path], base_path: Path) -> bool:
+        """True if the bundle was built from exactly these files as they are now."""
+        try:
+            return fingerprint(files, base_path) == self.sources
+        except (OSError, ValueError):
+            return False
+
+
+def load_fresh_bundle(path: Path, files: Iterable[Path], base_path: Path) -> Optional[ContentBundle]:
+    """
+    Load a bundle if it exists, is readable and matches its sources.
+
+    Returns None (after warning, unless the bundle simply isn't built) so the
+    caller can fall back to the JSON sources.
+    """
+    path = Path(path)
+    if not path.exists():
+        return None
+    try:
+        bundle = ContentBundle(path)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"[WARN] Ignoring content bundle {path}: {e}")
+        return None
+    if not bundle.is_fresh(files, base_path):
+        print(f"[WARN] Content bundle {path} is older than its sources; loading JSON (run build_content.py)")
+        return None
+    return bundle
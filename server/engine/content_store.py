@@ -0,0 +1,141 @@
+"""
+Content Store: Parses static game content once per process and freezes it.
+Nodes, enemies and items are shared read-only by every engine and session.
+"""
+
+import hashlib
+import json
+import threading
+from collections.abc import Mapping
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Iterable, Optional
+
+if False:
+    from engine.state_manager import StateManager
+
+
+def freeze(value: Any) -> Any:
+    """Recursively convert dicts to MappingProxyType and lists to tuples."""
+    if isinstance(value, Mapping):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """Return a mutable deep copy of frozen (or plain) JSON-like content."""
+    if isinstance(value, Mapping):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [thaw(item) for item in value]
+    return value
+
+
+def content_hash(value: Any) -> str:
+    """Short, stable hash of JSON-like content (key order does not matter)."""
+    data = json.dumps(thaw(value), sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()[:16]
+
+
+class ContentStore:
+    """Read-only view of all static content."""
+
+    def __init__(self, nodes: Dict[str, Any], enemies: Iterable[Dict[str, Any]],
+                 items: Iterable[Dict[str, Any]], text_source: Optional[Callable[[str], str]] = None,
+                 node_hashes: Optional[Dict[str, str]] = None):
+        """
+        Initialize ContentStore. Inputs are frozen; callers may discard them.
+
+        Args:
+            nodes: Node definitions keyed by node ID
+            enemies: Enemy templates
+            items: Item definitions (each with an "id")
+            text_source: Node ID -> text, for nodes stored without their text
+                         (e.g. memory-mapped from a bundle)
+            node_hashes: Precomputed content hashes (required with text_source,
+                         since hashing would otherwise read every text)
+        """
+        self.nodes = freeze(nodes)
+        self.text_source = text_source
+        # Content hashes let clients cache node payloads (ETags, /state node refs)
+        if node_hashes is None:
+            node_hashes = {node_id: content_hash(node) for node_id, node in self.nodes.items()}
+        self.node_hashes = MappingProxyType(dict(node_hashes))
+        self.enemies = freeze(list(enemies))
+        self.items = MappingProxyType({item["id"]: freeze(item) for item in items})
+
+    @classmethod
+    def from_state_manager(cls, state_manager: 'StateManager') -> 'ContentStore':
+        """Load all content from the compiled bundle, else from JSON (validating node links)."""
+        bundle = state_manager.load_content_bundle()
+        if bundle is not None:
+            return cls(nodes=bundle.node_metadata(), enemies=bundle.enemies, items=bundle.items,
+                       text_source=bundle.node_text, node_hashes=bundle.node_hashes)
+        
+        enemies = state_manager.load_enemies()
+        graph = state_manager.load_node_graph(enemy_ids={enemy["id"] for enemy in enemies})
+        return cls(
+            nodes=graph.nodes,
+            enemies=enemies,
+            items=state_manager.load_items()
+        )
+
+    def node_text(self, node_id: str) -> str:
+        """A node's text: inline if present, else from the text source."""
+        node = self.nodes.get(node_id)
+        if node is None:
+            return ""
+        if "text" in node or self.text_source is None:
+            return node.get("text", "")
+        return self.text_source(node_id)
+
+    def node_payload(self, node_id: str) -> Optional[Dict[str, Any]]:
+        """A mutable copy of a full node, text included (None if unknown)."""
+        node = self.nodes.get(node_id)
+        if node is None:
+            return None
+        payload = thaw(node)
+        if "text" not in payload and self.text_source is not None:
+            payload["text"] = self.text_source(node_id)
+        return payload
+
+    def with_nodes(self, nodes: Mapping[str, Any], node_hashes: Mapping[str, str]) -> 'ContentStore':
+        """
+        A new store with a different node set, sharing everything else.
+
+        Already-frozen nodes are kept as the same objects, so unchanged
+        nodes stay identical across a reload (see NodeEngine.set_nodes).
+        Nodes without inline text still read it from this store's text source.
+        """
+        store = ContentStore.__new__(ContentStore)
+        store.nodes = MappingProxyType({
+            node_id: node if isinstance(node, MappingProxyType) else freeze(node)
+            for node_id, node in nodes.items()
+        })
+        store.text_source = self.text_source
+        store.node_hashes = MappingProxyType(dict(node_hashes))
+        store.enemies = self.enemies
+        store.items = self.items
+        return store
+
+
+_stores: Dict[str, ContentStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_content_store(state_manager: 'StateManager') -> ContentStore:
+    """Return the process-wide ContentStore for a content root, loading it on first use."""
+    key = str(state_manager.base_path.resolve())
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = ContentStore.from_state_manager(state_manager)
+            _stores[key] = store
+        return store
+
+
+def set_content_store(state_manager: 'StateManager', store: ContentStore) -> None:
+    """Replace the process-wide ContentStore for a content root (e.g. after a hot reload)."""
+    with _stores_lock:
+        _stores[str(state_manager.base_path.resolve())] = store
@@ -0,0 +1,140 @@
+"""
+Content Watcher: Hot-reloads narrative zone files while the server runs.
+Polls the node files, re-reads only the ones that changed, validates the
+merged graph and hands the new ContentStore to a callback to swap in.
+Broken edits are reported and ignored; the last good content stays live.
+"""
+
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Optional, Set, Tuple
+
+from engine.content_store import ContentStore, content_hash
+from engine.node_graph import ContentValidationError, build_node_graph, load_zone_files
+
+
+class ContentWatcher:
+    """Watches zone files and rebuilds the node set incrementally."""
+
+    def __init__(self, nodes_path: Path, get_store: Callable[[], ContentStore],
+                 on_reload: Callable[[ContentStore, Set[str]], None], interval: float = 1.0):
+        """
+        Initialize ContentWatcher. Records the current files as the baseline.
+
+        Args:
+            nodes_path: Node file or directory of zone files
+            get_store: Returns the ContentStore currently in use
+            on_reload: Called with (new store, IDs of removed nodes)
+            interval: Seconds between polls
+        """
+        self.nodes_path = Path(nodes_path)
+        self.get_store = get_store
+        self.on_reload = on_reload
+        self.interval = interval
+
+        self._fingerprints = self._scan()
+        # Last scan whose reload failed, so a broken file warns once per save
+        self._rejected: Optional[Dict[Path, Tuple[int, int]]] = None
+        # Zone file -> node IDs it defines, so edits can drop deleted nodes
+        self._ids_by_file: Dict[Path, Set[str]] = {
+            path: set(zone) if isinstance(zone, dict) else set()
+            for path, zone in load_zone_files(sorted(self._fingerprints))
+        }
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _scan(self) -> Dict[Path, Tuple[int, int]]:
+        if self.nodes_path.is_file():
+            files = [self.nodes_path]
+        else:
+            files = sorted(self.nodes_path.glob("*.json"))
+        fingerprints = {}
+        for path in files:
+            try:
+                stat = path.stat()
+            except OSError:
+                continue  # Deleted between glob and stat
+            fingerprints[path] = (stat.st_size, stat.st_mtime_ns)
+        return fingerprints
+
+    def poll(self) -> Optional[ContentStore]:
+        """
+        Check for changed zone files once and reload them.
+
+        Returns:
+            The new store if content was swapped, else None
+        """
+        current = self._scan()
+        changed = sorted(path for path, stamp in current.items() if self._fingerprints.get(path) != stamp)
+        removed = [path for path in self._fingerprints if path not in current]
+        if not changed and not removed:
+            return None
+        if current == self._rejected:
+            return None
+        # Fingerprints are only committed once the merged graph validates, so
+        # after a failure the next poll retries every file changed since the
+        # last good reload, not just the one that was fixed
+        self._rejected = current
+
+        try:
+            zones = dict(load_zone_files(changed))
+        except (OSError, ValueError) as e:
+            print(f"[WARN] Not reloading content: {e}")
+            return None
+
+        store = self.get_store()
+        ids_by_file = {path: ids for path, ids in self._ids_by_file.items() if path not in removed}
+        for path, zone in zones.items():
+            ids_by_file[path] = set(zone) if isinstance(zone, dict) else set()
+
+        # Unchanged files contribute their live (frozen) nodes as-is
+        merged = []
+        for path in sorted(ids_by_file):
+            if path in zones:
+                merged.append((path, zones[path]))
+            else:
+                merged.append((path, {node_id: store.nodes[node_id]
+                                      for node_id in ids_by_file[path] if node_id in store.nodes}))
+        try:
+            graph = build_node_graph(merged, enemy_ids={enemy["id"] for enemy in store.enemies})
+        except ContentValidationError as e:
+            print(f"[WARN] Not reloading content: {e}")
+            return None
+
+        node_hashes = {}
+        for node_id, node in graph.nodes.items():
+            if store.nodes.get(node_id) is node:
+                node_hashes[node_id] = store.node_hashes[node_id]
+            else:
+                node_hashes[node_id] = content_hash(node)
+
+        new_store = store.with_nodes(graph.nodes, node_hashes)
+        removed_ids = set(store.nodes) - set(new_store.nodes)
+        self._ids_by_file = ids_by_file
+        self._fingerprints = current
+        self._rejected = None
+
+        names = ", ".join(path.name for path in changed + removed)
+        print(f"[INFO] Reloaded content from {names} ({len(removed_ids)} node(s) removed)")
+        self.on_reload(new_store, removed_ids)
+        return new_store
+
+    def start(self) -> None:
+        """Poll in a background thread until stop()."""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._watch_loop, name="content-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval + 1)
+
+    def _watch_loop(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.poll()
+            except Exception as e:  # Keep watching; a bad edit must not kill reloads
+                print(f"[WARN] Content reload failed: {e}")
@@ -0,0 +1,214 @@
+"""
+Flags: Narrative flags stored as integer bitsets over interned flag names.
+Behaves like the flags dict it replaces and converts to/from JSON losslessly.
+"""
+
+import threading
+from collections.abc import MutableMapping
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+
+class FlagRegistry:
+    """
+    Interns flag names to bit positions.
+
+    Append-only, so a flag keeps its bit for the life of the process even
+    when content is hot-reloaded. Lookups are lock-free; only new names
+    take the lock.
+    """
+
+    def __init__(self, names: Iterable[str] = ()):
+        self._index: Dict[str, int] = {}
+        self._names: List[str] = []
+        self._lock = threading.Lock()
+        self.intern_all(names)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._index
+
+    def index(self, name: str) -> int:
+        """Bit position of a flag, interning it if new."""
+        index = self._index.get(name)
+        if index is None:
+            with self._lock:
+                index = self._index.get(name)
+                if index is None:
+                    index = len(self._names)
+                    self._names.append(name)
+                    self._index[name] = index
+        return index
+
+    def bit(self, name: str) -> int:
+        """Single-bit mask for a flag, interning it if new."""
+        return 1 << self.index(name)
+
+    def name(self, index: int) -> str:
+        return self._names[index]
+
+    def names_in(self, mask: int) -> Iterator[str]:
+        """Flag names whose bits are set in mask, in bit order."""
+        index = 0
+        while mask:
+            if mask & 1:
+                yield self._names[index]
+            mask >>= 1
+            index += 1
+
+    def intern_all(self, names: Iterable[str]) -> None:
+        for name in names:
+            self.index(name)
+
+    def intern_nodes(self, nodes: Mapping[str, Mapping[str, Any]]) -> None:
+        """Intern every flag a node graph's choices require or set."""
+        for node in nodes.values():
+            for choice in node.get("choices", ()):
+                self.intern_all((choice.get("requirements") or {}).get("flags", ()))
+                self.intern_all((choice.get("effects") or {}).get("flags", ()))
+
+    def compile(self, required: Mapping[str, Any]) -> Optional[Tuple[int, int]]:
+        """
+        Compile a requirements' flags dict to (must-be-true mask, must-be-false mask).
+
+        Returns None if any required value is not a bool; callers then
+        compare the values one by one.
+        """
+        true_mask = false_mask = 0
+        for name, value in required.items():
+            if value is True:
+                true_mask |= self.bit(name)
+            elif value is False:
+                false_mask |= self.bit(name)
+            else:
+                return None
+        return true_mask, false_mask
+
+
+# Shared by every player so compiled requirement masks apply to all of them
+FLAG_REGISTRY = FlagRegistry()
+
+
+class FlagSet(MutableMapping):
+    """
+    A player's flags as two bitsets over a FlagRegistry.
+
+    ``_true`` holds flags set to True and ``_false`` flags explicitly set to
+    False (so they survive a save round trip). Values that are not bools
+    are kept in a small overflow dict so nothing is lost.
+    """
+
+    __slots__ = ("registry", "_true", "_false", "_extra", "_extra_mask")
+
+    def __init__(self, flags: Optional[Mapping[str, Any]] = None, registry: FlagRegistry = FLAG_REGISTRY):
+        self.registry = registry
+        self._true = 0
+        self._false = 0
+        self._extra: Optional[Dict[str, Any]] = None
+        self._extra_mask = 0
+        if flags:
+            for name, value in flags.items():
+                self[name] = value
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> 'FlagSet':
+        """Build a FlagSet from a JSON flags dict."""
+        return cls(data)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert back to a plain dict for saving."""
+        return dict(self.items())
+
+    def copy(self) -> 'FlagSet':
+        clone = self.__class__(registry=self.registry)
+        clone._true = self._true
+        clone._false = self._false
+        clone._extra = dict(self._extra) if self._extra else None
+        clone._extra_mask = self._extra_mask
+        return clone
+
+    def __reduce__(self):
+        return (self.__class__, (self.to_dict(),))
+
+    def __repr__(self) -> str:
+        return f"FlagSet({self.to_dict()!r})"
+
+    def matches(self, true_mask: int, false_mask: int) -> bool:
+        """
+        Check compiled flag requirements (see FlagRegistry.compile).
+
+        Same result as comparing ``self.get(name, False) == required`` for
+        each flag, but a couple of integer operations in the common case.
+        """
+        if self._extra_mask & (true_mask | false_mask):
+            return (all(self.get(name, False) == True for name in self.registry.names_in(true_mask))  # noqa: E712
+                    and all(self.get(name, False) == False for name in self.registry.names_in(false_mask)))  # noqa: E712
+        return self._true & true_mask == true_mask and not self._true & false_mask
+
+    # --- Mapping protocol ---
+
+    def __getitem__(self, name: str) -> Any:
+        if name in self.registry:
+            bit = self.registry.bit(name)
+            if self._true & bit:
+                return True
+            if self._false & bit:
+                return False
+        if self._extra and name in self._extra:
+            return self._extra[name]
+        raise KeyError(name)
+
+    def get(self, name: str, default: Any = None) -> Any:
+        try:
+            return self[name]
+        except KeyError:
+            return default
+
+    def __setitem__(self, name: str, value: Any) -> None:
+        bit = self.registry.bit(name)
+        self._true &= ~bit
+        self._false &= ~bit
+        if self._extra_mask & bit:
+            self._extra_mask &= ~bit
+            del self._extra[name]
+
+        if value is True:
+            self._true |= bit
+        elif value is False:
+            self._false |= bit
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[name] = value
+            self._extra_mask |= bit
+
+    def __delitem__(self, name: str) -> None:
+        if name not in self:
+            raise KeyError(name)
+        bit = self.registry.bit(name)
+        self._true &= ~bit
+        self._false &= ~bit
+        if self._extra_mask & bit:
+            self._extra_mask &= ~bit
+            del self._extra[name]
+
+    def __contains__(self, name: object) -> bool:
+        if name not in self.registry:
+            return False
+        return bool((self._true | self._false | self._extra_mask) & self.registry.bit(name))
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self.registry.names_in(self._true | self._false | self._extra_mask)
+
+    def __len__(self) -> int:
+        return bin(self._true | self._false | self._extra_mask).count("1")
+
+
+def ensure_flags(player_state: Dict[str, Any]) -> FlagSet:
+    """Upgrade a player state's flags dict to a FlagSet in place."""
+    flags = player_state.get("flags")
+    if not isinstance(flags, FlagSet):
+        flags = FlagSet(flags or {})
+        player_state["flags"] = flags
+    return flags
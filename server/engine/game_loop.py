@@ -7,6 +7,8 @@ from typing import Dict, Any, Optional
 from engine.state_manager import StateManager, PlayerState
 from engine.rules import RulesEngine
 from engine.node_engine import NodeEngine
+from engine.content_store import get_content_store
+from engine.item_registry import ITEM_REGISTRY
 
 
 class GameLoop:
@@ -25,8 +27,9 @@ class GameLoop:
         settings = state_manager.settings
         self.rules_engine = RulesEngine(settings)
         
-        nodes_data = state_manager.load_nodes()
-        self.node_engine = NodeEngine(nodes_data, self.rules_engine)
+        content = get_content_store(state_manager)
+        ITEM_REGISTRY.load_content(content.items.values(), content.nodes)
+        self.node_engine = NodeEngine(content.nodes, self.rules_engine, text_source=content.node_text)
         
         # Load player state
         player_data = state_manager.load_player_state()
@@ -147,11 +150,7 @@ class GameLoop:
             return False
         
         # Find the item
-        item = None
-        for inv_item in self.player.inventory:
-            if inv_item.get("name") == item_name:
-                item = inv_item
-                break
+        item = self.player.inventory.find(item_name)
         
         if not item:
             return False
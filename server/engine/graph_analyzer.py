@@ -0,0 +1,269 @@
+"""
+Graph Analyzer: Offline reachability and dead-end checks for the node graph.
+Explores every path from the start node, tracking which flags/items are set
+and how effects have shifted stats, and computes the minimum base stats (and
+free stat points) each node needs. Used by analyze_content.py in local checks.
+"""
+
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Set, Tuple
+
+DEFAULT_ENDING_PREFIXES = ("ending_",)
+# Nodes the engine moves players to itself (e.g. on losing a combat)
+DEFAULT_ENGINE_NODES = ("death",)
+
+# Stat deltas are packed into one int per state key, this many bits each
+_DELTA_BITS = 16
+_DELTA_BIAS = 1 << (_DELTA_BITS - 1)
+
+
+@dataclass
+class _Choice:
+    """A choice compiled to masks and vectors over the tracked stats/bits."""
+    target: int
+    required: Tuple[int, ...]
+    true_mask: int
+    false_mask: int
+    set_mask: int
+    clear_mask: int
+    delta: Optional[Tuple[int, ...]]
+
+
+@dataclass
+class AnalysisReport:
+    """Result of analyze_graph()."""
+    start: str
+    stats: Tuple[str, ...]
+    budget: int
+    # Node -> fewest free stat points needed to reach it (reachable nodes only)
+    min_points: Dict[str, int] = field(default_factory=dict)
+    # Node -> base stats that reach it with min_points (only stats above base)
+    min_stats: Dict[str, Dict[str, int]] = field(default_factory=dict)
+    # No path at all from the start node
+    unreachable: List[str] = field(default_factory=list)
+    # Reached, but no choice leads anywhere else (and not an ending)
+    dead_ends: List[str] = field(default_factory=list)
+    # Reachable with some flags/items where no choice can ever be taken
+    soft_locks: List[str] = field(default_factory=list)
+    states_explored: int = 0
+
+    @property
+    def reachable(self) -> List[str]:
+        """Nodes reachable within the stat point budget."""
+        return sorted(node_id for node_id, points in self.min_points.items() if points <= self.budget)
+
+    @property
+    def over_budget(self) -> Dict[str, int]:
+        """Nodes only reachable with more free stat points than the budget."""
+        return {node_id: points for node_id, points in sorted(self.min_points.items()) if points > self.budget}
+
+    @property
+    def ok(self) -> bool:
+        return not (self.unreachable or self.dead_ends or self.soft_locks or self.over_budget)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "start": self.start,
+            "budget": self.budget,
+            "reachable": len(self.reachable),
+            "over_budget": self.over_budget,
+            "unreachable": self.unreachable,
+            "dead_ends": self.dead_ends,
+            "soft_locks": self.soft_locks,
+            "min_points": dict(sorted(self.min_points.items())),
+            "min_stats": dict(sorted(self.min_stats.items())),
+            "states_explored": self.states_explored
+        }
+
+
+def _dominates(a: Tuple[int, ...], b: Tuple[int, ...]) -> bool:
+    """a needs no more of any stat than b."""
+    return all(x <= y for x, y in zip(a, b))
+
+
+def analyze_graph(nodes: Mapping[str, Mapping[str, Any]], base_stats: Mapping[str, int],
+                  budget: int, start: str = "intro_01",
+                  ending_prefixes: Sequence[str] = DEFAULT_ENDING_PREFIXES,
+                  engine_nodes: Sequence[str] = DEFAULT_ENGINE_NODES,
+                  max_points: Optional[int] = None) -> AnalysisReport:
+    """
+    Explore the graph from `start` and report reachability.
+
+    A state is (node, bitset of tracked flags/items, stat deltas from effects);
+    for each state only Pareto-minimal "base stats needed" vectors are kept.
+    Only flags and items some requirement reads are tracked, and deltas
+    saturate where they stop mattering, so the state space stays close to
+    the node count. Combats are assumed won, and experience is not turned
+    into stat points (pass those as `budget`).
+
+    Args:
+        nodes: Node definitions keyed by ID
+        base_stats: Starting stats (e.g. the player template)
+        budget: Free stat points the player can spend
+        start: Start node ID
+        ending_prefixes: Node ID prefixes that are allowed to have no exits
+        engine_nodes: Nodes entered by the engine rather than by choices;
+                      never reported as unreachable
+        max_points: Stop following paths needing more points than this
+                    (default: enough for every stat requirement in the graph)
+    """
+    node_ids = list(nodes)
+    index = {node_id: i for i, node_id in enumerate(node_ids)}
+
+    # Stats, flags and items that any requirement actually reads
+    stat_names: List[str] = []
+    bit_names: List[str] = []
+    max_required: Dict[str, int] = {}
+    for node in nodes.values():
+        for choice in node.get("choices", ()):
+            requirements = choice.get("requirements") or {}
+            for stat_name, minimum in requirements.get("stats", {}).items():
+                if stat_name not in max_required:
+                    stat_names.append(stat_name)
+                max_required[stat_name] = max(max_required.get(stat_name, minimum), minimum)
+            for flag_name in requirements.get("flags", {}):
+                if f"flag:{flag_name}" not in bit_names:
+                    bit_names.append(f"flag:{flag_name}")
+            for item_name in requirements.get("items", ()):
+                if f"item:{item_name}" not in bit_names:
+                    bit_names.append(f"item:{item_name}")
+    bits = {name: 1 << i for i, name in enumerate(bit_names)}
+    base = tuple(base_stats.get(stat_name, 0) for stat_name in stat_names)
+
+    if max_points is None:
+        max_points = budget + sum(max(0, max_required[s] - b) for s, b in zip(stat_names, base))
+    # Total raise/lower any path can apply to each stat (every choice taken once)
+    raised = dict.fromkeys(stat_names, 0)
+    lowered = dict.fromkeys(stat_names, 0)
+    for node in nodes.values():
+        for choice in node.get("choices", ()):
+            for stat_name, amount in ((choice.get("effects") or {}).get("stats") or {}).items():
+                if stat_name in raised:
+                    if amount > 0:
+                        raised[stat_name] += amount
+                    else:
+                        lowered[stat_name] -= amount
+    # Beyond these, effects still to come cannot bring a stat back to where a
+    # requirement reads it, so deltas saturate there without losing anything
+    # (on acyclic paths; repeated loops may saturate early)
+    upper = tuple(max(0, max_required[s] - b) + lowered[s] for s, b in zip(stat_names, base))
+    lower = tuple(-(max_required[s] + max_points + raised[s]) for s in stat_names)
+
+    def cost(need: Tuple[int, ...]) -> int:
+        return sum(max(0, n - b) for n, b in zip(need, base))
+
+    compiled: List[List[_Choice]] = []
+    for node_id in node_ids:
+        choices = []
+        for choice in nodes[node_id].get("choices", ()):
+            target = index.get(choice.get("next", node_id))
+            if target is None:
+                continue  # Dangling links are the node graph validator's job
+            requirements = choice.get("requirements") or {}
+            effects = choice.get("effects") or {}
+            stat_requirements = requirements.get("stats", {})
+            stat_effects = effects.get("stats", {})
+
+            true_mask = false_mask = set_mask = clear_mask = 0
+            for flag_name, value in requirements.get("flags", {}).items():
+                if value:
+                    true_mask |= bits[f"flag:{flag_name}"]
+                else:
+                    false_mask |= bits[f"flag:{flag_name}"]
+            for item_name in requirements.get("items", ()):
+                true_mask |= bits[f"item:{item_name}"]
+            for flag_name, value in effects.get("flags", {}).items():
+                bit = bits.get(f"flag:{flag_name}", 0)
+                if value:
+                    set_mask |= bit
+                else:
+                    clear_mask |= bit
+            for item in effects.get("items", ()):
+                set_mask |= bits.get(f"item:{item.get('name')}", 0)
+
+            delta = tuple(stat_effects.get(s, 0) for s in stat_names)
+            choices.append(_Choice(
+                target=target,
+                required=tuple(stat_requirements.get(s, -(1 << 30)) for s in stat_names),
+                true_mask=true_mask,
+                false_mask=false_mask,
+                set_mask=set_mask,
+                clear_mask=clear_mask,
+                delta=delta if any(delta) else None
+            ))
+        compiled.append(choices)
+
+    def pack(delta: Tuple[int, ...]) -> int:
+        packed = 0
+        for value in delta:
+            packed = (packed << _DELTA_BITS) | (value + _DELTA_BIAS)
+        return packed
+
+    report = AnalysisReport(start=start, stats=tuple(stat_names), budget=budget)
+    if start not in index:
+        report.unreachable = sorted(node_ids)
+        return report
+
+    # (node, bitset, packed deltas) -> Pareto front of "base stats needed"
+    fronts: Dict[Tuple[int, int, int], List[Tuple[int, ...]]] = {}
+    best: Dict[int, Tuple[int, Tuple[int, ...]]] = {}
+    soft_locked: Set[int] = set()
+
+    zero = tuple(0 for _ in stat_names)
+    start_key = (index[start], 0, pack(zero))
+    fronts[start_key] = [base]
+    queue = deque([(index[start], 0, zero, base)])
+
+    while queue:
+        node, state_bits, delta, need = queue.popleft()
+        if need not in fronts.get((node, state_bits, pack(delta)), ()):
+            continue  # Superseded by a cheaper path after being queued
+        report.states_explored += 1
+
+        need_cost = cost(need)
+        if node not in best or need_cost < best[node][0]:
+            best[node] = (need_cost, need)
+
+        choices = compiled[node]
+        usable = False
+        for choice in choices:
+            if state_bits & choice.true_mask != choice.true_mask or state_bits & choice.false_mask:
+                continue
+            usable = True
+
+            new_need = tuple(max(n, r - d) for n, r, d in zip(need, choice.required, delta))
+            if cost(new_need) > max_points:
+                continue
+            new_bits = (state_bits | choice.set_mask) & ~choice.clear_mask
+            new_delta = delta
+            if choice.delta is not None:
+                new_delta = tuple(min(hi, max(lo, d + e))
+                                  for d, e, lo, hi in zip(delta, choice.delta, lower, upper))
+
+            key = (choice.target, new_bits, pack(new_delta))
+            front = fronts.get(key)
+            if front is None:
+                fronts[key] = [new_need]
+            elif any(_dominates(existing, new_need) for existing in front):
+                continue
+            else:
+                front[:] = [existing for existing in front if not _dominates(new_need, existing)]
+                front.append(new_need)
+            queue.append((choice.target, new_bits, new_delta, new_need))
+
+        if choices and not usable:
+            soft_locked.add(node)
+
+    for node, (points, need) in best.items():
+        node_id = node_ids[node]
+        report.min_points[node_id] = points
+        report.min_stats[node_id] = {s: n for s, n, b in zip(stat_names, need, base) if n > b}
+        exits = [choice for choice in compiled[node] if choice.target != node]
+        if not exits and not node_id.startswith(tuple(ending_prefixes)):
+            report.dead_ends.append(node_id)
+    report.dead_ends.sort()
+    report.soft_locks = sorted(node_ids[node] for node in soft_locked)
+    report.unreachable = sorted(node_id for node_id in node_ids
+                                if index[node_id] not in best and node_id not in engine_nodes)
+    return report
@@ -0,0 +1,159 @@
+"""
+Inventory: Ordered item list with a name index and per-name stack counts.
+Serialises exactly like the plain list of item dicts it replaces.
+"""
+
+from collections import Counter
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+
+class Inventory(list):
+    """
+    A list of item dicts that also tracks items by name.
+
+    Stack counts are kept exact on every mutation. The name -> slot positions
+    index is updated in place for appends and pops from the end (the common
+    loot/consume pattern) and rebuilt lazily after anything that shifts slots.
+    """
+
+    def __init__(self, items: Iterable[Dict[str, Any]] = ()):
+        super().__init__(items)
+        self._counts: Counter = Counter(self._name(item) for item in self)
+        self._slots: Optional[Dict[str, List[int]]] = None
+
+    @staticmethod
+    def _name(item: Any) -> Optional[str]:
+        return item.get("name") if isinstance(item, Mapping) else None
+
+    def __reduce__(self):
+        return (self.__class__, (list(self),))
+
+    # --- Lookups ---
+
+    def name_counts(self) -> Mapping[str, int]:
+        """Read-only name -> stack count view."""
+        return MappingProxyType(self._counts)
+
+    def count_of(self, item_name: str) -> int:
+        """How many items with this name are held."""
+        return self._counts.get(item_name, 0)
+
+    def has(self, item_name: str) -> bool:
+        """Check if an item with this name is held."""
+        return self._counts.get(item_name, 0) > 0
+
+    def index_of(self, item_name: str) -> Optional[int]:
+        """Position of the first item with this name, or None."""
+        if not self.has(item_name):
+            return None
+        return self._get_slots()[item_name][0]
+
+    def find(self, item_name: str) -> Optional[Dict[str, Any]]:
+        """First item with this name, or None."""
+        index = self.index_of(item_name)
+        return None if index is None else self[index]
+
+    def remove_name(self, item_name: str) -> Optional[Dict[str, Any]]:
+        """Remove and return the first item with this name, or None."""
+        index = self.index_of(item_name)
+        return None if index is None else self.pop(index)
+
+    # --- Mutators (keep the index in sync) ---
+
+    def append(self, item: Dict[str, Any]) -> None:
+        super().append(item)
+        name = self._name(item)
+        self._counts[name] += 1
+        if self._slots is not None:
+            self._slots.setdefault(name, []).append(len(self) - 1)
+
+    def extend(self, items: Iterable[Dict[str, Any]]) -> None:
+        for item in items:
+            self.append(item)
+
+    def __iadd__(self, items: Iterable[Dict[str, Any]]) -> 'Inventory':
+        self.extend(items)
+        return self
+
+    def insert(self, index: int, item: Dict[str, Any]) -> None:
+        super().insert(index, item)
+        self._counts[self._name(item)] += 1
+        self._slots = None
+
+    def pop(self, index: int = -1) -> Dict[str, Any]:
+        size = len(self)
+        position = index + size if index < 0 else index
+        item = super().pop(index)
+        name = self._name(item)
+        self._decrement(name)
+        if self._slots is not None:
+            if position == size - 1:
+                self._slots[name].pop()
+                if not self._slots[name]:
+                    del self._slots[name]
+            else:
+                self._slots = None
+        return item
+
+    def remove(self, item: Dict[str, Any]) -> None:
+        super().remove(item)
+        self._decrement(self._name(item))
+        self._slots = None
+
+    def clear(self) -> None:
+        super().clear()
+        self._counts.clear()
+        self._slots = None
+
+    def __setitem__(self, key, value) -> None:
+        super().__setitem__(key, value)
+        self._reindex()
+
+    def __delitem__(self, key) -> None:
+        super().__delitem__(key)
+        self._reindex()
+
+    def __imul__(self, times: int) -> 'Inventory':
+        super().__imul__(times)
+        self._reindex()
+        return self
+
+    def sort(self, *args, **kwargs) -> None:
+        super().sort(*args, **kwargs)
+        self._slots = None
+
+    def reverse(self) -> None:
+        super().reverse()
+        self._slots = None
+
+    def copy(self) -> 'Inventory':
+        return self.__class__(self)
+
+    # --- Internals ---
+
+    def _decrement(self, name: Optional[str]) -> None:
+        self._counts[name] -= 1
+        if self._counts[name] <= 0:
+            del self._counts[name]
+
+    def _reindex(self) -> None:
+        self._counts = Counter(self._name(item) for item in self)
+        self._slots = None
+
+    def _get_slots(self) -> Dict[str, List[int]]:
+        if self._slots is None:
+            slots: Dict[str, List[int]] = {}
+            for i, item in enumerate(self):
+                slots.setdefault(self._name(item), []).append(i)
+            self._slots = slots
+        return self._slots
+
+
+def ensure_inventory(player_state: Dict[str, Any]) -> Inventory:
+    """Upgrade a player state's inventory list to an Inventory in place."""
+    inventory = player_state.get("inventory")
+    if not isinstance(inventory, Inventory):
+        inventory = Inventory(inventory or [])
+        player_state["inventory"] = inventory
+    return inventory
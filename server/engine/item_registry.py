@@ -0,0 +1,199 @@
+"""
+Item Registry: One catalogue of every item definition in the game.
+Merges items.json, consumables.CONSUMABLES and items granted inline by node
+effects; inventories hold the registry's shared, immutable ItemRefs instead
+of a private copy of each item dict.
+"""
+
+import json
+import re
+import threading
+from collections.abc import Mapping
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from engine.consumables import CONSUMABLES
+from engine.content_store import content_hash, freeze, thaw
+
+
+def _canonical(item: Any) -> str:
+    return json.dumps(item, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+def _slug(name: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "_", name.lower()).strip("_") or "item"
+
+
+class ItemRef(Mapping):
+    """
+    A registered item: a read-only mapping shared by every inventory holding it.
+
+    Reads like the item dict it replaces (``item["name"]``, ``item.get("effect")``)
+    and compares equal to it. Copying returns the same object; use to_dict()
+    for a private, mutable copy.
+    """
+
+    __slots__ = ("id", "_data", "_plain")
+
+    def __init__(self, item_id: str, definition: Mapping[str, Any]):
+        self.id = item_id
+        self._data = freeze(definition)
+        # Private plain copy, so comparisons never allocate
+        self._plain = thaw(definition)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """A plain dict copy for saving or editing."""
+        return thaw(self._data)
+
+    def __getitem__(self, key: str) -> Any:
+        return self._data[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __eq__(self, other: object) -> bool:
+        if other is self:
+            return True
+        if isinstance(other, ItemRef):
+            return self.id == other.id and self._plain == other._plain
+        if type(other) is dict:
+            return self._plain == other
+        if isinstance(other, Mapping):
+            return self._plain == thaw(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __copy__(self) -> 'ItemRef':
+        return self
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> 'ItemRef':
+        return self
+
+    def __reduce__(self):
+        return (self.__class__, (self.id, self.to_dict()))
+
+    def __repr__(self) -> str:
+        return f"ItemRef({self.id!r})"
+
+
+class ItemRegistry:
+    """
+    Interns item definitions by content, with O(1) lookups by ID and name.
+
+    Append-only, like the flag registry: refs handed to players stay valid
+    across content reloads. A definition whose ID (or name-derived ID) is
+    already taken by different content gets a suffixed ID instead.
+    """
+
+    def __init__(self):
+        self._by_id: Dict[str, ItemRef] = {}
+        self._by_name: Dict[str, ItemRef] = {}
+        # Canonical JSON of every known form of an item -> its ref
+        self._by_content: Dict[str, ItemRef] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def get(self, item_id: str) -> Optional[ItemRef]:
+        """Item by registry ID."""
+        return self._by_id.get(item_id)
+
+    def by_name(self, name: str) -> Optional[ItemRef]:
+        """First item registered under a display name."""
+        return self._by_name.get(name)
+
+    def definitions(self) -> List[ItemRef]:
+        """Every registered item, in registration order."""
+        return list(self._by_id.values())
+
+    def add(self, definition: Mapping[str, Any]) -> ItemRef:
+        """Register a definition (or return the ref already registered for identical content)."""
+        plain = thaw(definition)
+        key = _canonical(plain)
+        ref = self._by_content.get(key)
+        if ref is not None:
+            return ref
+        with self._lock:
+            ref = self._by_content.get(key)
+            if ref is None:
+                item_id = plain.get("id") or _slug(str(plain.get("name", "")))
+                if item_id in self._by_id:
+                    item_id = f"{item_id}_{content_hash(plain)[:6]}"
+                ref = ItemRef(item_id, plain)
+                self._by_id[item_id] = ref
+                self._by_name.setdefault(plain.get("name"), ref)
+                self._by_content[key] = ref
+            return ref
+
+    def add_inline(self, item: Mapping[str, Any]) -> ItemRef:
+        """
+        Register an item granted inline by a node effect.
+
+        If an item with the same name is already defined and the inline
+        fields all agree with it, the inline form becomes an alias of that
+        definition; otherwise it is registered as an item of its own.
+        """
+        plain = thaw(item)
+        key = _canonical(plain)
+        ref = self._by_content.get(key)
+        if ref is not None:
+            return ref
+        named = self._by_name.get(plain.get("name"))
+        if named is not None:
+            definition = named.to_dict()
+            if all(key_name in definition and definition[key_name] == value for key_name, value in plain.items()):
+                with self._lock:
+                    self._by_content.setdefault(key, named)
+                return named
+        return self.add(plain)
+
+    def add_node_items(self, nodes: Mapping[str, Mapping[str, Any]]) -> None:
+        """Register the items every node choice's effects grant."""
+        for node in nodes.values():
+            for choice in node.get("choices", ()):
+                for item in (choice.get("effects") or {}).get("items", ()):
+                    self.add_inline(item)
+
+    def load_content(self, items: Iterable[Mapping[str, Any]],
+                     nodes: Optional[Mapping[str, Mapping[str, Any]]] = None) -> None:
+        """Merge items.json definitions, CONSUMABLES and (optionally) node items."""
+        for item in items:
+            self.add(item)
+        for name, definition in CONSUMABLES.items():
+            self.add({"name": name, **definition})
+        if nodes:
+            self.add_node_items(nodes)
+
+    def intern(self, item: Any) -> Any:
+        """
+        The shared ref for an item instance, if it exactly matches a known form.
+
+        Anything else (edited instances, unknown items) is returned as a
+        private plain copy, as before the registry existed.
+        """
+        if isinstance(item, ItemRef) or not isinstance(item, Mapping):
+            return item
+        plain = thaw(item)
+        return self._by_content.get(_canonical(plain), plain)
+
+
+# Shared by every player so identical items are stored once per process
+ITEM_REGISTRY = ItemRegistry()
+
+
+def intern_player_items(player_state: Dict[str, Any], registry: ItemRegistry = ITEM_REGISTRY) -> None:
+    """Swap a player state's inventory and equipment items for registry refs in place."""
+    inventory = player_state.get("inventory")
+    if inventory:
+        interned = [registry.intern(item) for item in inventory]
+        if any(new is not old for new, old in zip(interned, inventory)):
+            inventory[:] = interned
+    equipment = player_state.get("equipment")
+    if isinstance(equipment, dict):
+        for slot, item in equipment.items():
+            if item is not None:
+                equipment[slot] = registry.intern(item)
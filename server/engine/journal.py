@@ -0,0 +1,211 @@
+"""
+Journal: Append-only log of player state changes beside each save file.
+Every save appends only what changed (as JSON-patch ops) tagged with the
+action that caused it; a snapshot every N records compacts the log, so
+recovery replays a bounded tail and the log doubles as an audit trail.
+"""
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from engine.json_patch import apply_patch, diff
+from engine.stats import json_default
+
+# Key in the snapshot file holding the last journal record folded into it
+SNAPSHOT_SEQ_KEY = "_journal_seq"
+
+_LOCK_STRIPES = 32
+
+
+def journal_path(state_path: Path) -> Path:
+    """The journal file kept beside a save file."""
+    return state_path.with_suffix(".journal")
+
+
+@dataclass
+class ReplayedState:
+    """A save recovered from its snapshot plus journal tail."""
+    state: Dict[str, Any]
+    seq: int
+    # Records applied on top of the snapshot (compaction is due at snapshot_every)
+    records: int
+
+
+def _read_json(path: Path) -> Dict[str, Any]:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def replay(state_path: Path, read_snapshot: Callable[[Path], Dict[str, Any]] = _read_json) -> Optional[ReplayedState]:
+    """
+    Rebuild a save from its snapshot and journal.
+
+    Records already folded into the snapshot are skipped. A torn or
+    corrupt tail (e.g. a crash mid-append) ends the replay and is cut off
+    the journal so later appends start on a clean line.
+
+    Returns:
+        None if there is no snapshot
+    """
+    if not state_path.exists():
+        return None
+    state = read_snapshot(state_path)
+    seq = state.pop(SNAPSHOT_SEQ_KEY, 0)
+    records = 0
+
+    path = journal_path(state_path)
+    if not path.exists():
+        return ReplayedState(state, seq, records)
+
+    with open(path, "rb") as f:
+        data = f.read()
+    offset = 0
+    for line in data.splitlines(keepends=True):
+        if not line.endswith(b"\n"):
+            break  # Torn final append
+        try:
+            record = json.loads(line)
+            if record["seq"] > seq:
+                if record["seq"] != seq + 1:
+                    raise ValueError(f"expected record {seq + 1}, found {record['seq']}")
+                apply_patch(state, record["ops"], in_place=True)
+                seq = record["seq"]
+                records += 1
+        except (ValueError, KeyError, IndexError, TypeError) as e:
+            print(f"[WARN] Journal {path} is corrupt after record {seq}: {e}")
+            break
+        offset += len(line)
+
+    if offset < len(data):
+        print(f"[WARN] Dropping {len(data) - offset} unreadable byte(s) from the end of {path}")
+        with open(path, "r+b") as f:
+            f.truncate(offset)
+    return ReplayedState(state, seq, records)
+
+
+class PlayerJournal:
+    """Journaled persistence for player saves (persistence mode "journal")."""
+
+    def __init__(self, write_snapshot: Callable[[Path, Dict[str, Any]], None],
+                 read_snapshot: Callable[[Path], Dict[str, Any]] = _read_json,
+                 snapshot_every: int = 200, fsync: bool = False, cache_size: int = 1024):
+        """
+        Initialize PlayerJournal.
+
+        Args:
+            write_snapshot: Writes a full save file atomically
+            read_snapshot: Reads a save file written by write_snapshot
+            snapshot_every: Journal records between snapshots (bounds recovery time)
+            fsync: fsync every append, not just flush it to the OS
+            cache_size: Saves whose last persisted state is kept in memory to diff against
+        """
+        self.write_snapshot = write_snapshot
+        self.read_snapshot = read_snapshot
+        self.snapshot_every = max(1, snapshot_every)
+        self.fsync = fsync
+        self.cache_size = cache_size
+
+        # Save path -> last persisted state; evicted entries are replayed from disk
+        self._cache: "OrderedDict[Path, ReplayedState]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        # One save is only ever written by one session at a time, so striped
+        # locks are enough to keep appends and compaction for a path ordered
+        self._locks = [threading.Lock() for _ in range(_LOCK_STRIPES)]
+
+    def _lock_for(self, state_path: Path) -> threading.Lock:
+        return self._locks[hash(state_path) % _LOCK_STRIPES]
+
+    def _cached(self, state_path: Path) -> Optional[ReplayedState]:
+        with self._cache_lock:
+            entry = self._cache.get(state_path)
+            if entry is not None:
+                self._cache.move_to_end(state_path)
+            return entry
+
+    def _remember(self, state_path: Path, entry: ReplayedState) -> None:
+        with self._cache_lock:
+            self._cache[state_path] = entry
+            self._cache.move_to_end(state_path)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def load(self, state_path: Path) -> Optional[Dict[str, Any]]:
+        """
+        Load a save, replaying its journal.
+
+        Returns:
+            A fresh copy of the state, or None if there is no save
+        """
+        with self._lock_for(state_path):
+            entry = replay(state_path, self.read_snapshot)
+            if entry is None:
+                return None
+            self._remember(state_path, entry)
+            return json.loads(json.dumps(entry.state))
+
+    def append(self, state_path: Path, state: Dict[str, Any], event: Optional[str] = None) -> None:
+        """
+        Persist a save by appending what changed since the last one.
+
+        Args:
+            state_path: The save file
+            state: Current player state
+            event: What caused the change ("choice", "equip", ...), for the audit trail
+        """
+        plain = json.loads(json.dumps(state, default=json_default))
+        with self._lock_for(state_path):
+            entry = self._cached(state_path) or replay(state_path, self.read_snapshot)
+            if entry is None:
+                self._snapshot(state_path, ReplayedState(plain, 0, 0))
+                return
+
+            ops = diff(entry.state, plain)
+            if not ops:
+                self._remember(state_path, entry)
+                return
+            self._write_record(state_path, entry.seq + 1, event, ops)
+            entry = ReplayedState(plain, entry.seq + 1, entry.records + 1)
+            if entry.records >= self.snapshot_every:
+                self._snapshot(state_path, entry)
+            else:
+                self._remember(state_path, entry)
+
+    def compact(self, state_path: Path) -> None:
+        """Fold the journal into a fresh snapshot now."""
+        with self._lock_for(state_path):
+            entry = self._cached(state_path) or replay(state_path, self.read_snapshot)
+            if entry is not None and entry.records:
+                self._snapshot(state_path, entry)
+
+    def delete(self, state_path: Path) -> None:
+        """Forget a save's journal (the caller deletes the save file)."""
+        with self._lock_for(state_path):
+            with self._cache_lock:
+                self._cache.pop(state_path, None)
+            try:
+                journal_path(state_path).unlink()
+            except FileNotFoundError:
+                pass
+
+    def _write_record(self, state_path: Path, seq: int, event: Optional[str], ops: List[Dict[str, Any]]) -> None:
+        record = {"seq": seq, "ts": int(time.time() * 1000), "event": event, "ops": ops}
+        line = json.dumps(record, separators=(",", ":"), ensure_ascii=False) + "\n"
+        with open(journal_path(state_path), "ab") as f:
+            f.write(line.encode("utf-8"))
+            if self.fsync:
+                f.flush()
+                os.fsync(f.fileno())
+
+    def _snapshot(self, state_path: Path, entry: ReplayedState) -> None:
+        # Snapshot first: if we crash before truncating, replay skips the
+        # records it already contains
+        self.write_snapshot(state_path, {**entry.state, SNAPSHOT_SEQ_KEY: entry.seq})
+        with open(journal_path(state_path), "wb"):
+            pass
+        self._remember(state_path, ReplayedState(entry.state, entry.seq, 0))
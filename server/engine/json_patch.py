@@ -0,0 +1,90 @@
+"""
+JSON Patch: Minimal RFC 6902 diff/apply for plain JSON data.
+Used to send clients only what changed in their game state.
+"""
+
+import copy
+from typing import Any, Dict, List
+
+
+def _escape(key: str) -> str:
+    return str(key).replace("~", "~0").replace("/", "~1")
+
+
+def _unescape(token: str) -> str:
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+def diff(old: Any, new: Any, path: str = "") -> List[Dict[str, Any]]:
+    """
+    Ops (add / remove / replace) that turn `old` into `new`.
+
+    Dicts are diffed per key and lists per index (trailing items are
+    removed or appended); anything else is replaced wholesale.
+    """
+    if isinstance(old, dict) and isinstance(new, dict):
+        ops = []
+        for key in old:
+            if key not in new:
+                ops.append({"op": "remove", "path": f"{path}/{_escape(key)}"})
+        for key, value in new.items():
+            key_path = f"{path}/{_escape(key)}"
+            if key not in old:
+                ops.append({"op": "add", "path": key_path, "value": value})
+            else:
+                ops.extend(diff(old[key], value, key_path))
+        return ops
+
+    if isinstance(old, list) and isinstance(new, list):
+        ops = []
+        common = min(len(old), len(new))
+        for i in range(common):
+            ops.extend(diff(old[i], new[i], f"{path}/{i}"))
+        # Remove from the end so earlier indices stay valid
+        for i in range(len(old) - 1, common - 1, -1):
+            ops.append({"op": "remove", "path": f"{path}/{i}"})
+        for i in range(common, len(new)):
+            ops.append({"op": "add", "path": f"{path}/{i}", "value": new[i]})
+        return ops
+
+    # Compared per leaf so True and 1 (equal in Python) still differ
+    if type(old) is type(new) and old == new:
+        return []
+    return [{"op": "replace", "path": path, "value": new}]
+
+
+def apply_patch(document: Any, ops: List[Dict[str, Any]], in_place: bool = False) -> Any:
+    """
+    Apply ops produced by diff() to a copy of `document` and return it.
+
+    With in_place=True `document` itself is modified (and returned), for
+    callers replaying many patches onto a document they own.
+    """
+    if not in_place:
+        document = copy.deepcopy(document)
+    for op in ops:
+        path = op["path"]
+        if path == "":
+            document = copy.deepcopy(op["value"])
+            continue
+
+        tokens = [_unescape(token) for token in path.split("/")[1:]]
+        parent = document
+        for token in tokens[:-1]:
+            parent = parent[int(token)] if isinstance(parent, list) else parent[token]
+
+        last = tokens[-1]
+        if isinstance(parent, list):
+            index = len(parent) if last == "-" else int(last)
+            if op["op"] == "add":
+                parent.insert(index, copy.deepcopy(op["value"]))
+            elif op["op"] == "remove":
+                del parent[index]
+            else:
+                parent[index] = copy.deepcopy(op["value"])
+        else:
+            if op["op"] == "remove":
+                del parent[last]
+            else:
+                parent[last] = copy.deepcopy(op["value"])
+    return document
@@ -0,0 +1,123 @@
+"""
+Log Writer: Buffered, rotating append-only log file.
+Callers only append to an in-memory buffer; a background thread writes it out
+when it fills up or on a timer, so request handlers never touch the disk.
+"""
+
+import atexit
+import logging
+import threading
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class BufferedLogWriter:
+    """Buffers log lines and flushes them by size or time, rotating the file."""
+
+    def __init__(self, path: Path, flush_interval: float = 1.0, max_buffered_lines: int = 200,
+                 max_bytes: int = 5 * 1024 * 1024, backup_count: int = 3):
+        """
+        Initialize BufferedLogWriter.
+
+        Args:
+            path: Log file to append to
+            flush_interval: Seconds between timed flushes
+            max_buffered_lines: Buffer size that triggers an early flush
+            max_bytes: Rotate once the file would grow past this (0 = never)
+            backup_count: Rotated files kept as path.1 .. path.N
+        """
+        self.path = Path(path)
+        self.flush_interval = flush_interval
+        self.max_buffered_lines = max_buffered_lines
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+
+        self._buffer: List[str] = []
+        self._buffer_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        self._flusher: Optional[threading.Thread] = None
+
+    def write(self, lines: Iterable[str]) -> None:
+        """Queue complete lines (each ending in a newline) for writing."""
+        with self._buffer_lock:
+            self._buffer.extend(lines)
+            full = len(self._buffer) >= self.max_buffered_lines
+        self._ensure_flusher()
+        if full:
+            self._wake.set()
+
+    def flush(self) -> None:
+        """
+        Write everything buffered so far.
+
+        If the write fails (OSError), the lines go back to the front of the
+        buffer for the next flush and the error is raised.
+        """
+        with self._flush_lock:
+            with self._buffer_lock:
+                lines, self._buffer = self._buffer, []
+            if not lines:
+                return
+
+            data = "".join(lines).encode("utf-8")
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                if self._should_rotate(len(data)):
+                    self._rotate()
+                with open(self.path, "ab") as f:
+                    f.write(data)
+            except OSError:
+                with self._buffer_lock:
+                    self._buffer[:0] = lines
+                raise
+
+    def close(self) -> None:
+        """Stop the background flusher and write any remaining lines."""
+        self._closed = True
+        self._wake.set()
+        flusher = self._flusher
+        if flusher and flusher is not threading.current_thread():
+            flusher.join(timeout=self.flush_interval + 1)
+        self.flush()
+
+    def _should_rotate(self, incoming: int) -> bool:
+        if not self.max_bytes or not self.path.exists():
+            return False
+        size = self.path.stat().st_size
+        return size > 0 and size + incoming > self.max_bytes
+
+    def _rotate(self) -> None:
+        """Shift path -> path.1 -> ... -> path.N, dropping the oldest."""
+        if self.backup_count <= 0:
+            self.path.unlink()
+            return
+        for i in range(self.backup_count - 1, 0, -1):
+            source = self.path.with_name(f"{self.path.name}.{i}")
+            if source.exists():
+                source.replace(self.path.with_name(f"{self.path.name}.{i + 1}"))
+        self.path.replace(self.path.with_name(f"{self.path.name}.1"))
+
+    def _ensure_flusher(self) -> None:
+        """Start the background flush thread on first use."""
+        if self._flusher is not None:
+            return
+        with self._buffer_lock:
+            if self._flusher is not None:
+                return
+            self._flusher = threading.Thread(target=self._flush_loop, name="log-flusher", daemon=True)
+            self._flusher.start()
+        atexit.register(self.close)
+
+    def _flush_loop(self) -> None:
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except OSError:
+                logger.warning("Failed to flush log %s; keeping the lines for the next flush", self.path,
+                               exc_info=True)
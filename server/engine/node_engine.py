@@ -3,9 +3,14 @@ Node Engine: Processes narrative nodes and validates choice requirements.
 Routes player actions to next nodes and applies effects.
 """
 
-from typing import Dict, Any, List, Optional, Tuple
+from collections import Counter
+from typing import Callable, Dict, Any, List, Mapping, Optional, Tuple
 from enum import Enum
 
+from engine.item_registry import ITEM_REGISTRY, ItemRegistry
+from engine.flags import FLAG_REGISTRY, FlagSet
+from engine.inventory import Inventory
+
 if False:
     from engine.rules import RulesEngine
 
@@ -20,19 +25,122 @@ class NodeProcessResult:
         self.effects = effects or {}
 
 
+def inventory_name_counts(player_inventory: List[Dict[str, Any]]) -> Mapping[str, int]:
+    """Name -> count multiset of an inventory for requirement checks."""
+    if isinstance(player_inventory, Inventory):
+        return player_inventory.name_counts()
+    return Counter(item.get("name") for item in player_inventory)
+
+
+class CompiledRequirements:
+    """
+    A choice's requirements flattened into tuples for fast repeated checks.
+    
+    Compiled once per choice at load time instead of walking the raw
+    requirements dict on every validation. Flag requirements also compile
+    to bit masks, checked in one step against a player's FlagSet.
+    """
+    
+    __slots__ = ("stats", "flags", "flag_masks", "items", "always")
+    
+    def __init__(self, requirements: Optional[Mapping[str, Any]]):
+        requirements = requirements or {}
+        flags = requirements.get("flags", {})
+        self.stats: Tuple[Tuple[str, int], ...] = tuple(requirements.get("stats", {}).items())
+        self.flags: Tuple[Tuple[str, Any], ...] = tuple(flags.items())
+        self.flag_masks: Optional[Tuple[int, int]] = FLAG_REGISTRY.compile(flags) if flags else None
+        self.items: Tuple[str, ...] = tuple(dict.fromkeys(requirements.get("items", ())))
+        self.always = not (self.stats or self.flags or self.items)
+    
+    def check(self, player_stats: Dict[str, int], player_flags: Dict[str, bool],
+              item_counts: Mapping[str, int]) -> bool:
+        """Check the requirements against a player's stats, flags and inventory multiset."""
+        if self.always:
+            return True
+        for stat_name, min_value in self.stats:
+            if player_stats.get(stat_name, 0) < min_value:
+                return False
+        masks = self.flag_masks
+        if masks is not None and isinstance(player_flags, FlagSet) and player_flags.registry is FLAG_REGISTRY:
+            if not player_flags.matches(*masks):
+                return False
+        else:
+            for flag_name, required_value in self.flags:
+                if player_flags.get(flag_name, False) != required_value:
+                    return False
+        for item_name in self.items:
+            if not item_counts.get(item_name):
+                return False
+        return True
+
+
 class NodeEngine:
     """Processes narrative nodes and handles choice logic."""
     
-    def __init__(self, nodes_data: Dict[str, Any], rules_engine: 'RulesEngine'):
+    def __init__(self, nodes_data: Dict[str, Any], rules_engine: 'RulesEngine',
+                 text_source: Optional[Callable[[str], str]] = None,
+                 item_registry: Optional[ItemRegistry] = None):
         """
         Initialize NodeEngine.
         
         Args:
             nodes_data: Dictionary of node definitions
             rules_engine: RulesEngine instance for stat checks
+            text_source: Loads a node's text on demand when nodes_data
+                         holds only metadata (see ContentStore.node_text)
+            item_registry: Interns items granted by choices (default: ITEM_REGISTRY)
         """
-        self.nodes = nodes_data
         self.rules_engine = rules_engine
+        self.item_registry = item_registry or ITEM_REGISTRY
+        
+        # (nodes, compiled choice requirements by node ID, text source), replaced
+        # as one tuple so a content reload is never seen half-applied
+        self._content: Tuple[Mapping[str, Any], Dict[str, Tuple[CompiledRequirements, ...]],
+                             Optional[Callable[[str], str]]] = ({}, {}, None)
+        self.set_nodes(nodes_data, text_source)
+    
+    @property
+    def nodes(self) -> Mapping[str, Any]:
+        """Current node definitions keyed by node ID."""
+        return self._content[0]
+    
+    @property
+    def text_source(self) -> Optional[Callable[[str], str]]:
+        return self._content[2]
+    
+    def set_nodes(self, nodes_data: Mapping[str, Any], text_source: Optional[Callable[[str], str]] = None) -> None:
+        """
+        Swap in a new node set atomically (used by content hot reload).
+        
+        Nodes that are the same objects as before keep their compiled
+        requirements; only new or changed nodes are compiled.
+        """
+        old_nodes, old_compiled, _ = self._content
+        compiled = {}
+        for node_id, node in nodes_data.items():
+            previous = old_compiled.get(node_id)
+            if previous is not None and old_nodes.get(node_id) is node:
+                compiled[node_id] = previous
+            else:
+                FLAG_REGISTRY.intern_nodes({node_id: node})
+                compiled[node_id] = self._compile_node(node)
+        self._content = (nodes_data, compiled, text_source)
+    
+    @staticmethod
+    def _compile_node(node: Mapping[str, Any]) -> Tuple[CompiledRequirements, ...]:
+        return tuple(CompiledRequirements(choice.get("requirements")) for choice in node.get("choices", ()))
+    
+    def get_choice_requirements(self, node_id: str) -> Tuple[CompiledRequirements, ...]:
+        """Compiled requirements for each choice of a node, in choice order."""
+        nodes, compiled_nodes, _ = self._content
+        compiled = compiled_nodes.get(node_id)
+        if compiled is None:
+            node = nodes.get(node_id)
+            if not node:
+                return ()
+            compiled = self._compile_node(node)
+            compiled_nodes[node_id] = compiled
+        return compiled
     
     def get_node(self, node_id: str) -> Optional[Dict[str, Any]]:
         """Retrieve a node by ID."""
@@ -54,26 +162,9 @@ class NodeEngine:
         if not requirements:
             return True
         
-        # Check stats
-        if "stats" in requirements:
-            for stat_name, min_value in requirements["stats"].items():
-                if player_stats.get(stat_name, 0) < min_value:
-                    return False
-        
-        # Check flags
-        if "flags" in requirements:
-            for flag_name, required_value in requirements["flags"].items():
-                if player_flags.get(flag_name, False) != required_value:
-                    return False
-        
-        # Check inventory
-        if "items" in requirements:
-            for item_name in requirements["items"]:
-                has_item = any(item.get("name") == item_name for item in player_inventory)
-                if not has_item:
-                    return False
-        
-        return True
+        compiled = CompiledRequirements(requirements)
+        item_counts = inventory_name_counts(player_inventory) if compiled.items else {}
+        return compiled.check(player_stats, player_flags, item_counts)
     
     def apply_effects(self, player_stats: Dict[str, int], player_flags: Dict[str, bool],
                       player_inventory: List[Dict[str, Any]], effects: Dict[str, Any]) -> None:
@@ -109,7 +200,8 @@ class NodeEngine:
         # Add items
         if "items" in effects:
             for item in effects["items"]:
-                player_inventory.append(item)
+                # Node content is shared; hold the registry's immutable ref
+                player_inventory.append(self.item_registry.intern(item))
         
         # Add experience
         if "experience" in effects:
@@ -127,17 +219,27 @@ class NodeEngine:
             return None, []
         
         available_choices = []
-        if "choices" in node:
-            for i, choice in enumerate(node["choices"]):
-                requirements = choice.get("requirements", {})
-                if self.validate_requirements(player_stats, player_flags, player_inventory, requirements):
-                    # Add choice index for selection
-                    choice_with_index = choice.copy()
-                    choice_with_index["_index"] = i
-                    available_choices.append(choice_with_index)
+        for i in self.get_available_choice_indices(player_stats, player_flags, player_inventory, node_id):
+            # Add choice index for selection
+            choice_with_index = dict(node["choices"][i])
+            choice_with_index["_index"] = i
+            available_choices.append(choice_with_index)
         
         return node, available_choices
     
+    def get_available_choice_indices(self, player_stats: Dict[str, int], player_flags: Dict[str, bool],
+                                     player_inventory: List[Dict[str, Any]], node_id: str) -> List[int]:
+        """Indices of the node's choices whose requirements the player meets."""
+        node = self.get_node(node_id)
+        if not node or "choices" not in node:
+            return []
+        
+        compiled = self.get_choice_requirements(node_id)
+        needs_items = any(requirements.items for requirements in compiled)
+        item_counts = inventory_name_counts(player_inventory) if needs_items else {}
+        return [i for i, requirements in enumerate(compiled)
+                if requirements.check(player_stats, player_flags, item_counts)]
+    
     def process_choice(self, player_stats: Dict[str, int], player_flags: Dict[str, bool],
                        player_inventory: List[Dict[str, Any]], node_id: str, choice_index: int) -> NodeProcessResult:
         """
@@ -163,8 +265,9 @@ class NodeEngine:
         choice = node["choices"][choice_index]
         
         # Validate requirements
-        requirements = choice.get("requirements", {})
-        if not self.validate_requirements(player_stats, player_flags, player_inventory, requirements):
+        requirements = self.get_choice_requirements(node_id)[choice_index]
+        item_counts = inventory_name_counts(player_inventory) if requirements.items else {}
+        if not requirements.check(player_stats, player_flags, item_counts):
             return NodeProcessResult(False, "Choice requirements not met")
         
         # Apply effects
@@ -186,4 +289,6 @@ class NodeEngine:
         node = self.get_node(node_id)
         if not node:
             return f"Node '{node_id}' not found"
+        if self.text_source is not None:
+            return self.text_source(node_id)
         return node.get("text", "")
@@ -0,0 +1,119 @@
+"""
+Node Graph: Loads every zone file in parallel and merges them into one graph.
+The merged graph is validated up front (duplicate ids, dangling next/combat
+references) so broken content stops the server at startup, not mid-game.
+"""
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+# Combat trigger that picks an enemy at runtime instead of naming one
+RANDOM_COMBAT = "random"
+
+
+class ContentValidationError(ValueError):
+    """Raised when node content is inconsistent; lists every problem found."""
+
+    def __init__(self, problems: List[str]):
+        self.problems = problems
+        super().__init__(f"{len(problems)} content problem(s):\n  " + "\n  ".join(problems))
+
+
+@dataclass
+class NodeGraph:
+    """Merged nodes from every zone file, plus an index of their links."""
+    nodes: Dict[str, Dict[str, Any]]
+    # Node ID -> file it was defined in
+    sources: Dict[str, str] = field(default_factory=dict)
+    # Node ID -> IDs reachable in one choice (in choice order, without repeats)
+    edges: Dict[str, Tuple[str, ...]] = field(default_factory=dict)
+    # Node ID -> enemy IDs its choices can start a fight with
+    combats: Dict[str, Tuple[str, ...]] = field(default_factory=dict)
+
+
+def _read_zone(path: Path) -> Tuple[Path, Dict[str, Any]]:
+    with open(path, 'r', encoding='utf-8') as f:
+        return path, json.load(f)
+
+
+def load_zone_files(paths: Sequence[Path], max_workers: Optional[int] = None) -> List[Tuple[Path, Dict[str, Any]]]:
+    """Read zone files concurrently; results keep the order of `paths`."""
+    if len(paths) <= 1:
+        return [_read_zone(path) for path in paths]
+    with ThreadPoolExecutor(max_workers=max_workers or min(8, len(paths))) as pool:
+        return list(pool.map(_read_zone, paths))
+
+
+def build_node_graph(zones: Iterable[Tuple[Path, Dict[str, Any]]],
+                     enemy_ids: Optional[Set[str]] = None) -> NodeGraph:
+    """
+    Merge zone contents into one graph and validate it.
+
+    Args:
+        zones: (source path, {node_id: node}) pairs
+        enemy_ids: Known enemy IDs; combat triggers are checked only if given
+
+    Raises:
+        ContentValidationError: On duplicate IDs or dangling references
+    """
+    problems = []
+    nodes: Dict[str, Dict[str, Any]] = {}
+    sources: Dict[str, str] = {}
+
+    for path, zone in zones:
+        if not isinstance(zone, dict):
+            problems.append(f"{path.name}: expected an object of nodes, got {type(zone).__name__}")
+            continue
+        for node_id, node in zone.items():
+            if node_id in nodes:
+                problems.append(f"{path.name}: duplicate node '{node_id}' (already defined in {sources[node_id]})")
+                continue
+            nodes[node_id] = node
+            sources[node_id] = path.name
+
+    edges = {}
+    combats = {}
+    for node_id, node in nodes.items():
+        targets = []
+        fights = []
+        for i, choice in enumerate(node.get("choices", [])):
+            where = f"{sources[node_id]}: {node_id} choice {i}"
+            target = choice.get("next")
+            if target is not None:
+                if target not in nodes:
+                    problems.append(f"{where}: next '{target}' does not exist")
+                elif target not in targets:
+                    targets.append(target)
+
+            trigger = choice.get("effects", {}).get("combat")
+            if trigger is not None and trigger != RANDOM_COMBAT:
+                if enemy_ids is not None and trigger not in enemy_ids:
+                    problems.append(f"{where}: combat '{trigger}' is not a known enemy")
+                elif trigger not in fights:
+                    fights.append(trigger)
+        edges[node_id] = tuple(targets)
+        combats[node_id] = tuple(fights)
+
+    if problems:
+        raise ContentValidationError(problems)
+    return NodeGraph(nodes=nodes, sources=sources, edges=edges, combats=combats)
+
+
+def load_node_graph(path: Path, enemy_ids: Optional[Set[str]] = None,
+                    max_workers: Optional[int] = None) -> NodeGraph:
+    """
+    Load a single node file, or every *.json zone file in a directory.
+
+    Args:
+        path: Node file or directory of zone files
+        enemy_ids: Known enemy IDs for validating combat triggers
+        max_workers: Threads used to read zone files
+    """
+    path = Path(path)
+    if not path.exists():
+        raise FileNotFoundError(f"Nodes not found at {path}")
+    files = [path] if path.is_file() else sorted(path.glob("*.json"))
+    return build_node_graph(load_zone_files(files, max_workers), enemy_ids)
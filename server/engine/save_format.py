@@ -0,0 +1,273 @@
+"""
+Save Format: Compact, versioned binary encoding for player saves.
+Stats are a fixed-layout int64 record; inventory and equipment items are
+stored as catalog references plus per-instance overrides; everything else
+is compact JSON. Older versions (including plain JSON saves) are upgraded
+through registered migrations on load.
+"""
+
+import json
+import struct
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from engine.content_store import thaw
+from engine.item_registry import ItemRef, ItemRegistry
+from engine.stats import json_default
+
+MAGIC = b"ECRSAVE\x00"
+FORMAT_VERSION = 1
+# Magic, format version, stat presence mask; followed by the present stats
+# as int64s, then the rest of the save as compact UTF-8 JSON
+HEADER = struct.Struct("<8sHQ")
+
+# Stat record layout per format version. Frozen here (not engine.stats'
+# STAT_NAMES) so old saves still decode if the live layout changes.
+STAT_LAYOUTS: Dict[int, Tuple[str, ...]] = {
+    1: ("level", "experience", "free_stat_points", "hp", "mp", "strength", "defence",
+        "vitality", "wisdom", "agility", "perception", "lifeforce", "max_hp", "attack_power"),
+}
+
+_INT64_MIN = -(2 ** 63)
+_INT64_MAX = 2 ** 63 - 1
+
+# Saves written before this format existed: the pretty-printed JSON files
+JSON_VERSION = 0
+
+# from_version -> hook turning a decoded save of that version into the next one
+_MIGRATIONS: Dict[int, Callable[[Dict[str, Any]], Dict[str, Any]]] = {}
+
+
+class SaveFormatError(ValueError):
+    """Raised for data that is not a readable save."""
+
+
+def migration(from_version: int) -> Callable:
+    """
+    Register a hook that upgrades a decoded save from `from_version` to the next version.
+
+    Example:
+        @migration(1)
+        def add_reputation(state):
+            state.setdefault("reputation", 0)
+            return state
+    """
+    def register(hook: Callable[[Dict[str, Any]], Dict[str, Any]]) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+        _MIGRATIONS[from_version] = hook
+        return hook
+    return register
+
+
+def migrate(state: Dict[str, Any], version: int) -> Dict[str, Any]:
+    """Run every migration from `version` up to FORMAT_VERSION."""
+    for from_version in range(version, FORMAT_VERSION):
+        hook = _MIGRATIONS.get(from_version)
+        if hook is not None:
+            state = hook(state)
+    return state
+
+
+def _clone(value: Any) -> Any:
+    """Deep copy of plain JSON data (much cheaper than copy.deepcopy)."""
+    if type(value) is dict:
+        return {key: _clone(item) for key, item in value.items()}
+    if type(value) is list:
+        return [_clone(item) for item in value]
+    return value
+
+
+class ItemCatalog:
+    """Item definitions that saved items are stored as references to."""
+
+    def __init__(self, definitions: Iterable[Mapping[str, Any]] = (),
+                 registry: Optional[ItemRegistry] = None):
+        """
+        Initialize ItemCatalog.
+
+        Args:
+            definitions: Item dicts; each is referenced by its "id" if it has
+                         one, else by its "name"
+            registry: Registry whose items (including node-granted ones) are
+                      referenced by registry ID; looked up live, so items
+                      registered later (hot reloads) are covered too
+        """
+        self.registry = registry
+        self.definitions: Dict[str, Dict[str, Any]] = {}
+        self._by_name: Dict[str, str] = {}
+        for definition in definitions:
+            ref = definition.get("id") or definition.get("name")
+            if ref is None:
+                continue
+            self.definitions[ref] = thaw(definition)
+            self._by_name.setdefault(definition.get("name"), ref)
+        # Registry ID -> plain definition; a registered item's content never changes
+        self._registered: Dict[str, Dict[str, Any]] = {}
+        # Registry ID -> encoded form of refs from other registries
+        self._encoded_refs: Dict[str, Any] = {}
+
+    def definition(self, ref: str) -> Optional[Dict[str, Any]]:
+        """The definition a reference points to (registry first), or None."""
+        definition = self._registered.get(ref)
+        if definition is not None:
+            return definition
+        if self.registry is not None:
+            registered = self.registry.get(ref)
+            if registered is not None:
+                definition = self._registered[ref] = registered.to_dict()
+                return definition
+        return self.definitions.get(ref)
+
+    def ref_for(self, item: Mapping[str, Any]) -> Optional[str]:
+        """The catalog reference for an item instance, or None if it has no definition."""
+        item_id = item.get("id")
+        if item_id is not None:
+            return item_id if self.definition(item_id) is not None else None
+        ref = self._by_name.get(item.get("name"))
+        if ref is None and self.registry is not None:
+            registered = self.registry.by_name(item.get("name"))
+            if registered is not None:
+                ref = registered.id
+        return ref
+
+    def encode(self, item: Any) -> Any:
+        """
+        An item as its reference ("ref"), [ref, overrides] or [ref, overrides,
+        removed keys]; items without a definition are kept whole.
+        """
+        if isinstance(item, ItemRef):
+            if self.registry is not None and self.registry.get(item.id) is item:
+                return item.id
+            encoded = self._encoded_refs.get(item.id)
+            if encoded is None:
+                encoded = self._encoded_refs[item.id] = self.encode(item.to_dict())
+            return encoded
+        if not isinstance(item, dict):
+            if not isinstance(item, Mapping):
+                return item
+            item = thaw(item)
+        ref = self.ref_for(item)
+        if ref is None:
+            return item
+        definition = self.definition(ref)
+        overrides = {key: value for key, value in item.items()
+                     if key not in definition or type(definition[key]) is not type(value)
+                     or definition[key] != value}
+        removed = [key for key in definition if key not in item]
+        if removed:
+            return [ref, overrides, removed]
+        if overrides:
+            return [ref, overrides]
+        return ref
+
+    def decode(self, encoded: Any) -> Any:
+        """Rebuild an item instance from encode()'s output."""
+        if isinstance(encoded, str):
+            ref, overrides, removed = encoded, None, ()
+        elif isinstance(encoded, list):
+            ref, overrides, removed = encoded[0], encoded[1], encoded[2] if len(encoded) > 2 else ()
+        else:
+            return encoded
+
+        definition = self.definition(ref)
+        if definition is None:
+            # Removed from the content: keep what we know so the save still loads
+            print(f"[WARN] Saved item '{ref}' is no longer defined")
+            item = {"id": ref, "name": ref}
+        else:
+            item = _clone(definition)
+        if overrides:
+            item.update(overrides)
+        for key in removed:
+            item.pop(key, None)
+        return item
+
+
+def _encode_items(state: Dict[str, Any], catalog: ItemCatalog) -> None:
+    inventory = state.get("inventory")
+    if isinstance(inventory, list):
+        state["inventory"] = [catalog.encode(item) for item in inventory]
+    equipment = state.get("equipment")
+    if isinstance(equipment, Mapping):
+        state["equipment"] = {slot: catalog.encode(item) for slot, item in equipment.items()}
+
+
+def _decode_items(state: Dict[str, Any], catalog: ItemCatalog) -> None:
+    inventory = state.get("inventory")
+    if isinstance(inventory, list):
+        state["inventory"] = [catalog.decode(item) for item in inventory]
+    equipment = state.get("equipment")
+    if isinstance(equipment, Mapping):
+        state["equipment"] = {slot: catalog.decode(item) for slot, item in equipment.items()}
+
+
+def encode_save(state: Mapping[str, Any], catalog: ItemCatalog) -> bytes:
+    """
+    Encode a player state in the current format.
+
+    Stats outside the fixed layout (or not int64) are kept in the JSON part.
+    """
+    layout = STAT_LAYOUTS[FORMAT_VERSION]
+    stats = state.get("stats") or {}
+    present = 0
+    values: List[int] = []
+    packed = set()
+    for index, name in enumerate(layout):
+        value = stats.get(name)
+        if type(value) is int and _INT64_MIN <= value <= _INT64_MAX:
+            present |= 1 << index
+            values.append(value)
+            packed.add(name)
+
+    rest = {key: value for key, value in state.items() if key != "stats"}
+    extra_stats = {name: value for name, value in stats.items() if name not in packed}
+    if extra_stats:
+        rest["stats"] = extra_stats
+    _encode_items(rest, catalog)
+
+    body = json.dumps(rest, separators=(",", ":"), ensure_ascii=False, default=json_default).encode("utf-8")
+    return HEADER.pack(MAGIC, FORMAT_VERSION, present) + struct.pack(f"<{len(values)}q", *values) + body
+
+
+def _decode_binary(data: bytes, catalog: ItemCatalog) -> Tuple[Dict[str, Any], int]:
+    magic, version, present = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise SaveFormatError("Not a save file")
+    layout = STAT_LAYOUTS.get(version)
+    if layout is None:
+        raise SaveFormatError(f"Unsupported save version {version} (this build reads up to {FORMAT_VERSION})")
+
+    names = [name for index, name in enumerate(layout) if present >> index & 1]
+    offset = HEADER.size + 8 * len(names)
+    try:
+        values = struct.unpack_from(f"<{len(names)}q", data, HEADER.size)
+        state = json.loads(data[offset:].decode("utf-8"))
+    except (ValueError, struct.error) as e:
+        raise SaveFormatError(f"Corrupt save: {e}") from e
+
+    stats = dict(zip(names, values))
+    stats.update(state.get("stats", {}))
+    state["stats"] = stats
+    _decode_items(state, catalog)
+    return state, version
+
+
+def decode_save(data: bytes, catalog: ItemCatalog) -> Dict[str, Any]:
+    """
+    Decode a save in any supported version, migrating it to the current one.
+
+    Plain JSON saves (version 0) are accepted too, so existing saves load.
+    """
+    if data[:len(MAGIC)] == MAGIC:
+        if len(data) < HEADER.size:
+            raise SaveFormatError("Truncated save")
+        state, version = _decode_binary(data, catalog)
+    else:
+        try:
+            state, version = json.loads(data.decode("utf-8")), JSON_VERSION
+        except ValueError as e:
+            raise SaveFormatError(f"Not a save file: {e}") from e
+    return migrate(state, version)
+
+
+def export_json(data: bytes, catalog: ItemCatalog) -> str:
+    """A save as pretty-printed JSON, for debugging."""
+    return json.dumps(decode_save(data, catalog), indent=2, ensure_ascii=False, default=json_default)
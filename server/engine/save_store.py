@@ -0,0 +1,177 @@
+"""
+Save Store: Pluggable player save backends for StateManager.
+SqliteSaveStore keeps every player's save in one WAL-mode database, with
+the node, level, stats, flags and inventory in their own (JSON) columns so
+cohorts can be queried without loading each save.
+"""
+
+import json
+import queue
+from abc import ABC, abstractmethod
+import sqlite3
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from engine.stats import json_default
+
+# Key for the single-player save (player_id None); matches the default session ID
+SINGLE_PLAYER_KEY = "default"
+
+# Save keys with their own columns; everything else goes into `extra`
+_COLUMN_KEYS = ("current_node", "stats", "flags", "inventory")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS saves (
+    player_id    TEXT PRIMARY KEY,
+    current_node TEXT,
+    level        INTEGER,
+    stats        TEXT NOT NULL DEFAULT '{}',
+    flags        TEXT NOT NULL DEFAULT '{}',
+    inventory    TEXT NOT NULL DEFAULT '[]',
+    extra        TEXT NOT NULL DEFAULT '{}',
+    updated_at   INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS saves_current_node ON saves (current_node);
+CREATE INDEX IF NOT EXISTS saves_level ON saves (level);
+"""
+
+
+class SaveStore(ABC):
+    """Interface for save backends. Player IDs are strings; None is the single-player save."""
+
+    @abstractmethod
+    def load(self, player_id: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Return the player's save, or None if there is none."""
+
+    @abstractmethod
+    def save(self, player_id: Optional[str], state: Dict[str, Any], event: Optional[str] = None) -> None:
+        """Store the player's save, replacing any previous one."""
+
+    @abstractmethod
+    def delete(self, player_id: Optional[str]) -> None:
+        """Remove the player's save if it exists."""
+
+    def close(self) -> None:
+        """Release any resources held by the store."""
+
+
+class SqliteSaveStore(SaveStore):
+    """Player saves in a SQLite database, shared by a small connection pool."""
+
+    def __init__(self, path: Path, pool_size: int = 4, busy_timeout: float = 5.0):
+        """
+        Initialize SqliteSaveStore, creating the database if needed.
+
+        Args:
+            path: Database file
+            pool_size: Connections shared by all request threads
+            busy_timeout: Seconds a write waits for another writer's lock
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.busy_timeout = busy_timeout
+        self._pool: "queue.Queue[sqlite3.Connection]" = queue.Queue()
+        self._connections: List[sqlite3.Connection] = []
+        for _ in range(max(1, pool_size)):
+            connection = self._connect()
+            self._connections.append(connection)
+            self._pool.put(connection)
+        with self._connection() as connection:
+            connection.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        # Pooled connections move between threads, but only one uses each at a time
+        connection = sqlite3.connect(str(self.path), timeout=self.busy_timeout,
+                                     isolation_level=None, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        # Safe with WAL: a power loss can drop the last commits, never corrupt the file
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        connection = self._pool.get()
+        try:
+            yield connection
+        finally:
+            self._pool.put(connection)
+
+    @staticmethod
+    def _key(player_id: Optional[str]) -> str:
+        return SINGLE_PLAYER_KEY if player_id is None else player_id
+
+    def load(self, player_id: Optional[str]) -> Optional[Dict[str, Any]]:
+        with self._connection() as connection:
+            row = connection.execute(
+                "SELECT current_node, stats, flags, inventory, extra FROM saves WHERE player_id = ?",
+                (self._key(player_id),)
+            ).fetchone()
+        if row is None:
+            return None
+        current_node, stats, flags, inventory, extra = row
+        state = json.loads(extra)
+        state.update(stats=json.loads(stats), flags=json.loads(flags),
+                     inventory=json.loads(inventory), current_node=current_node)
+        return state
+
+    def save(self, player_id: Optional[str], state: Dict[str, Any], event: Optional[str] = None) -> None:
+        def encode(value: Any) -> str:
+            return json.dumps(value, separators=(",", ":"), default=json_default)
+
+        stats = state.get("stats", {})
+        extra = {key: value for key, value in state.items() if key not in _COLUMN_KEYS}
+        with self._connection() as connection:
+            connection.execute(
+                """
+                INSERT INTO saves (player_id, current_node, level, stats, flags, inventory, extra, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (player_id) DO UPDATE SET
+                    current_node = excluded.current_node, level = excluded.level,
+                    stats = excluded.stats, flags = excluded.flags, inventory = excluded.inventory,
+                    extra = excluded.extra, updated_at = excluded.updated_at
+                """,
+                (self._key(player_id), state.get("current_node"), stats.get("level"), encode(stats),
+                 encode(state.get("flags", {})), encode(state.get("inventory", [])), encode(extra),
+                 int(time.time() * 1000))
+            )
+
+    def delete(self, player_id: Optional[str]) -> None:
+        with self._connection() as connection:
+            connection.execute("DELETE FROM saves WHERE player_id = ?", (self._key(player_id),))
+
+    # --- Cohort queries ---
+
+    def players_at_node(self, node_id: str) -> List[str]:
+        """IDs of players whose save is at a node (uses the current_node index)."""
+        with self._connection() as connection:
+            rows = connection.execute(
+                "SELECT player_id FROM saves WHERE current_node = ? ORDER BY player_id", (node_id,)
+            ).fetchall()
+        return [player_id for player_id, in rows]
+
+    def players_with_flag(self, flag_name: str, value: bool = True) -> List[str]:
+        """IDs of players whose flag has this value."""
+        # Match on json_each's key rather than a JSON path, so the flag name
+        # stays a bound parameter whatever characters it contains
+        with self._connection() as connection:
+            rows = connection.execute(
+                "SELECT player_id FROM saves, json_each(saves.flags) "
+                "WHERE json_each.key = ? AND json_each.value = ? ORDER BY player_id",
+                (flag_name, int(value))
+            ).fetchall()
+        return [player_id for player_id, in rows]
+
+    def node_counts(self) -> Dict[str, int]:
+        """How many saves are at each node."""
+        with self._connection() as connection:
+            rows = connection.execute(
+                "SELECT current_node, COUNT(*) FROM saves GROUP BY current_node ORDER BY current_node"
+            ).fetchall()
+        return dict(rows)
+
+    def close(self) -> None:
+        for connection in self._connections:
+            connection.close()
+        self._connections = []
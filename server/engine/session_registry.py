@@ -0,0 +1,161 @@
+"""
+Session Registry: Keeps a bounded set of player sessions resident in memory.
+Sessions are evicted least-recently-used first and rehydrated lazily from disk.
+"""
+
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Optional
+
+
+DEFAULT_SESSION_ID = "default"
+
+# Session IDs double as save file names, so keep them filesystem-safe.
+SESSION_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+
+def is_valid_session_id(session_id: str) -> bool:
+    """Check that a session ID is safe to use as a save key."""
+    return bool(SESSION_ID_PATTERN.match(session_id or ""))
+
+
+class SessionRegistry:
+    """LRU cache of live sessions keyed by session ID."""
+
+    def __init__(self, loader: Callable[[str], Any], max_sessions: int = 1000,
+                 on_evict: Optional[Callable[[Any], None]] = None,
+                 is_busy: Optional[Callable[[Any], bool]] = None):
+        """
+        Initialize SessionRegistry.
+
+        Args:
+            loader: Builds (or rehydrates) a session for a session ID
+            max_sessions: Maximum number of sessions kept resident
+            on_evict: Called with each session dropped from memory
+            is_busy: Sessions for which this returns True are never evicted
+                     (in addition to pinned ones)
+        """
+        if max_sessions < 1:
+            raise ValueError("max_sessions must be at least 1")
+
+        self.loader = loader
+        self.max_sessions = max_sessions
+        self.on_evict = on_evict
+        self.is_busy = is_busy
+        self._sessions: "OrderedDict[str, Any]" = OrderedDict()
+        # Session ID -> load in progress; concurrent requests for the same ID wait on it
+        self._loading: Dict[str, Future] = {}
+        # Session ID -> callers using it (see get(pin=True)); pinned sessions are never evicted
+        self._pins: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, session_id: str, pin: bool = False) -> Any:
+        """
+        Return the session for an ID, loading it if it is not resident.
+
+        Loads run outside the registry lock, so a slow disk only delays
+        requests for the session being loaded.
+
+        Args:
+            session_id: Session to return
+            pin: Keep the session resident until release(session_id), so a
+                 request that has looked it up but not yet locked it never
+                 ends up changing an evicted copy
+        """
+        while True:
+            with self._lock:
+                session = self._sessions.get(session_id)
+                if session is not None:
+                    self._sessions.move_to_end(session_id)
+                    if pin:
+                        self._pins[session_id] = self._pins.get(session_id, 0) + 1
+                    return session
+                loading = self._loading.get(session_id)
+                if loading is None:
+                    loading = self._loading[session_id] = Future()
+                    break
+            # Another thread is loading it; look it up again once it is in
+            loading.result()
+
+        try:
+            session = self.loader(session_id)
+        except BaseException as e:
+            with self._lock:
+                del self._loading[session_id]
+            loading.set_exception(e)
+            raise
+
+        with self._lock:
+            del self._loading[session_id]
+            self._sessions[session_id] = session
+            if pin:
+                self._pins[session_id] = self._pins.get(session_id, 0) + 1
+            evicted = self._evict_overflow(keep=session_id)
+        loading.set_result(session)
+
+        # Flush evicted sessions outside the lock so slow disks don't stall lookups
+        for old_session in evicted:
+            self._notify_evict(old_session)
+        return session
+
+    def release(self, session_id: str) -> None:
+        """Undo one get(session_id, pin=True)."""
+        with self._lock:
+            count = self._pins.get(session_id, 0) - 1
+            if count > 0:
+                self._pins[session_id] = count
+            else:
+                self._pins.pop(session_id, None)
+
+    def peek(self, session_id: str) -> Optional[Any]:
+        """Return a resident session without loading it or touching LRU order."""
+        with self._lock:
+            return self._sessions.get(session_id)
+
+    def discard(self, session_id: str) -> Optional[Any]:
+        """Drop a session from memory without calling on_evict."""
+        with self._lock:
+            return self._sessions.pop(session_id, None)
+
+    def flush_all(self) -> None:
+        """Evict every resident session (e.g. at shutdown)."""
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for session in sessions:
+            self._notify_evict(session)
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self._sessions
+
+    def _evict_overflow(self, keep: str) -> list:
+        """Pop least-recently-used sessions until under capacity. Caller holds the lock."""
+        evicted = []
+        overflow = len(self._sessions) - self.max_sessions
+        if overflow <= 0:
+            return evicted
+
+        # Pinned and busy sessions are skipped; if all are, we run over capacity briefly
+        for session_id in list(self._sessions):
+            if len(evicted) == overflow:
+                break
+            if session_id == keep or session_id in self._pins:
+                continue
+            session = self._sessions[session_id]
+            if self.is_busy and self.is_busy(session):
+                continue
+            del self._sessions[session_id]
+            evicted.append(session)
+        return evicted
+
+    def _notify_evict(self, session: Any) -> None:
+        if self.on_evict:
+            try:
+                self.on_evict(session)
+            except Exception as e:
+                print(f"[WARN] Failed to persist evicted session: {e}")
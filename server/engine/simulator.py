@@ -0,0 +1,214 @@
+"""
+Simulator: Headless batch combat for balance runs.
+Plays many fights per player build x enemy pair through CombatEngine.process_turn
+and aggregates win rate, turn count, HP remaining and XP rate. Never touches disk.
+"""
+
+import random
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from engine.rules import RulesEngine
+from engine.combat_engine import CombatEngine, CombatAction
+from engine.content_store import ContentStore, thaw
+
+
+@dataclass
+class PlayerBuild:
+    """A named starting stat line plus equipped item IDs."""
+    name: str
+    stats: Dict[str, int]
+    equipment: Dict[str, Optional[str]] = field(default_factory=dict)
+
+
+@dataclass
+class SimulationResult:
+    """Aggregated outcome of every fight for one build x enemy pair."""
+    build: str
+    enemy_id: str
+    fights: int = 0
+    wins: int = 0
+    total_turns: int = 0
+    total_hp_remaining: int = 0
+    total_xp: int = 0
+    seconds_per_turn: float = 3.0
+
+    @property
+    def win_rate(self) -> float:
+        return self.wins / self.fights if self.fights else 0.0
+
+    @property
+    def mean_turns(self) -> float:
+        return self.total_turns / self.fights if self.fights else 0.0
+
+    @property
+    def mean_hp_remaining(self) -> float:
+        """Mean HP left after a won fight."""
+        return self.total_hp_remaining / self.wins if self.wins else 0.0
+
+    @property
+    def xp_per_minute(self) -> float:
+        """XP earned per minute of play, assuming seconds_per_turn per turn."""
+        minutes = self.total_turns * self.seconds_per_turn / 60
+        return self.total_xp / minutes if minutes else 0.0
+
+    def merge(self, wins: int, fights: int, turns: int, hp_remaining: int, xp: int) -> None:
+        self.fights += fights
+        self.wins += wins
+        self.total_turns += turns
+        self.total_hp_remaining += hp_remaining
+        self.total_xp += xp
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "build": self.build,
+            "enemy_id": self.enemy_id,
+            "fights": self.fights,
+            "win_rate": round(self.win_rate, 4),
+            "mean_turns": round(self.mean_turns, 2),
+            "mean_hp_remaining": round(self.mean_hp_remaining, 2),
+            "xp_per_minute": round(self.xp_per_minute, 2)
+        }
+
+
+def make_builds(settings: Dict[str, Any], base_stats: Dict[str, int]) -> List[PlayerBuild]:
+    """
+    Default builds: the untouched template plus one build per focus stat
+    that spends every free point through RulesEngine.allocate_stat_point.
+    """
+    rules = RulesEngine(settings)
+    builds = [PlayerBuild("balanced", dict(base_stats))]
+    for name, focus in (("brute", "strength"), ("tank", "hp"), ("nimble", "agility")):
+        stats = dict(base_stats)
+        while rules.allocate_stat_point(stats, focus):
+            pass
+        builds.append(PlayerBuild(name, stats))
+    return builds
+
+
+# --- Worker side (one CombatEngine per process, built from plain data) ---
+
+_worker_engine: Optional[CombatEngine] = None
+
+
+def _init_worker(settings: Dict[str, Any], enemies: List[Dict[str, Any]], items: List[Dict[str, Any]]) -> None:
+    global _worker_engine
+    content = ContentStore(nodes={}, enemies=enemies, items=items)
+    _worker_engine = CombatEngine(RulesEngine(settings), content=content)
+
+
+def _run_chunk(build: PlayerBuild, enemy_id: str, fights: int, seed: str,
+               max_turns: int) -> Tuple[int, int, int, int, int]:
+    """Play a chunk of fights. Returns (wins, fights, turns, hp_remaining, xp)."""
+    combat = _worker_engine
+    equipment = {slot: combat.items.get(item_id) if item_id else None
+                 for slot, item_id in build.equipment.items()}
+
+    # Fixed per-chunk seed keeps results independent of worker count;
+    # each fight gets its own seed, so any single fight can be replayed.
+    seeds = random.Random(seed)
+
+    wins = turns = hp_remaining = xp = 0
+    for _ in range(fights):
+        stats = dict(build.stats)
+        enemy = combat.spawn(enemy_id)
+        state = combat.initialize_combat(enemy, seed=seeds.getrandbits(63))
+        while state.is_active and state.turn_count < max_turns:
+            combat.process_turn(state, stats, [], CombatAction.ATTACK, equipment)
+        turns += state.turn_count
+        if state.victory:
+            wins += 1
+            hp_remaining += stats.get("hp", 0)
+            xp += enemy.exp_reward
+    return wins, fights, turns, hp_remaining, xp
+
+
+class BalanceSimulator:
+    """Runs batches of headless fights for build x enemy pairs."""
+
+    def __init__(self, settings: Dict[str, Any], content: ContentStore,
+                 seconds_per_turn: float = 3.0, max_turns: int = 500):
+        """
+        Initialize BalanceSimulator.
+
+        Args:
+            settings: Game settings (rules configuration)
+            content: Loaded content; only enemies and items are used
+            seconds_per_turn: Assumed real time per turn for XP/minute
+            max_turns: Safety cap on a single fight's length
+        """
+        self.settings = settings
+        # Plain copies so they pickle into worker processes
+        self.enemies = thaw(content.enemies)
+        self.items = thaw(list(content.items.values()))
+        self.seconds_per_turn = seconds_per_turn
+        self.max_turns = max_turns
+
+    def run(self, builds: Iterable[PlayerBuild], enemy_ids: Iterable[str], fights: int,
+            seed: int = 0, workers: int = 0, chunk_size: int = 10000) -> List[SimulationResult]:
+        """
+        Simulate `fights` fights for every build x enemy pair.
+
+        Args:
+            workers: Process pool size; 0 runs in-process
+            chunk_size: Fights per task; also the seeding granularity
+        """
+        builds = list(builds)
+        enemy_ids = list(enemy_ids)
+        known_ids = {e.get("id") for e in self.enemies}
+        unknown = [enemy_id for enemy_id in enemy_ids if enemy_id not in known_ids]
+        if unknown:
+            raise ValueError(f"Unknown enemy id(s): {', '.join(unknown)}")
+
+        results = {}
+        tasks = []
+        for build in builds:
+            for enemy_id in enemy_ids:
+                results[(build.name, enemy_id)] = SimulationResult(
+                    build.name, enemy_id, seconds_per_turn=self.seconds_per_turn)
+                for chunk, start in enumerate(range(0, fights, chunk_size)):
+                    count = min(chunk_size, fights - start)
+                    tasks.append((build, enemy_id, count, f"{seed}:{build.name}:{enemy_id}:{chunk}", self.max_turns))
+
+        init_args = (self.settings, self.enemies, self.items)
+        if workers:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=init_args) as pool:
+                futures = [(task[0].name, task[1], pool.submit(_run_chunk, *task)) for task in tasks]
+                for build_name, enemy_id, future in futures:
+                    results[(build_name, enemy_id)].merge(*future.result())
+        else:
+            _init_worker(*init_args)
+            for task in tasks:
+                results[(task[0].name, task[1])].merge(*_run_chunk(*task))
+
+        return list(results.values())
+
+    def run_vectorized(self, builds: Iterable[PlayerBuild], enemy_ids: Iterable[str], fights: int,
+                       seed: int = 0) -> List[SimulationResult]:
+        """Same report as run(), resolved with the NumPy kernel (attack-only policy)."""
+        from engine.vector_combat import VectorCombatKernel
+
+        kernel = VectorCombatKernel(max_turns=self.max_turns)
+        enemies = {e.get("id"): e for e in self.enemies}
+        items = {item["id"]: item for item in self.items}
+
+        results = []
+        for build_index, build in enumerate(builds):
+            weapon_id = build.equipment.get("weapon")
+            weapon_bonus = items[weapon_id].get("effect", {}).get("strength", 0) if weapon_id else 0
+            for enemy_index, enemy_id in enumerate(enemy_ids):
+                if enemy_id not in enemies:
+                    raise ValueError(f"Unknown enemy id(s): {enemy_id}")
+                outcome = kernel.run(build.stats, enemies[enemy_id], n=fights, weapon_bonus=weapon_bonus,
+                                     seed=[seed, build_index, enemy_index])
+                result = SimulationResult(build.name, enemy_id, seconds_per_turn=self.seconds_per_turn)
+                result.merge(
+                    wins=int(outcome.victory.sum()),
+                    fights=fights,
+                    turns=int(outcome.turns.sum()),
+                    hp_remaining=int(outcome.player_hp[outcome.victory].sum()),
+                    xp=int(outcome.xp.sum())
+                )
+                results.append(result)
+        return results
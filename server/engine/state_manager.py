@@ -3,10 +3,28 @@ State Manager: Handles loading/saving player and world state from JSON.
 Tracks player stats, inventory, flags, and current narrative position.
 """
 
+import atexit
 import json
 import os
+import tempfile
+import threading
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Set
+
+from engine.content_bundle import ContentBundle, fingerprint, load_fresh_bundle, source_files, write_bundle
+from engine.flags import FlagSet, ensure_flags
+from engine.inventory import Inventory, ensure_inventory
+from engine.item_registry import ITEM_REGISTRY, intern_player_items
+from engine.journal import SNAPSHOT_SEQ_KEY, PlayerJournal, journal_path, replay
+from engine.node_graph import NodeGraph, load_node_graph
+from engine.save_format import ItemCatalog, decode_save, encode_save
+from engine.save_store import SaveStore, SqliteSaveStore
+from engine.stats import ensure_stat_block, json_default
+
+
+def _snapshot(state: Dict[str, Any]) -> Dict[str, Any]:
+    """A plain JSON copy of a player state, detached from the live one."""
+    return json.loads(json.dumps(state, default=json_default))
 
 
 class StateManager:
@@ -26,6 +44,52 @@ class StateManager:
         self.player_state_path = self.base_path / self.settings["paths"]["player_state"]
         self.world_state_path = self.base_path / self.settings["paths"]["world_state"]
         self.nodes_path = self.base_path / self.settings["paths"]["nodes"]
+        self.enemies_path = self.base_path / self.settings["paths"].get("enemies", "data/enemies.json")
+        self.items_path = self.base_path / self.settings["paths"].get("items", "data/items.json")
+        self.content_bundle_path = self.base_path / self.settings["paths"].get("content_bundle", "data/content.bundle")
+        
+        # Per-player saves live beside the legacy single-player save by default
+        saves_dir = self.settings["paths"].get("player_saves")
+        if saves_dir:
+            self.player_saves_path = self.base_path / saves_dir
+        else:
+            self.player_saves_path = self.player_state_path.parent / "saves"
+        
+        # Persistence mode: "immediate" writes on every save, "write_behind"
+        # marks saves dirty and coalesces them into periodic flushes, and
+        # "journal" appends each save's changes to a log beside the save.
+        persistence = self.settings.get("persistence", {})
+        self.persistence_mode = persistence.get("mode", "immediate")
+        self.flush_interval = float(persistence.get("flush_interval_seconds", 2.0))
+        # Backend: "files" (one JSON save per player, using the mode above) or
+        # "sqlite" (every save in one database; the mode is then unused)
+        self.save_store: Optional[SaveStore] = None
+        if persistence.get("backend", "files") == "sqlite":
+            self.save_store = SqliteSaveStore(
+                self.base_path / self.settings["paths"].get("save_database", "data/player/saves.db"),
+                pool_size=int(persistence.get("pool_size", 4))
+            )
+        
+        # Save file format for the "files" backend: "json" (pretty-printed) or
+        # "binary" (engine.save_format; items stored as references)
+        self.save_format = persistence.get("format", "json")
+        self._item_catalog: Optional[ItemCatalog] = None
+        
+        self.journal: Optional[PlayerJournal] = None
+        if self.persistence_mode == "journal" and self.save_store is None:
+            self.journal = PlayerJournal(
+                self._write_save_file,
+                read_snapshot=self._read_save_file,
+                snapshot_every=int(persistence.get("snapshot_every", 200)),
+                fsync=bool(persistence.get("fsync", False))
+            )
+        
+        self._pending: Dict[Path, Dict[str, Any]] = {}
+        self._in_flight: Dict[Path, Dict[str, Any]] = {}
+        self._pending_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._flusher: Optional[threading.Thread] = None
+        self._stop_flusher = threading.Event()
         
     @staticmethod
     def _load_json(path: str) -> Dict[str, Any]:
@@ -35,30 +99,224 @@ class StateManager:
     
     @staticmethod
     def _save_json(path: Path, data: Dict[str, Any]) -> None:
-        """Save JSON to file."""
+        """Save JSON to file atomically (temp file + rename)."""
+        StateManager._save_bytes(path, json.dumps(data, indent=2, default=json_default).encode("utf-8"))
+    
+    @staticmethod
+    def _save_bytes(path: Path, data: bytes) -> None:
+        """Write a file atomically (temp file + rename)."""
         path.parent.mkdir(parents=True, exist_ok=True)
-        with open(path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2)
+        fd, tmp_path = tempfile.mkstemp(dir=str(path.parent), prefix=f".{path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+    
+    def get_player_state_path(self, player_id: Optional[str] = None) -> Path:
+        """
+        Resolve the save file for a player.
+        
+        Args:
+            player_id: Player/session ID, or None for the single-player save
+        """
+        if player_id is None:
+            path = self.player_state_path
+        else:
+            path = self.player_saves_path / f"{player_id}.json"
+        return path.with_suffix(".sav") if self.save_format == "binary" else path
+    
+    @property
+    def item_catalog(self) -> ItemCatalog:
+        """Item definitions binary saves reference: the shared item registry, then items.json."""
+        if self._item_catalog is None:
+            self._item_catalog = ItemCatalog(self.load_items() if self.items_path.exists() else (),
+                                             registry=ITEM_REGISTRY)
+        return self._item_catalog
+    
+    def _read_save_file(self, path: Path) -> Dict[str, Any]:
+        """Read a save file in either format (plain JSON or binary)."""
+        with open(path, "rb") as f:
+            return decode_save(f.read(), self.item_catalog)
     
-    def load_player_state(self) -> Dict[str, Any]:
+    def _write_save_file(self, path: Path, state: Dict[str, Any]) -> None:
+        """Write a save file atomically in the configured format."""
+        if self.save_format == "binary":
+            self._save_bytes(path, encode_save(state, self.item_catalog))
+        else:
+            self._save_json(path, state)
+    
+    def _convert_other_format(self, state_path: Path) -> None:
+        """After switching save formats, rewrite the player's old-format file in the new one."""
+        other = state_path.with_suffix(".json" if state_path.suffix == ".sav" else ".sav")
+        if state_path.exists() or not other.exists():
+            return
+        # Raw contents, so a journal snapshot keeps its record number
+        self._write_save_file(state_path, self._read_save_file(other))
+        other.unlink()
+    
+    def load_player_state(self, player_id: Optional[str] = None) -> Dict[str, Any]:
         """Load player state from JSON."""
-        # Check if active save exists
-        if not self.player_state_path.exists():
+        state_path = self.get_player_state_path(player_id)
+        
+        # A deferred save is newer than whatever is on disk. Copy it: the
+        # flusher may be writing that snapshot right now.
+        with self._pending_lock:
+            pending = self._pending.get(state_path) or self._in_flight.get(state_path)
+        if pending is not None:
+            state = _snapshot(pending)
+        else:
+            # Check if active save exists
+            state = self._load_saved_state(player_id, state_path)
+        if state is None:
             # Check for template
             template_path = self.player_state_path.parent / "player_template.json"
             if template_path.exists():
                 # Create new save from template
                 initial_state = self._load_json(str(template_path))
-                self.save_player_state(initial_state)
+                ensure_stat_block(initial_state)
+                ensure_inventory(initial_state)
+                ensure_flags(initial_state)
+                intern_player_items(initial_state)
+                self.save_player_state(initial_state, player_id)
                 return initial_state
             
-            raise FileNotFoundError(f"Player state not found at {self.player_state_path} and no template found.")
+            raise FileNotFoundError(f"Player state not found at {state_path} and no template found.")
+            
+        ensure_stat_block(state)
+        ensure_inventory(state)
+        ensure_flags(state)
+        intern_player_items(state)
+        return state
+    
+    def _load_saved_state(self, player_id: Optional[str], state_path: Path) -> Optional[Dict[str, Any]]:
+        """Read a player's save from the save store or save file, or None if there is none."""
+        self._convert_other_format(state_path)
+        if self.save_store is not None:
+            state = self.save_store.load(player_id)
+            if state is None and state_path.exists():
+                # First load since switching backends: move the file save into the store
+                state = self._load_state_file(state_path)
+                self.save_store.save(player_id, state, event="import")
+            return state
+        
+        if not state_path.exists():
+            return None
+        return self._load_state_file(state_path)
+    
+    def _load_state_file(self, state_path: Path) -> Dict[str, Any]:
+        """Read a save file, replaying its journal if it has one."""
+        if self.journal is not None:
+            return self.journal.load(state_path)
+        
+        if not journal_path(state_path).exists():
+            state = self._read_save_file(state_path)
+            state.pop(SNAPSHOT_SEQ_KEY, None)
+            return state
+        
+        # Left over from running in journal mode: fold it into a plain save
+        state = replay(state_path, self._read_save_file).state
+        self._write_save_file(state_path, state)
+        journal_path(state_path).unlink()
+        return state
+    
+    def save_player_state(self, state: Dict[str, Any], player_id: Optional[str] = None,
+                          event: Optional[str] = None) -> None:
+        """
+        Save player state to JSON.
+        
+        In write-behind mode this only marks the save dirty; repeated saves
+        of the same player before the next flush collapse into one write.
+        The flusher writes a snapshot taken here, so call this while no
+        other thread is changing the state (e.g. under the session's lock).
+        In journal mode only the changes are appended to the save's journal.
+        
+        Args:
+            state: Player state
+            player_id: Player/session ID, or None for the single-player save
+            event: The action that caused the save, recorded in the journal
+        """
+        if self.save_store is not None:
+            self.save_store.save(player_id, state, event)
+            return
+        state_path = self.get_player_state_path(player_id)
+        if self.journal is not None:
+            self.journal.append(state_path, state, event)
+            return
+        if self.persistence_mode != "write_behind":
+            self._write_save_file(state_path, state)
+            return
+        
+        snapshot = _snapshot(state)
+        with self._pending_lock:
+            self._pending[state_path] = snapshot
+        self._ensure_flusher()
+    
+    def delete_player_state(self, player_id: Optional[str] = None) -> None:
+        """Delete a player's save so the next load starts from the template."""
+        state_path = self.get_player_state_path(player_id)
+        with self._flush_lock:
+            with self._pending_lock:
+                self._pending.pop(state_path, None)
+            if self.save_store is not None:
+                self.save_store.delete(player_id)
+            if self.journal is not None:
+                self.journal.delete(state_path)
+            elif journal_path(state_path).exists():
+                journal_path(state_path).unlink()
+            for path in (state_path.with_suffix(".json"), state_path.with_suffix(".sav")):
+                if path.exists():
+                    path.unlink()
+    
+    def flush(self) -> None:
+        """Write every dirty save to disk now."""
+        with self._flush_lock:
+            with self._pending_lock:
+                self._in_flight, self._pending = self._pending, {}
+            
+            failed = {}
+            for state_path, state in self._in_flight.items():
+                try:
+                    self._write_save_file(state_path, state)
+                except (OSError, TypeError, ValueError) as e:
+                    print(f"[WARN] Failed to flush save {state_path}: {e}")
+                    failed[state_path] = state
             
-        return self._load_json(str(self.player_state_path))
+            with self._pending_lock:
+                for state_path, state in failed.items():
+                    self._pending.setdefault(state_path, state)
+                self._in_flight = {}
+    
+    def close(self) -> None:
+        """Stop the background flusher, write any remaining dirty saves and close the save store."""
+        self._stop_flusher.set()
+        flusher = self._flusher
+        if flusher and flusher is not threading.current_thread():
+            flusher.join(timeout=self.flush_interval + 1)
+        self.flush()
+        if self.save_store is not None:
+            self.save_store.close()
+    
+    def _ensure_flusher(self) -> None:
+        """Start the background flush thread on first use."""
+        if self._flusher is not None:
+            return
+        with self._pending_lock:
+            if self._flusher is not None:
+                return
+            self._flusher = threading.Thread(target=self._flush_loop, name="state-flusher", daemon=True)
+            self._flusher.start()
+        # Daemon threads die silently at exit, so flush whatever is left
+        atexit.register(self.close)
     
-    def save_player_state(self, state: Dict[str, Any]) -> None:
-        """Save player state to JSON."""
-        self._save_json(self.player_state_path, state)
+    def _flush_loop(self) -> None:
+        while not self._stop_flusher.wait(self.flush_interval):
+            self.flush()
     
     def load_world_state(self) -> Dict[str, Any]:
         """Load world state from JSON."""
@@ -71,23 +329,58 @@ class StateManager:
         self._save_json(self.world_state_path, state)
     
     def load_nodes(self) -> Dict[str, Any]:
-        """Load narrative nodes from JSON files."""
-        if not self.nodes_path.exists():
-            raise FileNotFoundError(f"Nodes not found at {self.nodes_path}")
-            
-        if self.nodes_path.is_file():
-            return self._load_json(str(self.nodes_path))
-            
-        # Recursive load if directory
-        nodes = {}
-        if self.nodes_path.is_dir():
-             for file_path in self.nodes_path.glob("*.json"):
-                 try:
-                     node_data = self._load_json(str(file_path))
-                     nodes.update(node_data)
-                 except Exception as e:
-                     print(f"[WARN] Failed to load nodes from {file_path}: {e}")
-        return nodes
+        """Load narrative nodes from a JSON file or a directory of zone files."""
+        return self.load_node_graph().nodes
+    
+    def load_node_graph(self, enemy_ids: Optional[Set[str]] = None) -> NodeGraph:
+        """
+        Load every node file into one merged, validated graph.
+        
+        Raises:
+            ContentValidationError: On duplicate node IDs or dangling references
+        """
+        return load_node_graph(self.nodes_path, enemy_ids)
+    
+    def load_enemies(self) -> List[Dict[str, Any]]:
+        """Load enemy templates from JSON."""
+        if not self.enemies_path.exists():
+            return []
+        return self._load_json(str(self.enemies_path))
+    
+    def load_items(self) -> List[Dict[str, Any]]:
+        """Load item definitions from JSON."""
+        if not self.items_path.exists():
+            return []
+        return self._load_json(str(self.items_path))
+    
+    def content_source_files(self) -> List[Path]:
+        """Every JSON file static content is loaded from."""
+        return source_files(self.nodes_path, [self.enemies_path, self.items_path])
+    
+    def load_content_bundle(self) -> Optional[ContentBundle]:
+        """
+        Load the compiled content bundle.
+        
+        Returns None when it is disabled, not built, unreadable or older
+        than the JSON sources; callers then load the JSON directly.
+        """
+        if not self.settings.get("content", {}).get("use_bundle", True):
+            return None
+        return load_fresh_bundle(self.content_bundle_path, self.content_source_files(), self.base_path)
+    
+    def build_content_bundle(self, path: Optional[Path] = None) -> int:
+        """
+        Compile nodes, enemies and items into a bundle (validating nodes first).
+        
+        Returns:
+            Size of the bundle in bytes
+        """
+        # Fingerprint before reading: an edit mid-build leaves the bundle stale
+        sources = fingerprint(self.content_source_files(), self.base_path)
+        enemies = self.load_enemies()
+        graph = self.load_node_graph(enemy_ids={enemy["id"] for enemy in enemies})
+        items = self.load_items()
+        return write_bundle(path or self.content_bundle_path, graph.nodes, enemies, items, sources)
     
     def get_setting(self, *keys: str) -> Any:
         """
@@ -107,17 +400,21 @@ class PlayerState:
     def __init__(self, state_dict: Dict[str, Any]):
         """Initialize with a state dictionary."""
         self.data = state_dict
+        ensure_stat_block(self.data)
+        ensure_inventory(self.data)
+        ensure_flags(self.data)
+        intern_player_items(self.data)
     
     @property
     def stats(self) -> Dict[str, int]:
         return self.data["stats"]
     
     @property
-    def inventory(self) -> list:
+    def inventory(self) -> Inventory:
         return self.data["inventory"]
     
     @property
-    def flags(self) -> Dict[str, bool]:
+    def flags(self) -> FlagSet:
         return self.data["flags"]
     
     @property
@@ -150,15 +447,11 @@ class PlayerState:
     
     def remove_item(self, item_name: str) -> bool:
         """Remove item from inventory by name. Returns True if found and removed."""
-        for i, item in enumerate(self.inventory):
-            if item.get("name") == item_name:
-                self.inventory.pop(i)
-                return True
-        return False
+        return self.inventory.remove_name(item_name) is not None
     
     def has_item(self, item_name: str) -> bool:
         """Check if player has an item."""
-        return any(item.get("name") == item_name for item in self.inventory)
+        return self.inventory.has(item_name)
     
     def move_to_node(self, node_id: str) -> None:
         """Move player to a different node."""
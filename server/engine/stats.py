@@ -0,0 +1,94 @@
+"""
+Stats: Compact, slotted stat block shared by players and enemies.
+Behaves like the stats dict it replaces and converts to/from JSON losslessly.
+"""
+
+from typing import Any, Dict, Mapping, Optional
+
+from engine.flags import FlagSet
+from engine.item_registry import ItemRef
+
+
+# Stats with named accessors. Player stats come first, in save-file order,
+# then enemy-only stats.
+STAT_NAMES = (
+    "level",
+    "experience",
+    "free_stat_points",
+    "hp",
+    "mp",
+    "strength",
+    "defence",
+    "vitality",
+    "wisdom",
+    "agility",
+    "perception",
+    "lifeforce",
+    "max_hp",
+    "attack_power",
+)
+
+
+class StatBlock(dict):
+    """
+    Stats as a slotted dict subclass: no per-instance __dict__, and
+    ``get``/``[]`` stay the C dict lookups the combat hot path relies on.
+
+    Known stats are also exposed as attributes (``block.hp``; 0 when unset).
+    Any other stat name or value is stored as-is, so nothing is lost on a
+    round trip.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, stats: Optional[Mapping[str, Any]] = None):
+        super().__init__(stats or ())
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> 'StatBlock':
+        """Build a StatBlock from a JSON stats dict."""
+        return cls(data)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert back to a plain dict for saving."""
+        return dict(self)
+
+    def copy(self) -> 'StatBlock':
+        return self.__class__(self)
+
+    def __reduce__(self):
+        return (self.__class__, (self.to_dict(),))
+
+    def __repr__(self) -> str:
+        return f"StatBlock({self.to_dict()!r})"
+
+
+def _stat_property(name: str) -> property:
+    """Attribute accessor for one named stat."""
+    def getter(self: StatBlock) -> Any:
+        return self.get(name, 0)
+
+    def setter(self: StatBlock, value: Any) -> None:
+        self[name] = value
+
+    return property(getter, setter, doc=f"The '{name}' stat (0 when unset).")
+
+
+for _name in STAT_NAMES:
+    setattr(StatBlock, _name, _stat_property(_name))
+
+
+def ensure_stat_block(player_state: Dict[str, Any]) -> StatBlock:
+    """Upgrade a player state's stats dict to a StatBlock in place."""
+    stats = player_state.get("stats")
+    if not isinstance(stats, StatBlock):
+        stats = StatBlock(stats or {})
+        player_state["stats"] = stats
+    return stats
+
+
+def json_default(value: Any) -> Any:
+    """json.dump hook for engine types that are not plain dicts."""
+    if isinstance(value, (StatBlock, FlagSet, ItemRef)):
+        return value.to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
@@ -0,0 +1,182 @@
+"""
+Vector Combat: NumPy kernel that advances many independent fights per step.
+Used for Monte Carlo balance sweeps; mirrors CombatEngine.process_turn and
+RulesEngine.calculate_damage for a fixed player action. Requires numpy.
+"""
+
+from dataclasses import dataclass
+from itertools import product
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # numpy is only needed for balance tooling
+    np = None
+
+from engine.combat_engine import CombatAction
+
+# Mirrors the constants hard-coded in CombatEngine / Enemy / RulesEngine
+BASE_DAMAGE = 5
+ENEMY_ATTACK_CHANCE = 0.7
+MIN_FLEE_CHANCE = 0.2
+
+# Inputs the kernel reads; anything else in a template (name, loot_table...) is ignored
+PLAYER_STATS = ("hp", "strength", "agility")
+ENEMY_STATS = ("hp", "attack_power", "defence", "exp_reward")
+
+
+@dataclass
+class BatchOutcome:
+    """Per-fight results of a vectorized batch (all arrays of length N)."""
+    victory: Any
+    fled: Any
+    turns: Any
+    player_hp: Any
+    xp: Any
+
+    @property
+    def fights(self) -> int:
+        return int(self.victory.shape[0])
+
+    @property
+    def win_rate(self) -> float:
+        return float(self.victory.mean()) if self.fights else 0.0
+
+    @property
+    def mean_turns(self) -> float:
+        return float(self.turns.mean()) if self.fights else 0.0
+
+
+class VectorCombatKernel:
+    """Resolves N fights at once as arrays of HP, attack and defence."""
+
+    def __init__(self, max_turns: int = 500):
+        """
+        Initialize VectorCombatKernel.
+
+        Args:
+            max_turns: Safety cap on fight length (matches the scalar simulator)
+        """
+        if np is None:
+            raise ImportError("VectorCombatKernel requires numpy (pip install numpy)")
+        self.max_turns = max_turns
+
+    def run(self, player: Mapping[str, Any], enemy: Mapping[str, Any], n: Optional[int] = None,
+            action: CombatAction = CombatAction.ATTACK, weapon_bonus: Any = 0,
+            seed: Any = 0) -> BatchOutcome:
+        """
+        Fight until every fight in the batch is over.
+
+        Args:
+            player: Player stats; each value a scalar or an array of length N
+                    (uses hp, strength, agility)
+            enemy: Enemy template; scalars or arrays (hp, attack_power, defence, exp_reward)
+            n: Batch size; inferred from array inputs if omitted
+            action: Player action every turn (ATTACK, DEFEND or FLEE)
+            weapon_bonus: Equipped weapon's strength effect, scalar or array
+            seed: Seed (or int sequence) for the batch's numpy Generator
+        """
+        if action not in (CombatAction.ATTACK, CombatAction.DEFEND, CombatAction.FLEE):
+            raise ValueError(f"Unsupported vectorized action: {action}")
+
+        if n is None:
+            used = [player.get(name) for name in PLAYER_STATS] + [enemy.get(name) for name in ENEMY_STATS]
+            n = self._infer_size([value for value in used if value is not None] + [weapon_bonus])
+        rng = np.random.default_rng(seed)
+
+        def column(values: Mapping[str, Any], name: str, default: int) -> Any:
+            return np.broadcast_to(np.asarray(values.get(name, default), dtype=np.int64), (n,))
+
+        player_hp = column(player, "hp", 50).copy()
+        strength = column(player, "strength", 5)
+        agility = column(player, "agility", 5)
+        enemy_hp = column(enemy, "hp", 1).copy()
+        attack_power = column(enemy, "attack_power", 5)
+        defence = column(enemy, "defence", 5)
+        exp_reward = column(enemy, "exp_reward", 0)
+        weapon_bonus = np.broadcast_to(np.asarray(weapon_bonus, dtype=np.int64), (n,))
+
+        # RulesEngine.calculate_damage: fixed per fight for a given matchup
+        player_damage = np.maximum(
+            1, BASE_DAMAGE + (strength - 5) + weapon_bonus - np.maximum(0, (defence - 5) // 2))
+        # CombatEngine.can_flee
+        flee_chance = np.maximum(MIN_FLEE_CHANCE, (agility - defence) * 0.05 + 0.3)
+        enemy_damage_base = np.maximum(0, attack_power - 5)
+
+        active = np.ones(n, dtype=bool)
+        victory = np.zeros(n, dtype=bool)
+        fled = np.zeros(n, dtype=bool)
+        turns = np.zeros(n, dtype=np.int64)
+
+        while active.any() and turns.max() < self.max_turns:
+            turns += active
+
+            # Player turn
+            if action == CombatAction.ATTACK:
+                enemy_hp = np.where(active, np.maximum(0, enemy_hp - player_damage), enemy_hp)
+                won = active & (enemy_hp <= 0)
+                victory |= won
+                active &= ~won
+            elif action == CombatAction.FLEE:
+                escaped = active & (rng.random(n) < flee_chance)
+                fled |= escaped
+                active &= ~escaped
+
+            # Enemy turn
+            attacks = active & (rng.random(n) < ENEMY_ATTACK_CHANCE)
+            damage = rng.integers(1, 4, n) + enemy_damage_base
+            if action == CombatAction.DEFEND:
+                damage = np.maximum(1, damage // 2)
+            player_hp = np.where(attacks, np.maximum(0, player_hp - damage), player_hp)
+            active &= ~(attacks & (player_hp <= 0))
+
+        return BatchOutcome(
+            victory=victory,
+            fled=fled,
+            turns=turns,
+            player_hp=player_hp,
+            xp=np.where(victory, exp_reward, 0)
+        )
+
+    def sweep(self, enemy: Mapping[str, Any], grid: Mapping[str, Sequence[int]],
+              base_stats: Mapping[str, int], fights_per_point: int,
+              weapon_bonus: int = 0, seed: int = 0) -> List[Dict[str, Any]]:
+        """
+        Run `fights_per_point` fights for every point of a stat grid in one batch.
+
+        Args:
+            enemy: Enemy template
+            grid: Stat name -> values to sweep, e.g. {"strength": range(5, 16)}
+            base_stats: Stats for anything not in the grid
+        """
+        names = list(grid)
+        points = list(product(*(list(grid[name]) for name in names)))
+        player = {name: value for name, value in base_stats.items()}
+        for i, name in enumerate(names):
+            player[name] = np.repeat(np.array([point[i] for point in points], dtype=np.int64), fights_per_point)
+
+        n = len(points) * fights_per_point
+        outcome = self.run(player, enemy, n=n, weapon_bonus=weapon_bonus, seed=seed)
+
+        shape = (len(points), fights_per_point)
+        wins = outcome.victory.reshape(shape)
+        turns = outcome.turns.reshape(shape)
+        hp_left = np.where(outcome.victory, outcome.player_hp, 0).reshape(shape)
+        win_counts = wins.sum(axis=1)
+
+        results = []
+        for i, point in enumerate(points):
+            results.append({
+                **dict(zip(names, point)),
+                "win_rate": float(win_counts[i] / fights_per_point),
+                "mean_turns": float(turns[i].mean()),
+                "mean_hp_remaining": float(hp_left[i].sum() / win_counts[i]) if win_counts[i] else 0.0
+            })
+        return results
+
+    @staticmethod
+    def _infer_size(values: Sequence[Any]) -> int:
+        sizes = {np.shape(value)[0] for value in values if np.ndim(value) > 0}
+        if len(sizes) > 1:
+            raise ValueError(f"Mismatched batch sizes: {sorted(sizes)}")
+        return sizes.pop() if sizes else 1
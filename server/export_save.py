@@ -0,0 +1,51 @@
+"""
+XP Minima RPG - Save Exporter
+
+Prints a player save as pretty-printed JSON for debugging. Reads binary
+saves (persistence.format "binary", see engine/save_format.py) as well as
+plain JSON ones, resolving item references against the current items.
+
+Usage: python export_save.py data/player/saves/<player>.sav [--output save.json]
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from engine.content_store import get_content_store
+from engine.item_registry import ITEM_REGISTRY
+from engine.state_manager import StateManager
+from engine.save_format import SaveFormatError, export_json
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Export a player save as JSON")
+    parser.add_argument("save", type=Path, help="Save file")
+    parser.add_argument("--output", type=Path, help="Write the JSON here instead of printing it")
+    args = parser.parse_args()
+
+    settings_path = Path(__file__).parent / "config" / "settings.json"
+    state_manager = StateManager(str(settings_path))
+    # Saved items reference registry IDs, node-granted items included
+    content = get_content_store(state_manager)
+    ITEM_REGISTRY.load_content(content.items.values(), content.nodes)
+
+    try:
+        with open(args.save, "rb") as f:
+            text = export_json(f.read(), state_manager.item_catalog)
+    except (OSError, SaveFormatError) as e:
+        print(f"[ERROR] {e}")
+        sys.exit(1)
+
+    if args.output:
+        args.output.write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
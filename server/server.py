@@ -1,9 +1,16 @@
+import asyncio
+import json
 import sys
+import time
+from collections import OrderedDict
 from pathlib import Path
 from typing import Dict, Any, Optional, List
-from fastapi import FastAPI, HTTPException, Body
+from fastapi import FastAPI, HTTPException, Body, Depends, Header, Request, Response, WebSocket, WebSocketDisconnect
+from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
+from pydantic import BaseModel, Field, ValidationError
 
 # Add project root to path logic similar to main.py
 sys.path.insert(0, str(Path(__file__).parent))
@@ -11,7 +18,13 @@ sys.path.insert(0, str(Path(__file__).parent))
 from engine.state_manager import StateManager
 from engine.rules import RulesEngine
 from engine.node_engine import NodeEngine
-from engine.combat_engine import CombatEngine, CombatAction, Enemy
+from engine.combat_engine import CombatEngine, CombatAction, CombatState, Enemy
+from engine.content_store import ContentStore, get_content_store, set_content_store
+from engine.content_watcher import ContentWatcher
+from engine.item_registry import ITEM_REGISTRY
+from engine.log_writer import BufferedLogWriter
+from engine.json_patch import diff
+from engine.session_registry import SessionRegistry, DEFAULT_SESSION_ID, is_valid_session_id
 
 app = FastAPI(title="Minima RPG API")
 
@@ -24,44 +37,135 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# --- Global Game State (In-Memory for single player demo) ---
-# In a real multi-user app, this would be per-session/database backed.
+# --- Game Sessions ---
+# Engines and content are loaded once per process and shared; each session
+# only holds its own player_state and current_combat.
+class GameEngines:
+    """Process-wide engines shared by every session."""
+    
+    def __init__(self, settings_path: Path):
+        self.state_manager = StateManager(str(settings_path))
+        self.content = get_content_store(self.state_manager)
+        # Before any session loads, so saved inventories intern against it
+        ITEM_REGISTRY.load_content(self.content.items.values(), self.content.nodes)
+        self.rules_engine = RulesEngine(self.state_manager.settings)
+        self.node_engine = NodeEngine(self.content.nodes, self.rules_engine, text_source=self.content.node_text)
+        self.combat_engine = CombatEngine(self.rules_engine, content=self.content)
+    
+    def swap_content(self, content: ContentStore) -> None:
+        """Switch to reloaded narrative content. Runs on the event loop, between requests."""
+        ITEM_REGISTRY.add_node_items({
+            node_id: node for node_id, node in content.nodes.items() if self.content.nodes.get(node_id) is not node
+        })
+        self.content = content
+        self.node_engine.set_nodes(content.nodes, text_source=content.node_text)
+        # Later get_content_store() callers must see the reloaded content too
+        set_content_store(self.state_manager, content)
+
+
 class GameSession:
-    def __init__(self):
-        self.settings_path = Path(__file__).parent / "config" / "settings.json"
+    def __init__(self, engines: GameEngines, session_id: str = DEFAULT_SESSION_ID,
+                 history_size: int = 8):
+        self.session_id = session_id
+        # The default session keeps using the legacy single-player save
+        self.player_id = None if session_id == DEFAULT_SESSION_ID else session_id
         
-        # Initialize Managers
-        self.state_manager = StateManager(str(self.settings_path))
-        self.rules_engine = RulesEngine(self.state_manager.settings)
-        self.node_engine = NodeEngine(self.state_manager.load_nodes(), self.rules_engine)
-        self.node_engine = NodeEngine(self.state_manager.load_nodes(), self.rules_engine)
-        self.combat_engine = CombatEngine(self.rules_engine, data_dir=str(Path(__file__).parent / "data"))
+        # Shared Managers
+        self.engines = engines
+        self.state_manager = engines.state_manager
+        self.rules_engine = engines.rules_engine
+        self.node_engine = engines.node_engine
+        self.combat_engine = engines.combat_engine
         
         # Load Player State
-        self.player_state = self.state_manager.load_player_state()
+        self.player_state = self.state_manager.load_player_state(self.player_id)
         
         # Combat State
         self.current_combat = None
         
+        # Serialises requests from the same player (double-clicks, retries)
+        self.lock = asyncio.Lock()
+        
+        # Display-state versions for delta responses: version -> jsonable snapshot.
+        # Starts from the clock so a rehydrated session never reuses a version
+        # a client saw before eviction.
+        self.version = time.time_ns() // 1_000_000
+        self.history_size = max(1, history_size)
+        self.snapshots: "OrderedDict[int, Dict[str, Any]]" = OrderedDict()
+        
         # Verify current node exists, else reset to start
+        if self.ensure_valid_node():
+            self.save("node_reset")
+
+    @property
+    def content(self) -> ContentStore:
+        # Read through engines so hot-reloaded content is picked up
+        return self.engines.content
+
+    def ensure_valid_node(self) -> bool:
+        """
+        Move the player to the start if their node no longer exists (fresh save, content reload).
+
+        Returns True if the player was moved; the caller saves (see save_async).
+        """
         current_node_id = self.player_state.get("current_node")
         if not self.node_engine.get_node(current_node_id):
             # Fallback for fresh save
             self.player_state["current_node"] = "intro_01" 
-            self.state_manager.save_player_state(self.player_state)
+            return True
+        return False
 
-    def save(self):
-        self.state_manager.save_player_state(self.player_state)
+    def save(self, event: Optional[str] = None):
+        """
+        Persist the player state; `event` names the action for the save journal.
+
+        Blocks on disk or database I/O, so never call it on the event loop.
+        """
+        self.state_manager.save_player_state(self.player_state, self.player_id, event=event)
+
+    @property
+    def in_combat(self) -> bool:
+        return self.current_combat is not None and self.current_combat.is_active
+
+    async def save_async(self, event: Optional[str] = None):
+        """save() on the threadpool. Caller holds self.lock, so the state cannot change meanwhile."""
+        await run_in_threadpool(self.save, event)
+
+    def start_combat(self, enemy: Enemy) -> None:
+        """Begin a fight, recording the player's starting state for the combat log."""
+        self.current_combat = self.combat_engine.initialize_combat(
+            enemy,
+            player_stats=self.player_state["stats"],
+            player_inventory=self.player_state.get("inventory"),
+            player_equipment=self.player_state.get("equipment")
+        )
+
+    def reset(self):
+        """Discard the save and start over from the player template."""
+        self.state_manager.delete_player_state(self.player_id)
+        self.player_state = self.state_manager.load_player_state(self.player_id)
+        self.current_combat = None
+        self.save("reset")
+
+    def record_state(self, state: Dict[str, Any]) -> int:
+        """Store a display-state snapshot, bumping the version only if it changed."""
+        if self.snapshots and self.snapshots[self.version] == state:
+            return self.version
+        self.version += 1
+        self.snapshots[self.version] = state
+        while len(self.snapshots) > self.history_size:
+            self.snapshots.popitem(last=False)
+        return self.version
 
     def get_current_node_data(self):
         node_id = self.player_state.get("current_node")
-        node_data = self.node_engine.get_node(node_id)
-        if not node_data:
+        node_hash = self.content.node_hashes.get(node_id)
+        if node_hash is None:
             return None
         
-        # Get available choices based on current stats/flags
-        # We need to manually construct the choice list compatible with frontend
-        _, choices = self.node_engine.get_available_choices(
+        # Node text and choice definitions are static, so only reference them
+        # here; clients fetch (and cache) the payload from /nodes/{node_id}.
+        choices = self.node_engine.get_available_choice_indices(
             self.player_state["stats"],
             self.player_state["flags"],
             self.player_state["inventory"],
@@ -70,13 +174,96 @@ class GameSession:
         
         return {
             "node_id": node_id,
-            "text": node_data.get("text", ""),
+            "node_hash": node_hash,
             "choices": choices,
             # Phase 2: Add combat info here if node type is combat
         }
 
-# Global instance
-session = GameSession()
+def create_session_registry(engines: GameEngines) -> SessionRegistry:
+    """The session LRU, configured from the server settings."""
+    server_settings = engines.state_manager.settings.get("server", {})
+    return SessionRegistry(
+        loader=lambda session_id: GameSession(
+            engines, session_id, history_size=server_settings.get("state_history_size", 8)
+        ),
+        max_sessions=server_settings.get("max_sessions", 1000),
+        on_evict=lambda evicted: evicted.save(),
+        # Fights are not saved, so evicting a session mid-fight would lose it
+        is_busy=lambda session: session.in_combat
+    )
+
+# Global instances
+engines = GameEngines(Path(__file__).parent / "config" / "settings.json")
+sessions = create_session_registry(engines)
+
+# Finished fights, one JSON replay record per line (see CombatEngine.replay)
+combat_log = BufferedLogWriter(
+    engines.state_manager.base_path / engines.state_manager.settings["paths"].get("combat_log", "logs/combat.log")
+)
+
+client_log_config = engines.state_manager.settings.get("client_logging", {})
+client_log = BufferedLogWriter(
+    engines.state_manager.base_path / engines.state_manager.settings["paths"].get("client_log", "logs/client.log"),
+    flush_interval=client_log_config.get("flush_interval_seconds", 1.0),
+    max_buffered_lines=client_log_config.get("max_buffered_lines", 200),
+    max_bytes=client_log_config.get("max_bytes", 5 * 1024 * 1024),
+    backup_count=client_log_config.get("backup_count", 3)
+)
+
+
+def session_id_from_header(x_session_id: Optional[str]) -> str:
+    """Validate the caller's X-Session-Id header (absent = the single-player session)."""
+    session_id = x_session_id or DEFAULT_SESSION_ID
+    if not is_valid_session_id(session_id):
+        raise HTTPException(status_code=400, detail="Invalid session id")
+    return session_id
+
+
+async def locked_session(x_session_id: Optional[str] = Header(default=None)):
+    """Hold the session's lock for the whole request, including the response."""
+    session_id = session_id_from_header(x_session_id)
+    # Rehydrating a save reads the disk, so look it up on the threadpool. The
+    # session stays pinned until the request is done: evicting it while we
+    # wait for its lock would let the next request load a second copy.
+    session = await run_in_threadpool(sessions.get, session_id, True)
+    try:
+        async with session.lock:
+            if session.ensure_valid_node():
+                await session.save_async("node_reset")
+            yield session
+    finally:
+        sessions.release(session_id)
+
+
+content_watcher: Optional[ContentWatcher] = None
+
+
+@app.on_event("startup")
+async def watch_content():
+    """Hot-reload zone files; new content is swapped in on the event loop."""
+    global content_watcher
+    content_config = engines.state_manager.settings.get("content", {})
+    if not content_config.get("hot_reload", False):
+        return
+    loop = asyncio.get_running_loop()
+    content_watcher = ContentWatcher(
+        engines.state_manager.nodes_path,
+        get_store=lambda: engines.content,
+        on_reload=lambda store, removed: loop.call_soon_threadsafe(engines.swap_content, store),
+        interval=content_config.get("watch_interval_seconds", 1.0)
+    )
+    content_watcher.start()
+
+
+@app.on_event("shutdown")
+def flush_sessions():
+    """Persist every resident session before the worker exits."""
+    if content_watcher is not None:
+        content_watcher.stop()
+    sessions.flush_all()
+    engines.state_manager.close()
+    client_log.close()
+    combat_log.close()
 
 # --- Pydantic Models for Requests ---
 
@@ -91,29 +278,34 @@ class LogRequest(BaseModel):
     message: str
     timestamp: str
 
+class LogBatchRequest(BaseModel):
+    entries: List[LogRequest] = Field(max_length=500)
+
 # --- Endpoints ---
 
+def _format_log_entry(entry: LogRequest) -> str:
+    return f"[{entry.timestamp}] [{entry.level.upper()}] {entry.message}\n"
+
 @app.post("/log")
-def log_client_message(request: LogRequest):
+async def log_client_message(request: LogRequest):
     """Log a message from the client."""
-    log_dir = Path(__file__).parent / "logs"
-    log_dir.mkdir(exist_ok=True)
-    
-    log_file = log_dir / "client.log"
-    with open(log_file, "a", encoding="utf-8") as f:
-        f.write(f"[{request.timestamp}] [{request.level.upper()}] {request.message}\n")
-    
+    client_log.write([_format_log_entry(request)])
     return {"status": "ok"}
 
+@app.post("/log/batch")
+async def log_client_batch(request: LogBatchRequest):
+    """Log a batch of messages from the client in one request."""
+    client_log.write([_format_log_entry(entry) for entry in request.entries])
+    return {"status": "ok", "accepted": len(request.entries)}
+
 class AllocateRequest(BaseModel):
     stat_name: str
 
 class CombatActionRequest(BaseModel):
     action: str  # "attack", "defend", "flee"
 
-@app.post("/allocate")
-def allocate_stat(request: AllocateRequest):
-    """Allocate a free stat point."""
+def apply_allocate(session: GameSession, request: AllocateRequest) -> None:
+    """Allocate a free stat point. Caller holds session.lock and saves afterwards."""
     success = session.rules_engine.allocate_stat_point(
         session.player_state["stats"], 
         request.stat_name
@@ -121,19 +313,19 @@ def allocate_stat(request: AllocateRequest):
     
     if not success:
         raise HTTPException(status_code=400, detail="Cannot allocate point (insufficient points or invalid stat)")
-        
-    session.save()
-    return get_game_state()
-
-    session.save()
-    return get_game_state()
 
 class EquipRequest(BaseModel):
     item_index: int
 
-@app.post("/equip")
-def equip_item(request: EquipRequest):
-    """Equip an item from inventory."""
+@app.post("/allocate")
+async def allocate_stat(request: AllocateRequest, session: GameSession = Depends(locked_session), since: Optional[int] = None):
+    """Allocate a free stat point."""
+    apply_allocate(session, request)
+    await session.save_async("allocate")
+    return versioned_state(session, since)
+
+def apply_equip(session: GameSession, request: EquipRequest) -> None:
+    """Equip an item from inventory. Caller holds session.lock and saves afterwards."""
     inventory = session.player_state["inventory"]
     
     if request.item_index < 0 or request.item_index >= len(inventory):
@@ -162,14 +354,17 @@ def equip_item(request: EquipRequest):
         
     # Equip new item
     equipment[item_type] = item
-    
-    session.save()
-    return get_game_state()
 
-@app.post("/combat/action")
-def combat_action(request: CombatActionRequest):
-    """Process a combat action."""
-    if not session.current_combat or not session.current_combat.is_active:
+@app.post("/equip")
+async def equip_item(request: EquipRequest, session: GameSession = Depends(locked_session), since: Optional[int] = None):
+    """Equip an item from inventory."""
+    apply_equip(session, request)
+    await session.save_async("equip")
+    return versioned_state(session, since)
+
+def apply_combat_action(session: GameSession, request: CombatActionRequest) -> None:
+    """Process a combat action. Caller holds session.lock and saves afterwards."""
+    if not session.in_combat:
         raise HTTPException(status_code=400, detail="No active combat")
     
     # Map string to enum
@@ -188,33 +383,101 @@ def combat_action(request: CombatActionRequest):
     
     # If combat ended
     if not session.current_combat.is_active:
+        log_combat(session, session.current_combat)
         if session.current_combat.victory:
             # Maybe move to next node? For now just stay but clear combat
             pass
         else:
             # Player died - redirect to death node
             session.player_state["current_node"] = "death"
-            
-    session.save()
-    return get_game_state()
+
+def log_combat(session: GameSession, combat: CombatState) -> None:
+    """Append a finished fight's replay record to the combat log."""
+    record = {
+        "ts": int(time.time() * 1000),
+        "session": session.session_id,
+        "victory": combat.victory,
+        **combat.to_replay()
+    }
+    combat_log.write([json.dumps(record, separators=(",", ":")) + "\n"])
+
+@app.post("/combat/action")
+async def combat_action(request: CombatActionRequest, session: GameSession = Depends(locked_session), since: Optional[int] = None):
+    """Process a combat action."""
+    apply_combat_action(session, request)
+    await session.save_async("combat")
+    return versioned_state(session, since)
 
 @app.post("/debug/combat")
-def debug_start_combat():
+async def debug_start_combat(session: GameSession = Depends(locked_session), since: Optional[int] = None):
     """Start a debug combat encounter."""
-    enemy = Enemy("Shadow Stalker", hp=40, attack_power=8, defence=3, exp_reward=50)
-    session.current_combat = session.combat_engine.initialize_combat(enemy)
-    return get_game_state()
+    # A real template so the fight can be replayed from the combat log
+    enemy = session.combat_engine.spawn("shadow_01") or session.combat_engine.get_random_enemy(difficulty=5)
+    session.start_combat(enemy)
+    return versioned_state(session, since)
 
 @app.get("/state")
-def get_game_state():
+async def get_game_state(session: GameSession = Depends(locked_session), since: Optional[int] = None):
     """Returns the full display state for the UI."""
+    return versioned_state(session, since)
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak If-None-Match comparison (RFC 9110), as used for GET."""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or any(tag.removeprefix("W/") == etag for tag in candidates)
+
+@app.get("/nodes/{node_id}")
+async def get_node_content(node_id: str, request: Request, v: Optional[str] = None):
+    """
+    Static node content (text and every choice), keyed by content hash.
+
+    /state references nodes as {node_id, node_hash}; clients request
+    /nodes/{node_id}?v={node_hash}, which is cacheable indefinitely since a
+    content change means a new hash. Other requests revalidate via ETag.
+    """
+    content = engines.content
+    node_hash = content.node_hashes.get(node_id)
+    if node_hash is None:
+        raise HTTPException(status_code=404, detail="Node not found")
+    
+    etag = f'"{node_hash}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": "public, max-age=31536000, immutable" if v == node_hash else "no-cache"
+    }
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return JSONResponse({"node_id": node_id, **content.node_payload(node_id)}, headers=headers)
+
+def versioned_state(session: GameSession, since: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Versioned display state for a response.
+
+    Without `since` this is the full state plus its "version". With `since`
+    it is {"version", "since", "ops"}: JSON-patch ops from that version's
+    state to the current one, or {"version", "state"} if the client's base
+    version is unknown (evicted session, aged out of history).
+    """
+    state = jsonable_encoder(build_game_state(session))
+    version = session.record_state(state)
+    if since is None:
+        return {**state, "version": version}
+    base = session.snapshots.get(since)
+    if base is None:
+        return {"version": version, "state": state}
+    return {"version": version, "since": since, "ops": diff(base, state)}
+
+def build_game_state(session: GameSession):
+    """Build the display state for a session. Caller holds session.lock."""
     node_data = session.get_current_node_data()
     
     # Determine mode
     mode = "STORY"
     combat_data = None
     
-    if session.current_combat and session.current_combat.is_active:
+    if session.in_combat:
         mode = "COMBAT"
         combat_data = {
             "enemy": {
@@ -236,9 +499,8 @@ def get_game_state():
         "combat": combat_data
     }
 
-@app.post("/choice")
-def make_choice(request: ChoiceRequest):
-    """Process a player's choice."""
+def apply_choice(session: GameSession, request: ChoiceRequest) -> Dict[str, Any]:
+    """Process a player's choice and return its outcome. Caller holds session.lock and saves afterwards."""
     current_node_id = session.player_state["current_node"]
     
     # Process using existing engine logic
@@ -262,57 +524,114 @@ def make_choice(request: ChoiceRequest):
         combat_trigger = result.effects["combat"]
         # If string (enemy ID) or int (difficulty) can be handled,
         # for now let's assume it's an enemy ID or "random"
-        if combat_trigger == "random":
+        # Find enemy by ID, else random
+        enemy = None
+        if combat_trigger != "random":
+             enemy = session.combat_engine.spawn(combat_trigger)
+        if enemy is None:
              enemy = session.combat_engine.get_random_enemy(difficulty=1)
-        else:
-             # Find enemy by ID, else random
-             enemy_data = next((e for e in session.combat_engine.enemies if e["id"] == combat_trigger), None)
-             if enemy_data:
-                 enemy = Enemy(
-                    name=enemy_data["name"],
-                    hp=enemy_data["hp"],
-                    attack_power=enemy_data["attack_power"],
-                    defence=enemy_data["defence"],
-                    exp_reward=enemy_data["exp_reward"],
-                    loot=enemy_data.get("loot_table", [])
-                 )
-             else:
-                 enemy = session.combat_engine.get_random_enemy(difficulty=1)
-        
-        session.current_combat = session.combat_engine.initialize_combat(enemy)
         
-    session.save()
+        session.start_combat(enemy)
     
     return {
         "success": True,
         "message": result.message,
         "effects": result.effects,
-        "next_node": result.next_node,
-        "new_state": get_game_state()
+        "next_node": result.next_node
     }
 
-@app.post("/debug/combat")
-def debug_start_combat():
-    """Start a debug combat encounter."""
-    # Use random level 3 enemy
-    enemy = session.combat_engine.get_random_enemy(difficulty=3)
-    session.current_combat = session.combat_engine.initialize_combat(enemy)
-    return get_game_state()
+@app.post("/choice")
+async def make_choice(request: ChoiceRequest, session: GameSession = Depends(locked_session), since: Optional[int] = None):
+    """Process a player's choice."""
+    outcome = apply_choice(session, request)
+    await session.save_async("choice")
+    return {**outcome, "new_state": versioned_state(session, since)}
 
 @app.post("/reset")
-def reset_game(request: ResetRequest):
+async def reset_game(request: ResetRequest, session: GameSession = Depends(locked_session), since: Optional[int] = None):
     """Resets the game to initial state - useful for debugging."""
     if not request.confirm:
          raise HTTPException(status_code=400, detail="Must confirm reset")
          
     # Reload from template by deleting current state and reloading
-    if session.state_manager.player_state_path.exists():
-        session.state_manager.player_state_path.unlink()
-        
-    session.player_state = session.state_manager.load_player_state()
-    session.save()
+    await run_in_threadpool(session.reset)
+    
+    return versioned_state(session, since)
+
+# --- WebSocket ---
+# Message type -> (request model, handler, save event); handlers are shared with the HTTP endpoints
+SOCKET_ACTIONS = {
+    "choice": (ChoiceRequest, apply_choice, "choice"),
+    "allocate": (AllocateRequest, apply_allocate, "allocate"),
+    "equip": (EquipRequest, apply_equip, "equip"),
+    "combat_action": (CombatActionRequest, apply_combat_action, "combat"),
+}
+
+@app.websocket("/ws")
+async def game_socket(websocket: WebSocket, session_id: str = DEFAULT_SESSION_ID):
+    """
+    Long-lived action channel: one JSON message per action, one reply each.
+
+    Client: {"id": 1, "type": "choice", "since": 42, "choice_index": 0}, where
+    type is "state" or a SOCKET_ACTIONS key and the rest is its request body.
+    Server: {"id": 1, "ok": true, "state": <versioned state>, "result": {...}}
+    or {"id": 1, "ok": false, "status": 400, "error": "..."}.
+    Browsers cannot set WebSocket headers, so the session id is a query param.
+    """
+    if not is_valid_session_id(session_id):
+        await websocket.close(code=1008)
+        return
+    
+    await websocket.accept()
+    try:
+        while True:
+            raw = await websocket.receive_text()
+            try:
+                message = json.loads(raw)
+            except ValueError:
+                message = None
+            if not isinstance(message, dict):
+                await websocket.send_json({"id": None, "ok": False, "status": 400, "error": "Invalid message"})
+                continue
+            await websocket.send_json(jsonable_encoder(await handle_socket_message(session_id, message)))
+    except WebSocketDisconnect:
+        pass
+
+async def handle_socket_message(session_id: str, message: Dict[str, Any]) -> Dict[str, Any]:
+    """Apply one socket message to the session and build its reply."""
+    message_id = message.get("id")
+    kind = message.get("type")
+    since = message.get("since")
+    if kind != "state" and kind not in SOCKET_ACTIONS:
+        return {"id": message_id, "ok": False, "status": 400, "error": f"Unknown message type: {kind}"}
+    
+    # Resolved per message: the registry may evict and rehydrate the session
+    # between messages on a long-lived connection.
+    session = await run_in_threadpool(sessions.get, session_id, True)
+    try:
+        async with session.lock:
+            # Same as locked_session: a reload may have removed the player's node
+            if session.ensure_valid_node():
+                await session.save_async("node_reset")
+            result = None
+            try:
+                if kind in SOCKET_ACTIONS:
+                    model, handler, event = SOCKET_ACTIONS[kind]
+                    payload = {key: value for key, value in message.items() if key not in ("id", "type", "since")}
+                    result = handler(session, model(**payload))
+                    await session.save_async(event)
+            except ValidationError as e:
+                return {"id": message_id, "ok": False, "status": 422, "error": str(e)}
+            except HTTPException as e:
+                return {"id": message_id, "ok": False, "status": e.status_code, "error": e.detail}
+            state = versioned_state(session, since if isinstance(since, int) else None)
+    finally:
+        sessions.release(session_id)
     
-    return get_game_state()
+    reply = {"id": message_id, "ok": True, "state": state}
+    if result is not None:
+        reply["result"] = result
+    return reply
 
 if __name__ == "__main__":
     import uvicorn
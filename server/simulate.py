@@ -0,0 +1,64 @@
+"""
+XP Minima RPG - Balance Simulator
+
+Runs headless fights for every player build x enemy pair and prints
+win rate, mean turns, HP remaining and XP per minute.
+
+Usage: python simulate.py --fights 100000 --workers 4 [--enemy wolf_01] [--vectorized] [--json]
+"""
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from engine.state_manager import StateManager
+from engine.content_store import get_content_store
+from engine.simulator import BalanceSimulator, make_builds
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Headless combat balance simulator")
+    parser.add_argument("--fights", type=int, default=10000, help="Fights per build x enemy pair")
+    parser.add_argument("--seed", type=int, default=0, help="Base RNG seed")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes (0 = in-process)")
+    parser.add_argument("--enemy", action="append", dest="enemies", help="Enemy id to simulate (repeatable; default all)")
+    parser.add_argument("--seconds-per-turn", type=float, default=3.0, help="Assumed real time per turn for XP/minute")
+    parser.add_argument("--vectorized", action="store_true", help="Use the NumPy kernel (requires numpy)")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    # Content is read once up front; the runs themselves never touch disk
+    settings_path = Path(__file__).parent / "config" / "settings.json"
+    state_manager = StateManager(str(settings_path))
+    content = get_content_store(state_manager)
+    template = state_manager._load_json(str(state_manager.player_state_path.parent / "player_template.json"))
+
+    builds = make_builds(state_manager.settings, template["stats"])
+    enemy_ids = args.enemies or [e["id"] for e in content.enemies]
+
+    simulator = BalanceSimulator(state_manager.settings, content, seconds_per_turn=args.seconds_per_turn)
+    if args.vectorized:
+        results = simulator.run_vectorized(builds, enemy_ids, args.fights, seed=args.seed)
+    else:
+        results = simulator.run(builds, enemy_ids, args.fights, seed=args.seed, workers=args.workers)
+
+    if args.json:
+        print(json.dumps([result.to_dict() for result in results], indent=2))
+        return
+
+    print(f"{'build':<10} {'enemy':<14} {'fights':>8} {'win %':>7} {'turns':>7} {'hp left':>8} {'xp/min':>8}")
+    print("-" * 68)
+    for result in results:
+        print(f"{result.build:<10} {result.enemy_id:<14} {result.fights:>8} "
+              f"{result.win_rate * 100:>6.1f}% {result.mean_turns:>7.2f} "
+              f"{result.mean_hp_remaining:>8.1f} {result.xp_per_minute:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Shared fixture for the persistence test suites.
+Runs a StateManager against a throwaway content root with a player template.
+"""
+
+import copy
+import json
+import shutil
+import tempfile
+import unittest
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from engine.state_manager import StateManager
+
+
+class PersistenceTestCase(unittest.TestCase):
+    """
+    Base case: subclasses set `template` and `persistence` (and extra
+    `paths`), then read self.state_manager or build more with
+    _make_state_manager() after editing self.settings.
+    """
+
+    template = {"stats": {"hp": 50}, "inventory": [], "flags": {}, "current_node": "intro_01"}
+    persistence = {"mode": "immediate"}
+    paths = {}
+
+    def setUp(self):
+        """Set up a throwaway content root with a player template."""
+        self.root = Path(tempfile.mkdtemp())
+        (self.root / "config").mkdir()
+        (self.root / "data" / "player").mkdir(parents=True)
+
+        self.template = copy.deepcopy(self.template)
+        with open(self.root / "data" / "player" / "player_template.json", "w") as f:
+            json.dump(self.template, f)
+
+        self.settings = {
+            "paths": {
+                "player_state": "data/player/player_state.json",
+                "world_state": "data/world/world_state.json",
+                "nodes": "data/nodes/nodes.json",
+                **self.paths
+            },
+            "persistence": copy.deepcopy(self.persistence)
+        }
+        self.state_manager = self._make_state_manager()
+
+    def tearDown(self):
+        self.state_manager.close()
+        shutil.rmtree(self.root)
+
+    def _make_state_manager(self):
+        settings_path = self.root / "config" / "settings.json"
+        with open(settings_path, "w") as f:
+            json.dump(self.settings, f)
+        return StateManager(str(settings_path))
@@ -0,0 +1,129 @@
+"""
+Test suite for Combat Engine.
+Tests enemy spawning, turn resolution and seeded replays.
+"""
+
+import unittest
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from engine.rules import RulesEngine
+from engine.combat_engine import CombatEngine, CombatAction
+from engine.content_store import ContentStore
+
+
+class TestCombatEngine(unittest.TestCase):
+    """Test cases for CombatEngine."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.settings = {
+            "scaling": {"hp_per_point": 5, "mp_per_point": 5, "other_stats_per_point": 1},
+            "experience": {"exp_per_node": 10, "level_up_threshold": 100, "threshold_increase_per_level": 50},
+            "player": {"level_up_points": 2}
+        }
+        enemies = [
+            {"id": "ogre_01", "name": "Ogre", "hp": 80, "attack_power": 14, "defence": 6, "exp_reward": 90, "difficulty": 5},
+            {"id": "rat_01", "name": "Rat", "hp": 15, "attack_power": 6, "defence": 1, "exp_reward": 10, "difficulty": 1},
+            {"id": "wolf_01", "name": "Wolf", "hp": 30, "attack_power": 9, "defence": 2, "exp_reward": 25, "difficulty": 2,
+             "loot_table": [{"item_id": "fang_01", "chance": 0.5}]}
+        ]
+        content = ContentStore(nodes={}, enemies=enemies, items=[])
+        self.combat = CombatEngine(RulesEngine(self.settings), content=content)
+
+    def test_spawn_by_id(self):
+        """Test spawn builds a fresh enemy from its template."""
+        wolf = self.combat.spawn("wolf_01")
+        self.assertEqual(wolf.name, "Wolf")
+        self.assertEqual(wolf.max_hp, 30)
+        self.assertEqual(wolf.loot[0]["item_id"], "fang_01")
+        self.assertIsNot(wolf, self.combat.spawn("wolf_01"))
+
+    def test_spawn_unknown_id(self):
+        """Test spawn returns None for an unknown template."""
+        self.assertIsNone(self.combat.spawn("dragon_01"))
+
+    def test_random_enemy_respects_difficulty(self):
+        """Test random enemies never exceed the requested difficulty."""
+        names = {self.combat.get_random_enemy(difficulty=2).name for _ in range(200)}
+        self.assertEqual(names, {"Rat", "Wolf"})
+        self.assertEqual(self.combat.get_random_enemy(difficulty=1).name, "Rat")
+
+    def test_random_enemy_fallback(self):
+        """Test the fallback enemy when nothing fits the difficulty."""
+        self.assertEqual(self.combat.get_random_enemy(difficulty=0).name, "Rat")
+        self.assertEqual(self.combat.get_random_enemy(difficulty=0).max_hp, 10)
+
+    def test_fallback_enemy_fights_replay(self):
+        """Test a fight against the fallback enemy has a template ID and replays."""
+        state = self.combat.initialize_combat(self.combat.get_random_enemy(difficulty=0), seed=3)
+        stats = {"hp": 50, "strength": 5, "agility": 5}
+        while state.is_active:
+            self.combat.process_turn(state, stats, [], CombatAction.ATTACK)
+        record = state.to_replay()
+        self.assertEqual(record["enemy_id"], "rat_fallback")
+        replayed = self.combat.replay(record, {"hp": 50, "strength": 5, "agility": 5}, [])
+        self.assertEqual(replayed.log, state.log)
+
+    def _fight(self, seed, actions):
+        stats = {"hp": 50, "strength": 5, "agility": 5}
+        inventory = []
+        state = self.combat.initialize_combat(self.combat.spawn("wolf_01"), seed=seed)
+        for action in actions:
+            if not state.is_active:
+                break
+            self.combat.process_turn(state, stats, inventory, action)
+        return state, stats, inventory
+
+    def test_same_seed_same_fight(self):
+        """Test fights with the same seed and actions are identical."""
+        actions = [CombatAction.ATTACK] * 3 + [CombatAction.DEFEND] + [CombatAction.ATTACK] * 10
+        first, first_stats, _ = self._fight(42, actions)
+        second, second_stats, _ = self._fight(42, actions)
+        self.assertEqual(first.log, second.log)
+        self.assertEqual(first_stats, second_stats)
+
+    def test_replay_reproduces_fight(self):
+        """Test a fight replays bit-for-bit from its replay record."""
+        actions = [CombatAction.FLEE, CombatAction.DEFEND] + [CombatAction.ATTACK] * 10
+        original, original_stats, original_loot = self._fight(7, actions)
+        record = original.to_replay()
+        self.assertEqual(record["enemy_id"], "wolf_01")
+
+        stats = {"hp": 50, "strength": 5, "agility": 5}
+        inventory = []
+        replayed = self.combat.replay(record, stats, inventory)
+        self.assertEqual(replayed.log, original.log)
+        self.assertEqual(stats, original_stats)
+        self.assertEqual(inventory, original_loot)
+
+    def test_replay_record_carries_player_state(self):
+        """Test a fight started with the player's state replays from its record alone."""
+        stats = {"hp": 50, "strength": 9, "agility": 5}
+        state = self.combat.initialize_combat(self.combat.spawn("wolf_01"), seed=11, player_stats=stats,
+                                              player_inventory=[], player_equipment=None)
+        while state.is_active:
+            self.combat.process_turn(state, stats, [], CombatAction.ATTACK)
+
+        record = state.to_replay()
+        self.assertEqual(record["player"]["stats"], {"hp": 50, "strength": 9, "agility": 5})
+        replayed = self.combat.replay(record)
+        self.assertEqual(replayed.log, state.log)
+        with self.assertRaises(ValueError):
+            self.combat.replay({k: v for k, v in record.items() if k != "player"})
+
+    def test_fights_do_not_share_rng(self):
+        """Test global random state does not affect a seeded fight."""
+        import random
+        random.seed(1)
+        first, _, _ = self._fight(99, [CombatAction.ATTACK] * 10)
+        random.seed(2)
+        second, _, _ = self._fight(99, [CombatAction.ATTACK] * 10)
+        self.assertEqual(first.log, second.log)
+
+
+if __name__ == "__main__":
+    unittest.main()
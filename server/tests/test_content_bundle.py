@@ -0,0 +1,100 @@
+"""
+Test suite for the compiled content bundle.
+Tests round-tripping content, staleness detection and JSON fallback.
+"""
+
+import json
+import os
+import tempfile
+import unittest
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from engine.content_bundle import ContentBundle, BundleError
+from engine.content_store import ContentStore
+from engine.state_manager import StateManager
+
+
+class TestContentBundle(unittest.TestCase):
+    """Test cases for building and loading bundles."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        root = Path(self.temp_dir.name)
+        (root / "config").mkdir()
+        (root / "data" / "nodes").mkdir(parents=True)
+
+        self.nodes = {
+            "start": {"text": "Ünïcode text — with dashes.", "choices": [{"label": "Go", "next": "end"}]},
+            "end": {"text": "The end.", "choices": [{"label": "Fight", "next": "start", "effects": {"combat": "rat_01"}}]}
+        }
+        self._write(root / "data" / "nodes" / "nodes.json", self.nodes)
+        self._write(root / "data" / "enemies.json", [{"id": "rat_01", "name": "Rat", "hp": 10}])
+        self._write(root / "data" / "items.json", [{"id": "herb_01", "name": "Herb"}])
+        self._write(root / "config" / "settings.json", {
+            "paths": {
+                "player_state": "data/player/player_state.json",
+                "world_state": "data/world/world_state.json",
+                "nodes": "data/nodes"
+            }
+        })
+        self.state_manager = StateManager(str(root / "config" / "settings.json"))
+
+    def tearDown(self):
+        """Clean up temporary files."""
+        self.temp_dir.cleanup()
+
+    @staticmethod
+    def _write(path, data):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+
+    def test_round_trip(self):
+        """Test a bundle reproduces the JSON content exactly."""
+        self.state_manager.build_content_bundle()
+        bundle = self.state_manager.load_content_bundle()
+        self.assertIsNotNone(bundle)
+        self.assertEqual(bundle.nodes(), self.nodes)
+        self.assertEqual(bundle.node_text("start"), self.nodes["start"]["text"])
+        self.assertEqual(bundle.enemies[0]["id"], "rat_01")
+
+    def test_store_reads_text_lazily(self):
+        """Test a bundle-backed store keeps text out of its nodes but serves it."""
+        self.state_manager.build_content_bundle()
+        store = ContentStore.from_state_manager(self.state_manager)
+        self.assertNotIn("text", store.nodes["start"])
+        self.assertEqual(store.node_text("start"), self.nodes["start"]["text"])
+        self.assertEqual(store.node_payload("end"), self.nodes["end"])
+
+        # Hashes match what the JSON-backed store computes, so ETags survive a rebuild
+        json_store = ContentStore(self.nodes, enemies=[], items=[])
+        self.assertEqual(dict(store.node_hashes), dict(json_store.node_hashes))
+
+    def test_stale_bundle_falls_back_to_json(self):
+        """Test edited sources make the bundle stale."""
+        self.state_manager.build_content_bundle()
+        self.nodes["end"]["text"] = "A new ending."
+        nodes_file = self.state_manager.nodes_path / "nodes.json"
+        self._write(nodes_file, self.nodes)
+        stat = nodes_file.stat()
+        os.utime(nodes_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+
+        self.assertIsNone(self.state_manager.load_content_bundle())
+        store = ContentStore.from_state_manager(self.state_manager)
+        self.assertEqual(store.nodes["end"]["text"], "A new ending.")
+
+    def test_rejects_foreign_files(self):
+        """Test a file that isn't a bundle is refused."""
+        with open(self.state_manager.content_bundle_path, "wb") as f:
+            f.write(b"{}" * 40)
+        with self.assertRaises(BundleError):
+            ContentBundle(self.state_manager.content_bundle_path)
+        self.assertIsNone(self.state_manager.load_content_bundle())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+"""
+Test suite for ContentStore.
+Tests freezing of shared content and that players get mutable copies.
+"""
+
+import json
+import unittest
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from engine.content_store import ContentStore, get_content_store, thaw, content_hash
+from engine.state_manager import StateManager
+from engine.rules import RulesEngine
+from engine.node_engine import NodeEngine
+from engine.item_registry import ItemRegistry
+
+
+class TestContentStore(unittest.TestCase):
+    """Test cases for ContentStore."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.settings = {
+            "scaling": {"hp_per_point": 5, "mp_per_point": 5, "other_stats_per_point": 1},
+            "experience": {"exp_per_node": 10, "level_up_threshold": 100, "threshold_increase_per_level": 50},
+            "player": {"level_up_points": 2}
+        }
+        herb = {"name": "Marsh Herb", "type": "consumable", "effect": {"hp": 10}}
+        self.store = ContentStore(
+            nodes={"start": {"text": "Hi", "choices": [{"label": "Take", "effects": {"items": [herb]}}]}},
+            enemies=[{"id": "rat_01", "name": "Rat", "loot_table": []}],
+            items=[{"id": "herb_01", **herb}]
+        )
+
+    def test_content_is_read_only(self):
+        """Test frozen content rejects mutation."""
+        with self.assertRaises(TypeError):
+            self.store.nodes["start"]["text"] = "changed"
+        with self.assertRaises(TypeError):
+            self.store.items["herb_01"]["effect"]["hp"] = 99
+        self.assertIsInstance(self.store.enemies, tuple)
+
+    def test_thaw_round_trips_to_json(self):
+        """Test thawed content is plain, serialisable data."""
+        item = thaw(self.store.items["herb_01"])
+        item["effect"]["hp"] = 99
+        self.assertEqual(self.store.items["herb_01"]["effect"]["hp"], 10)
+        json.dumps(item)
+
+    def test_node_items_are_copied_into_inventory(self):
+        """Test items granted by node effects are independent per player when not registered."""
+        engine = NodeEngine(self.store.nodes, RulesEngine(self.settings), item_registry=ItemRegistry())
+        inventory = []
+        engine.process_choice({}, {}, inventory, "start", 0)
+        inventory[0]["effect"]["hp"] = 0
+        self.assertEqual(self.store.nodes["start"]["choices"][0]["effects"]["items"][0]["effect"]["hp"], 10)
+
+    def test_node_hashes_track_content(self):
+        """Test node hashes are stable per content and change with it."""
+        node = {"text": "Hi", "choices": [{"label": "Go", "next_node": "end"}]}
+        reordered = {"choices": [{"next_node": "end", "label": "Go"}], "text": "Hi"}
+        self.assertEqual(content_hash(node), content_hash(reordered))
+        self.assertNotEqual(content_hash(node), content_hash({**node, "text": "Hello"}))
+        self.assertEqual(self.store.node_hashes["start"], content_hash(thaw(self.store.nodes["start"])))
+
+    def test_shared_store_is_cached(self):
+        """Test the process-wide store is loaded once per content root."""
+        settings_path = Path(__file__).parent.parent / "config" / "settings.json"
+        first = get_content_store(StateManager(str(settings_path)))
+        second = get_content_store(StateManager(str(settings_path)))
+        self.assertIs(first, second)
+        self.assertIn("intro_01", first.nodes)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,137 @@
+"""
+Test suite for ContentWatcher.
+Tests incremental reloads, node removal and rejection of broken edits.
+"""
+
+import json
+import os
+import tempfile
+import unittest
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from engine.content_store import ContentStore
+from engine.content_watcher import ContentWatcher
+from engine.node_engine import NodeEngine
+from engine.node_graph import load_node_graph
+from engine.rules import RulesEngine
+
+
+class TestContentWatcher(unittest.TestCase):
+    """Test cases for ContentWatcher."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.nodes_dir = Path(self.temp_dir.name)
+        self._write("nodes.json", {
+            "intro_01": {"text": "Start.", "choices": [{"label": "Go", "next": "square"}]}
+        })
+        self._write("zone_village.json", {
+            "square": {"text": "A square.", "choices": [{"label": "Back", "next": "intro_01"},
+                                                        {"label": "Well", "next": "well"}]},
+            "well": {"text": "A well.", "choices": [{"label": "Back", "next": "square"}]}
+        })
+
+        self.store = ContentStore(load_node_graph(self.nodes_dir).nodes, enemies=[], items=[])
+        self.reloads = []
+        self.watcher = ContentWatcher(self.nodes_dir, get_store=lambda: self.store, on_reload=self._on_reload)
+
+    def tearDown(self):
+        """Clean up temporary files."""
+        self.temp_dir.cleanup()
+
+    def _on_reload(self, store, removed):
+        self.store = store
+        self.reloads.append(removed)
+
+    def _write(self, name, zone):
+        path = self.nodes_dir / name
+        existed = path.exists()
+        with open(path, "w") as f:
+            json.dump(zone, f)
+        if existed:
+            # Ensure the edit is visible even on coarse mtime filesystems
+            stat = path.stat()
+            os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    def test_no_changes_no_reload(self):
+        """Test polling untouched files does nothing."""
+        self.assertIsNone(self.watcher.poll())
+        self.assertEqual(self.reloads, [])
+
+    def test_changed_zone_is_swapped_in(self):
+        """Test only the edited zone's nodes are rebuilt."""
+        intro = self.store.nodes["intro_01"]
+        intro_hash = self.store.node_hashes["intro_01"]
+        self._write("zone_village.json", {
+            "square": {"text": "A busy square.", "choices": [{"label": "Back", "next": "intro_01"}]}
+        })
+
+        new_store = self.watcher.poll()
+        self.assertIsNotNone(new_store)
+        self.assertEqual(new_store.nodes["square"]["text"], "A busy square.")
+        self.assertIs(new_store.nodes["intro_01"], intro)
+        self.assertEqual(new_store.node_hashes["intro_01"], intro_hash)
+        self.assertEqual(self.reloads, [{"well"}])
+
+    def test_broken_edit_keeps_live_content(self):
+        """Test a dangling link is rejected and the old nodes stay."""
+        self._write("zone_village.json", {
+            "square": {"text": "Oops.", "choices": [{"label": "Go", "next": "nowhere"}]}
+        })
+        self.assertIsNone(self.watcher.poll())
+        self.assertEqual(self.store.nodes["square"]["text"], "A square.")
+
+        # Fixing the file reloads it
+        self._write("zone_village.json", {
+            "square": {"text": "Fixed.", "choices": [{"label": "Back", "next": "intro_01"}]}
+        })
+        self.assertIsNotNone(self.watcher.poll())
+        self.assertEqual(self.store.nodes["square"]["text"], "Fixed.")
+
+    def test_fixing_one_file_applies_edits_from_a_failed_reload(self):
+        """Test a good edit saved alongside a broken file is applied once the broken file is fixed."""
+        self._write("nodes.json", {
+            "intro_01": {"text": "Start again.", "choices": [{"label": "Go", "next": "square"}]}
+        })
+        self._write("zone_village.json", {
+            "square": {"text": "Oops.", "choices": [{"label": "Go", "next": "nowhere"}]}
+        })
+        self.assertIsNone(self.watcher.poll())
+        # Unchanged broken files are not retried on every poll
+        self.assertIsNone(self.watcher.poll())
+        self.assertEqual(self.store.nodes["intro_01"]["text"], "Start.")
+
+        self._write("zone_village.json", {
+            "square": {"text": "Fixed.", "choices": [{"label": "Back", "next": "intro_01"}]}
+        })
+        self.assertIsNotNone(self.watcher.poll())
+        self.assertEqual(self.store.nodes["intro_01"]["text"], "Start again.")
+        self.assertEqual(self.store.nodes["square"]["text"], "Fixed.")
+        self.assertIsNone(self.watcher.poll())
+
+    def test_node_engine_swap_reuses_compiled_requirements(self):
+        """Test unchanged nodes keep their compiled requirements."""
+        settings = {
+            "scaling": {"hp_per_point": 5, "mp_per_point": 5, "other_stats_per_point": 1},
+            "experience": {"exp_per_node": 10, "level_up_threshold": 100, "threshold_increase_per_level": 50},
+            "player": {"level_up_points": 2}
+        }
+        engine = NodeEngine(self.store.nodes, RulesEngine(settings))
+        compiled = engine.get_choice_requirements("intro_01")
+        self._write("zone_village.json", {
+            "square": {"text": "A square.", "choices": [{"label": "Back", "next": "intro_01"}]}
+        })
+        self.watcher.poll()
+        engine.set_nodes(self.store.nodes)
+        self.assertIs(engine.get_choice_requirements("intro_01"), compiled)
+        self.assertEqual(len(engine.get_choice_requirements("square")), 1)
+        self.assertIsNone(engine.get_node("well"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+"""
+Test suite for FlagSet and FlagRegistry.
+Tests dict compatibility, compiled mask checks, and lossless round trips.
+"""
+
+import copy
+import json
+import unittest
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from engine.flags import FlagRegistry, FlagSet, ensure_flags
+from engine.node_engine import CompiledRequirements
+from engine.stats import json_default
+
+
+class TestFlagSet(unittest.TestCase):
+    """Test cases for FlagSet."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.raw = {"met_elder": True, "gate_open": False, "guard_mood": "angry"}
+        self.flags = FlagSet.from_dict(self.raw)
+
+    def test_round_trip_is_lossless(self):
+        """Test saving reproduces the original flags, including False and non-bool values."""
+        self.assertEqual(self.flags.to_dict(), self.raw)
+        self.assertEqual(json.loads(json.dumps(self.flags, default=json_default)), self.raw)
+        self.assertEqual(copy.deepcopy(self.flags), self.raw)
+        self.assertEqual(self.flags.copy(), self.raw)
+
+    def test_behaves_like_dict(self):
+        """Test dict-style access used by the engine and old saves."""
+        self.assertTrue(self.flags["met_elder"])
+        self.assertIs(self.flags.get("gate_open"), False)
+        self.assertIsNone(self.flags.get("unknown_flag"))
+        self.assertNotIn("unknown_flag", self.flags)
+        self.assertEqual(len(self.flags), 3)
+
+        self.flags["gate_open"] = True
+        self.flags["guard_mood"] = False
+        del self.flags["met_elder"]
+        self.assertEqual(dict(self.flags), {"gate_open": True, "guard_mood": False})
+        with self.assertRaises(KeyError):
+            del self.flags["met_elder"]
+
+    def test_compiled_masks_match_dict_semantics(self):
+        """Test mask checks agree with comparing values one by one."""
+        cases = [
+            {"met_elder": True},
+            {"gate_open": False},
+            {"never_set": False},
+            {"never_set": True},
+            {"met_elder": True, "gate_open": True},
+            {"guard_mood": False},
+            {"guard_mood": True}
+        ]
+        for required in cases:
+            compiled = CompiledRequirements({"flags": required})
+            expected = all(self.raw.get(name, False) == value for name, value in required.items())
+            self.assertEqual(compiled.check({}, self.flags, {}), expected, required)
+            # Plain dict flags (e.g. unconverted saves) still work
+            self.assertEqual(compiled.check({}, dict(self.raw), {}), expected, required)
+
+    def test_registry_is_append_only(self):
+        """Test interned bits stay stable and come from the node graph."""
+        registry = FlagRegistry()
+        registry.intern_nodes({
+            "a": {"choices": [{"next": "b", "requirements": {"flags": {"x": True}}, "effects": {"flags": {"y": True}}}]}
+        })
+        self.assertEqual((registry.index("x"), registry.index("y")), (0, 1))
+        self.assertEqual(registry.index("z"), 2)
+        self.assertEqual(registry.compile({"x": True, "z": False}), (0b001, 0b100))
+        self.assertIsNone(registry.compile({"x": "yes"}))
+
+    def test_ensure_flags_upgrades_in_place(self):
+        """Test old JSON saves are converted on load."""
+        state = {"flags": {"met_elder": True}}
+        flags = ensure_flags(state)
+        self.assertIsInstance(state["flags"], FlagSet)
+        self.assertIs(ensure_flags(state), flags)
+        self.assertEqual(ensure_flags({}), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+"""
+Test suite for Inventory.
+Tests the name index, stack counts, and JSON compatibility.
+"""
+
+import copy
+import json
+import unittest
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from engine.inventory import Inventory
+from engine.state_manager import PlayerState
+
+
+class TestInventory(unittest.TestCase):
+    """Test cases for Inventory."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.inventory = Inventory([
+            {"name": "Healing Potion", "type": "consumable"},
+            {"name": "Iron Sword", "type": "weapon"},
+            {"name": "Healing Potion", "type": "consumable"}
+        ])
+
+    def test_counts_and_lookup(self):
+        """Test stack counts and first-slot lookup."""
+        self.assertEqual(self.inventory.count_of("Healing Potion"), 2)
+        self.assertTrue(self.inventory.has("Iron Sword"))
+        self.assertFalse(self.inventory.has("Wand"))
+        self.assertEqual(self.inventory.index_of("Iron Sword"), 1)
+
+    def test_index_survives_positional_pop(self):
+        """Test popping by position (as /equip does) keeps the index correct."""
+        self.inventory.pop(0)
+        self.assertEqual(self.inventory.index_of("Iron Sword"), 0)
+        self.assertEqual(self.inventory.index_of("Healing Potion"), 1)
+        self.assertEqual(self.inventory.count_of("Healing Potion"), 1)
+
+    def test_append_and_remove_name(self):
+        """Test appending and removing by name update the counts."""
+        self.inventory.index_of("Iron Sword")  # build the slot index
+        self.inventory.append({"name": "Wand", "type": "weapon"})
+        self.assertEqual(self.inventory.index_of("Wand"), 3)
+
+        removed = self.inventory.remove_name("Healing Potion")
+        self.assertEqual(removed["type"], "consumable")
+        self.assertEqual(self.inventory.count_of("Healing Potion"), 1)
+        self.assertIsNone(self.inventory.remove_name("Shield"))
+
+    def test_serialises_as_plain_list(self):
+        """Test the JSON shape and copies match a plain list."""
+        as_json = json.dumps(self.inventory)
+        self.assertEqual(json.loads(as_json), list(self.inventory))
+
+        clone = copy.deepcopy(self.inventory)
+        self.assertIsInstance(clone, Inventory)
+        self.assertEqual(clone.count_of("Healing Potion"), 2)
+
+    def test_player_state_uses_index(self):
+        """Test PlayerState upgrades a raw list and uses it for item checks."""
+        player = PlayerState({"stats": {}, "flags": {}, "inventory": [{"name": "Key"}], "current_node": "a"})
+        self.assertIsInstance(player.inventory, Inventory)
+        self.assertTrue(player.has_item("Key"))
+        self.assertTrue(player.remove_item("Key"))
+        self.assertFalse(player.has_item("Key"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,142 @@
+"""
+Test suite for the item registry.
+Tests merging of item sources, interning of inventory items and save round trips.
+"""
+
+import copy
+import json
+import pickle
+import unittest
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from engine.consumables import CONSUMABLES
+from engine.content_store import ContentStore
+from engine.item_registry import ITEM_REGISTRY, ItemRef, ItemRegistry, intern_player_items
+from engine.node_engine import NodeEngine
+from engine.rules import RulesEngine
+from engine.save_format import ItemCatalog, decode_save, encode_save
+from engine.stats import json_default
+
+
+ITEMS = [
+    {"id": "sword_01", "name": "Iron Sword", "type": "weapon", "effect": {"strength": 5}, "description": "A blade."},
+    {"id": "herb_healing", "name": "Healing Herb", "type": "consumable", "effect": {"hp": 15}}
+]
+
+NODES = {
+    "camp": {"choices": [
+        # Same as the items.json herb minus its id: an alias
+        {"label": "Forage", "effects": {"items": [{"name": "Healing Herb", "type": "consumable", "effect": {"hp": 15}}]}},
+        # Same name, weaker effect: a variant of its own
+        {"label": "Scrape", "effects": {"items": [{"name": "Healing Herb", "type": "consumable", "effect": {"hp": 10}}]}},
+        {"label": "Dig", "effects": {"items": [{"name": "Odd Stone", "type": "material"}]}}
+    ]}
+}
+
+
+class TestItemRegistry(unittest.TestCase):
+    """Test cases for ItemRegistry."""
+
+    def setUp(self):
+        """Set up a registry loaded from all three item sources."""
+        self.registry = ItemRegistry()
+        self.registry.load_content(ITEMS, NODES)
+
+    def test_merges_all_sources(self):
+        """Test items.json, consumables and node items land in one registry."""
+        self.assertEqual(self.registry.get("sword_01")["name"], "Iron Sword")
+        self.assertEqual(self.registry.by_name("Healing Potion")["effect"], {"hp": 30})
+        self.assertEqual(self.registry.get("healing_potion").id, "healing_potion")
+        self.assertEqual(self.registry.by_name("Odd Stone").id, "odd_stone")
+        self.assertEqual(len(self.registry), len(ITEMS) + len(CONSUMABLES) + 2)
+
+    def test_inline_items_alias_or_vary(self):
+        """Test an inline item matching a definition aliases it; a differing one gets its own ID."""
+        forage, scrape, _ = (choice["effects"]["items"][0] for choice in NODES["camp"]["choices"])
+        self.assertIs(self.registry.intern(forage), self.registry.get("herb_healing"))
+
+        variant = self.registry.intern(scrape)
+        self.assertIsInstance(variant, ItemRef)
+        self.assertEqual(variant.id, "healing_herb")
+        self.assertEqual(variant["effect"]["hp"], 10)
+        # A further variant whose name-derived ID is taken gets a content-hashed one
+        weaker = self.registry.add_inline({"name": "Healing Herb", "effect": {"hp": 5}})
+        self.assertTrue(weaker.id.startswith("healing_herb_"))
+        # Name lookups keep the first (items.json) definition
+        self.assertIs(self.registry.by_name("Healing Herb"), self.registry.get("herb_healing"))
+
+    def test_interned_items_are_shared_and_immutable(self):
+        """Test every player holding an item shares one read-only ref."""
+        players = [{"inventory": copy.deepcopy(ITEMS), "equipment": {"weapon": dict(ITEMS[0]), "armor": None}}
+                   for _ in range(3)]
+        for player in players:
+            intern_player_items(player, self.registry)
+        self.assertIs(players[0]["inventory"][0], players[2]["equipment"]["weapon"])
+        self.assertIs(copy.deepcopy(players[1])["inventory"][1], players[0]["inventory"][1])
+        self.assertEqual(players[0]["inventory"], ITEMS)
+        self.assertIsNone(players[0]["equipment"]["armor"])
+        with self.assertRaises(TypeError):
+            players[0]["inventory"][0]["effect"]["strength"] = 99
+
+        # Unknown or edited instances stay private, mutable dicts
+        odd = dict(ITEMS[0], name="Iron Sword +1")
+        self.assertNotIsInstance(self.registry.intern(odd), ItemRef)
+
+    def test_node_engine_grants_shared_refs(self):
+        """Test items granted by choices are the registry's ref, shared and read-only."""
+        store = ContentStore(NODES, enemies=[], items=ITEMS)
+        settings = {
+            "scaling": {"hp_per_point": 5, "mp_per_point": 5, "other_stats_per_point": 1},
+            "experience": {"exp_per_node": 10, "level_up_threshold": 100, "threshold_increase_per_level": 50},
+            "player": {"level_up_points": 2}
+        }
+        engine = NodeEngine(store.nodes, RulesEngine(settings), item_registry=self.registry)
+        inventory, other = [], []
+        engine.process_choice({}, {}, inventory, "camp", 0)
+        engine.process_choice({}, {}, other, "camp", 0)
+        self.assertIs(inventory[0], other[0])
+        self.assertIs(inventory[0], self.registry.get("herb_healing"))
+        with self.assertRaises(TypeError):
+            inventory[0]["effect"]["hp"] = 0
+        self.assertEqual(store.nodes["camp"]["choices"][0]["effects"]["items"][0]["effect"]["hp"], 15)
+
+    def test_building_content_does_not_register_items(self):
+        """Test only installing content (not constructing a store) touches the global registry."""
+        size = len(ITEM_REGISTRY)
+        ContentStore({"n": {"choices": [{"effects": {"items": [{"name": "Unlisted Relic"}]}}]}},
+                     enemies=[], items=[{"id": "relic_99", "name": "Unlisted Relic"}])
+        self.assertEqual(len(ITEM_REGISTRY), size)
+        self.assertIsNone(ITEM_REGISTRY.get("relic_99"))
+
+    def test_equality_does_not_copy(self):
+        """Test refs compare by content against refs, dicts and frozen mappings."""
+        ref = self.registry.get("sword_01")
+        self.assertEqual(ref, ITEMS[0])
+        self.assertNotEqual(ref, dict(ITEMS[0], name="Iron Sword +1"))
+        self.assertEqual(ref, ItemRef("sword_01", ITEMS[0]))
+        self.assertNotEqual(ref, ItemRef("sword_02", ITEMS[0]))
+        self.assertEqual(ref, ContentStore({}, enemies=[], items=ITEMS).items["sword_01"])
+        self.assertEqual([ITEMS[1], ref].index(ref), 1)
+
+    def test_refs_serialise_like_dicts(self):
+        """Test refs dump to JSON, pickle and encode into saves as their definition."""
+        ref = self.registry.get("sword_01")
+        self.assertEqual(json.loads(json.dumps(ref, default=json_default)), ITEMS[0])
+        self.assertEqual(pickle.loads(pickle.dumps(ref)), ref)
+
+        state = {"stats": {"hp": 5}, "inventory": [ref, self.registry.get("healing_potion")]}
+        catalog = ItemCatalog(ITEMS)
+        data = encode_save(state, catalog)
+        self.assertIn(b'"sword_01"', data)
+        decoded = decode_save(data, catalog)
+        intern_player_items(decoded, self.registry)
+        self.assertIs(decoded["inventory"][0], ref)
+        self.assertIs(decoded["inventory"][1], self.registry.get("healing_potion"))
+
+
+if __name__ == "__main__":
+    unittest.main()
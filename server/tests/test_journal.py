@@ -0,0 +1,130 @@
+"""
+Test suite for journaled persistence.
+Tests delta appends, replay, compaction and crash recovery.
+"""
+
+import json
+import unittest
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from engine.journal import SNAPSHOT_SEQ_KEY, journal_path
+from tests.persistence_case import PersistenceTestCase
+
+
+class TestJournalPersistence(PersistenceTestCase):
+    """Test cases for the "journal" persistence mode."""
+
+    template = {
+        "stats": {"hp": 50, "free_stat_points": 5},
+        "inventory": [{"name": "Herb", "type": "consumable"}],
+        "flags": {},
+        "current_node": "intro_01"
+    }
+    persistence = {"mode": "journal", "snapshot_every": 5}
+
+    def setUp(self):
+        """Set up a journaled state manager and the path of player p1's save."""
+        super().setUp()
+        self.path = self.state_manager.get_player_state_path("p1")
+
+    def _records(self):
+        with open(journal_path(self.path)) as f:
+            return [json.loads(line) for line in f]
+
+    def test_saves_append_only_changes(self):
+        """Test a save appends a small delta and leaves the snapshot alone."""
+        state = self.state_manager.load_player_state("p1")
+        snapshot = self.path.read_bytes()
+
+        state["flags"]["met_elder"] = True
+        state["current_node"] = "village_square"
+        self.state_manager.save_player_state(state, "p1", event="choice")
+        self.state_manager.save_player_state(state, "p1", event="evict")  # No change, no record
+
+        self.assertEqual(self.path.read_bytes(), snapshot)
+        records = self._records()
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0]["seq"], 1)
+        self.assertEqual(records[0]["event"], "choice")
+        self.assertEqual(sorted(op["path"] for op in records[0]["ops"]), ["/current_node", "/flags/met_elder"])
+
+        # A new process replays the journal
+        reloaded = self._make_state_manager().load_player_state("p1")
+        self.assertEqual(reloaded["current_node"], "village_square")
+        self.assertTrue(reloaded["flags"]["met_elder"])
+        self.assertNotIn(SNAPSHOT_SEQ_KEY, reloaded)
+
+    def test_compaction_bounds_the_journal(self):
+        """Test a snapshot replaces the journal every snapshot_every records."""
+        state = self.state_manager.load_player_state("p1")
+        for hp in range(49, 42, -1):
+            state["stats"]["hp"] = hp
+            self.state_manager.save_player_state(state, "p1", event="combat")
+
+        # 7 records: compacted after the 5th, 2 left in the journal
+        with open(self.path) as f:
+            self.assertEqual(json.load(f)[SNAPSHOT_SEQ_KEY], 5)
+        self.assertEqual([record["seq"] for record in self._records()], [6, 7])
+        self.assertEqual(self._make_state_manager().load_player_state("p1")["stats"]["hp"], 43)
+
+    def test_recovers_from_torn_append(self):
+        """Test a half-written last record is dropped on load."""
+        state = self.state_manager.load_player_state("p1")
+        state["stats"]["hp"] = 40
+        self.state_manager.save_player_state(state, "p1", event="combat")
+        with open(journal_path(self.path), "ab") as f:
+            f.write(b'{"seq":2,"ts":0,"event":"combat","ops":[{"op":"repl')
+
+        state_manager = self._make_state_manager()
+        reloaded = state_manager.load_player_state("p1")
+        self.assertEqual(reloaded["stats"]["hp"], 40)
+
+        # Appends continue cleanly after the truncated tail
+        reloaded["stats"]["hp"] = 35
+        state_manager.save_player_state(reloaded, "p1", event="combat")
+        self.assertEqual([record["seq"] for record in self._records()], [1, 2])
+        self.assertEqual(self._make_state_manager().load_player_state("p1")["stats"]["hp"], 35)
+
+    def test_skips_records_already_in_snapshot(self):
+        """Test a crash between snapshot and truncation does not replay twice."""
+        state = self.state_manager.load_player_state("p1")
+        state["inventory"].append({"name": "Sword", "type": "weapon"})
+        self.state_manager.save_player_state(state, "p1", event="choice")
+        stale_journal = journal_path(self.path).read_bytes()
+
+        self.state_manager.journal.compact(self.path)
+        journal_path(self.path).write_bytes(stale_journal)
+
+        reloaded = self._make_state_manager().load_player_state("p1")
+        self.assertEqual([item["name"] for item in reloaded["inventory"]], ["Herb", "Sword"])
+
+    def test_other_modes_fold_a_leftover_journal(self):
+        """Test switching away from journal mode keeps journaled changes."""
+        state = self.state_manager.load_player_state("p1")
+        state["current_node"] = "forest_entry"
+        self.state_manager.save_player_state(state, "p1", event="choice")
+
+        self.settings["persistence"] = {"mode": "immediate"}
+        reloaded = self._make_state_manager().load_player_state("p1")
+        self.assertEqual(reloaded["current_node"], "forest_entry")
+        self.assertFalse(journal_path(self.path).exists())
+        with open(self.path) as f:
+            self.assertNotIn(SNAPSHOT_SEQ_KEY, json.load(f))
+
+    def test_delete_removes_journal(self):
+        """Test deleting a save also drops its journal."""
+        state = self.state_manager.load_player_state("p1")
+        state["stats"]["hp"] = 1
+        self.state_manager.save_player_state(state, "p1")
+        self.state_manager.delete_player_state("p1")
+
+        self.assertFalse(journal_path(self.path).exists())
+        self.assertEqual(self.state_manager.load_player_state("p1")["stats"]["hp"], 50)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+"""
+Test suite for JSON Patch helpers.
+Tests diffing display states and applying the resulting ops.
+"""
+
+import unittest
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from engine.json_patch import diff, apply_patch
+
+
+class TestJsonPatch(unittest.TestCase):
+    """Test cases for diff and apply_patch."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.state = {
+            "mode": "STORY",
+            "player": {
+                "stats": {"hp": 50, "strength": 5},
+                "inventory": [{"name": "Potion"}, {"name": "Rope"}],
+                "flags": {"met_elder": True}
+            },
+            "narrative": {"node_id": "intro_01", "text": "You wake up."},
+            "combat": None
+        }
+
+    def _round_trip(self, new):
+        ops = diff(self.state, new)
+        self.assertEqual(apply_patch(self.state, ops), new)
+        return ops
+
+    def test_unchanged_state_has_no_ops(self):
+        """Test identical states produce an empty patch."""
+        self.assertEqual(diff(self.state, apply_patch(self.state, [])), [])
+
+    def test_scalar_change_is_single_replace(self):
+        """Test only the changed leaf is sent."""
+        new = apply_patch(self.state, [])
+        new["player"]["stats"]["hp"] = 42
+        ops = self._round_trip(new)
+        self.assertEqual(ops, [{"op": "replace", "path": "/player/stats/hp", "value": 42}])
+
+    def test_list_growth_and_shrink(self):
+        """Test items appended to and removed from lists."""
+        grown = apply_patch(self.state, [])
+        grown["player"]["inventory"].append({"name": "Sword"})
+        self.assertEqual(self._round_trip(grown),
+                         [{"op": "add", "path": "/player/inventory/2", "value": {"name": "Sword"}}])
+
+        shrunk = apply_patch(self.state, [])
+        shrunk["player"]["inventory"] = []
+        self.assertEqual(len(self._round_trip(shrunk)), 2)
+
+    def test_keys_added_and_removed(self):
+        """Test dict keys appearing, disappearing and changing type."""
+        new = apply_patch(self.state, [])
+        del new["player"]["flags"]["met_elder"]
+        new["player"]["flags"]["a/b~c"] = 1
+        new["combat"] = {"enemy": {"name": "Wolf", "hp": 30}, "log": []}
+        self._round_trip(new)
+
+    def test_bool_and_int_are_distinct(self):
+        """Test True -> 1 is still reported as a change."""
+        self.assertEqual(len(diff({"flag": True}, {"flag": 1})), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
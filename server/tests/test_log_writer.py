@@ -0,0 +1,99 @@
+"""
+Test suite for BufferedLogWriter.
+Tests buffering, explicit flushes and size-based rotation.
+"""
+
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from unittest import mock
+
+from engine.log_writer import BufferedLogWriter
+
+
+class TestBufferedLogWriter(unittest.TestCase):
+    """Test cases for BufferedLogWriter."""
+
+    def setUp(self):
+        """Set up a temp log directory."""
+        self.root = Path(tempfile.mkdtemp())
+        self.path = self.root / "logs" / "client.log"
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def test_lines_are_buffered_until_flush(self):
+        """Test writes stay in memory until flushed."""
+        writer = BufferedLogWriter(self.path, flush_interval=3600)
+        writer.write(["one\n", "two\n"])
+        self.assertFalse(self.path.exists())
+
+        writer.flush()
+        self.assertEqual(self.path.read_text(), "one\ntwo\n")
+        writer.close()
+
+    def test_close_flushes(self):
+        """Test closing writes out the remaining buffer."""
+        writer = BufferedLogWriter(self.path, flush_interval=3600)
+        writer.write(["last\n"])
+        writer.close()
+        self.assertEqual(self.path.read_text(), "last\n")
+
+    def test_full_buffer_triggers_flush(self):
+        """Test reaching the buffer limit wakes the flusher early."""
+        writer = BufferedLogWriter(self.path, flush_interval=3600, max_buffered_lines=2)
+        writer.write(["a\n", "b\n"])
+        deadline = time.monotonic() + 2
+        while not self.path.exists() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(self.path.read_text(), "a\nb\n")
+        writer.close()
+
+    def test_failed_flush_keeps_lines(self):
+        """Test lines survive a failed write and go out, in order, with the next flush."""
+        writer = BufferedLogWriter(self.path, flush_interval=3600)
+        writer.write(["one\n"])
+        with mock.patch("engine.log_writer.open", side_effect=OSError("disk full"), create=True):
+            with self.assertRaises(OSError):
+                writer.flush()
+        writer.write(["two\n"])
+        writer.flush()
+        self.assertEqual(self.path.read_text(), "one\ntwo\n")
+        writer.close()
+
+    def test_background_flush_failures_are_logged(self):
+        """Test the flusher thread reports write errors through the module logger."""
+        writer = BufferedLogWriter(self.path, flush_interval=3600, max_buffered_lines=1)
+        logged = threading.Event()
+        with mock.patch("engine.log_writer.open", side_effect=OSError("disk full"), create=True), \
+                mock.patch("engine.log_writer.logger") as logger:
+            logger.warning.side_effect = lambda *args, **kwargs: logged.set()
+            writer.write(["one\n"])
+            self.assertTrue(logged.wait(5))
+        writer.close()
+        self.assertEqual(self.path.read_text(), "one\n")
+
+    def test_rotation(self):
+        """Test the file rotates past max_bytes and keeps backup_count files."""
+        writer = BufferedLogWriter(self.path, flush_interval=3600, max_bytes=10, backup_count=2)
+        for line in ("aaaaaaaa\n", "bbbbbbbb\n", "cccccccc\n", "dddddddd\n"):
+            writer.write([line])
+            writer.flush()
+        writer.close()
+
+        self.assertEqual(self.path.read_text(), "dddddddd\n")
+        self.assertEqual(self.path.with_name("client.log.1").read_text(), "cccccccc\n")
+        self.assertEqual(self.path.with_name("client.log.2").read_text(), "bbbbbbbb\n")
+        self.assertFalse(self.path.with_name("client.log.3").exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+"""
+Test suite for the node graph build.
+Tests zone merging, link validation and the shipped content.
+"""
+
+import json
+import tempfile
+import unittest
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from engine.node_graph import ContentValidationError, build_node_graph, load_node_graph
+
+
+def node(*choices):
+    return {"text": "...", "choices": list(choices)}
+
+
+class TestNodeGraph(unittest.TestCase):
+    """Test cases for build_node_graph and load_node_graph."""
+
+    def test_zones_merge_into_one_graph(self):
+        """Test links across zone files resolve and are indexed."""
+        graph = build_node_graph([
+            (Path("nodes.json"), {"start": node({"label": "Go", "next": "square"},
+                                                {"label": "Fight", "next": "start", "effects": {"combat": "rat_01"}})}),
+            (Path("zone_village.json"), {"square": node({"label": "Back", "next": "start"})})
+        ], enemy_ids={"rat_01"})
+        self.assertEqual(set(graph.nodes), {"start", "square"})
+        self.assertEqual(graph.sources["square"], "zone_village.json")
+        self.assertEqual(graph.edges["start"], ("square", "start"))
+        self.assertEqual(graph.combats["start"], ("rat_01",))
+
+    def test_every_problem_is_reported(self):
+        """Test duplicates, dangling next and unknown enemies fail together."""
+        with self.assertRaises(ContentValidationError) as ctx:
+            build_node_graph([
+                (Path("a.json"), {"start": node({"label": "Go", "next": "nowhere"})}),
+                (Path("b.json"), {"start": node(),
+                                  "cave": node({"label": "Fight", "effects": {"combat": "dragon_01"}},
+                                               {"label": "Brawl", "effects": {"combat": "random"}})})
+            ], enemy_ids={"rat_01"})
+        problems = ctx.exception.problems
+        self.assertEqual(len(problems), 3)
+        self.assertIn("duplicate node 'start'", problems[0])
+
+    def test_loads_directory_of_zones(self):
+        """Test a directory is loaded as every *.json file in it."""
+        with tempfile.TemporaryDirectory() as tmp:
+            for name, zone in [("nodes.json", {"start": node({"label": "Go", "next": "edge"})}),
+                               ("zone_forest.json", {"edge": node({"label": "Back", "next": "start"})})]:
+                with open(Path(tmp) / name, "w") as f:
+                    json.dump(zone, f)
+            self.assertEqual(set(load_node_graph(Path(tmp)).nodes), {"start", "edge"})
+
+    def test_shipped_content_is_valid(self):
+        """Test the game's own nodes load with no broken links."""
+        data = Path(__file__).parent.parent / "data"
+        with open(data / "enemies.json") as f:
+            enemy_ids = {enemy["id"] for enemy in json.load(f)}
+        graph = load_node_graph(data / "nodes", enemy_ids)
+        self.assertIn("intro_01", graph.nodes)
+        self.assertIn("village_square", graph.nodes)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -265,6 +265,36 @@ class TestNodeRequirements(unittest.TestCase):
             requirements
         )
         self.assertFalse(result)
+    
+    def test_available_choices_use_compiled_requirements(self):
+        """Test choices are filtered by requirements compiled at load."""
+        from engine.node_engine import NodeEngine
+        
+        nodes = {
+            "hall": {
+                "text": "A hall.",
+                "choices": [
+                    {"label": "Open", "requirements": {"items": ["sword"], "flags": {"key_found": True}}},
+                    {"label": "Lift", "requirements": {"stats": {"strength": 20}}},
+                    {"label": "Leave"}
+                ]
+            }
+        }
+        node_engine = NodeEngine(nodes, self.rules_engine)
+        self.assertEqual(len(node_engine.get_choice_requirements("hall")), 3)
+        
+        _, choices = node_engine.get_available_choices(
+            self.player_stats,
+            self.player_flags,
+            self.inventory,
+            "hall"
+        )
+        self.assertEqual([choice["_index"] for choice in choices], [0, 2])
+        self.assertEqual(node_engine.get_available_choice_indices(
+            self.player_stats, self.player_flags, self.inventory, "hall"), [0, 2])
+        
+        result = node_engine.process_choice(self.player_stats, self.player_flags, self.inventory, "hall", 1)
+        self.assertFalse(result.success)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,179 @@
+"""
+Test suite for the binary save format.
+Tests lossless round trips, item references, versioning and StateManager integration.
+"""
+
+import copy
+import json
+import unittest
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from engine import save_format
+from engine.flags import FlagSet
+from engine.inventory import Inventory
+from engine.item_registry import ITEM_REGISTRY, ItemRegistry, intern_player_items
+from engine.save_format import (FORMAT_VERSION, HEADER, MAGIC, ItemCatalog, SaveFormatError,
+                                decode_save, encode_save, export_json)
+from engine.stats import StatBlock, json_default
+from tests.persistence_case import PersistenceTestCase
+
+
+ITEMS = [
+    {"id": "sword_01", "name": "Iron Sword", "type": "weapon", "effect": {"strength": 5}, "description": "A blade."},
+    {"id": "herb_healing", "name": "Healing Herb", "type": "consumable", "effect": {"hp": 15}}
+]
+
+
+class TestSaveFormat(unittest.TestCase):
+    """Test cases for encode_save / decode_save."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.catalog = ItemCatalog(ITEMS)
+        sword, herb = copy.deepcopy(ITEMS)
+        enchanted = dict(copy.deepcopy(ITEMS[0]), effect={"strength": 7}, name="Iron Sword +2")
+        bare_herb = {key: value for key, value in ITEMS[1].items() if key != "id"}
+        self.state = {
+            "stats": StatBlock({"level": 3, "hp": 42, "strength": 9, "blessing": "sun", "max_hp": 2 ** 40}),
+            "inventory": Inventory([herb, herb.copy(), enchanted, bare_herb, {"name": "Odd Stone", "type": "material"}]),
+            "equipment": {"weapon": sword, "armor": None, "accessory": None},
+            "flags": FlagSet({"met_elder": True, "gate_open": False}),
+            "current_node": "village_square"
+        }
+        self.plain = json.loads(json.dumps(self.state, default=json_default))
+
+    def test_round_trip_is_lossless(self):
+        """Test decoding reproduces the state exactly."""
+        data = encode_save(self.state, self.catalog)
+        self.assertEqual(data[:len(MAGIC)], MAGIC)
+        self.assertEqual(decode_save(data, self.catalog), self.plain)
+
+    def test_items_are_stored_as_references(self):
+        """Test catalog items shrink to a reference plus overrides."""
+        inventory = [self.catalog.encode(item) for item in self.state["inventory"]]
+        self.assertEqual(inventory[0], "herb_healing")
+        self.assertEqual(inventory[2], ["sword_01", {"name": "Iron Sword +2", "effect": {"strength": 7}}])
+        # Matched by name; the missing "id" is recorded as removed
+        self.assertEqual(inventory[3], ["herb_healing", {}, ["id"]])
+        self.assertEqual(inventory[4], {"name": "Odd Stone", "type": "material"})
+
+        pretty = json.dumps(self.state, indent=2, default=json_default).encode("utf-8")
+        self.assertLess(len(encode_save(self.state, self.catalog)) * 2, len(pretty))
+
+    def test_registered_items_are_stored_as_references(self):
+        """Test node-granted and consumable items in the item registry encode as their registry ID."""
+        bow = {"name": "Wooden Bow", "type": "weapon", "effect": {"agility": 2}}
+        registry = ItemRegistry()
+        registry.load_content(ITEMS, {"camp": {"choices": [{"effects": {"items": [bow]}}]}})
+        catalog = ItemCatalog(ITEMS, registry=registry)
+        bow_ref, potion = registry.by_name("Wooden Bow"), registry.get("healing_potion")
+        state = {"stats": {"hp": 5}, "inventory": [bow_ref, potion, dict(bow, effect={"agility": 3})]}
+
+        data = encode_save(state, catalog)
+        body = json.loads(data[HEADER.size + 8:].decode("utf-8"))
+        self.assertEqual(body["inventory"], ["wooden_bow", "healing_potion",
+                                             ["wooden_bow", {"effect": {"agility": 3}}]])
+
+        decoded = decode_save(data, catalog)
+        intern_player_items(decoded, registry)
+        self.assertIs(decoded["inventory"][0], bow_ref)
+        self.assertIs(decoded["inventory"][1], potion)
+        self.assertEqual(decoded["inventory"][2], dict(bow, effect={"agility": 3}))
+
+    def test_removed_item_definition_still_loads(self):
+        """Test a reference to an item no longer in the content decodes to a placeholder."""
+        data = encode_save(self.state, self.catalog)
+        state = decode_save(data, ItemCatalog(ITEMS[1:]))
+        self.assertEqual(state["equipment"]["weapon"], {"id": "sword_01", "name": "sword_01"})
+
+    def test_reads_json_saves_and_runs_migrations(self):
+        """Test plain JSON saves are version 0 and migrate forward."""
+        calls = []
+
+        @save_format.migration(0)
+        def add_reputation(state):
+            calls.append(state["current_node"])
+            state["reputation"] = 0
+            return state
+
+        try:
+            state = decode_save(json.dumps(self.plain).encode("utf-8"), self.catalog)
+        finally:
+            del save_format._MIGRATIONS[0]
+        self.assertEqual(calls, ["village_square"])
+        self.assertEqual(state, dict(self.plain, reputation=0))
+
+    def test_rejects_bad_data(self):
+        """Test unknown versions, truncation and garbage raise SaveFormatError."""
+        data = encode_save(self.state, self.catalog)
+        future = HEADER.pack(MAGIC, FORMAT_VERSION + 1, 0) + data[HEADER.size:]
+        for bad in (future, data[:HEADER.size + 4], b"\x00garbage", MAGIC):
+            with self.assertRaises(SaveFormatError):
+                decode_save(bad, self.catalog)
+
+    def test_export_json(self):
+        """Test the debug export is readable JSON of the decoded save."""
+        data = encode_save(self.state, self.catalog)
+        self.assertEqual(json.loads(export_json(data, self.catalog)), self.plain)
+
+
+class TestBinarySaves(PersistenceTestCase):
+    """Test cases for StateManager with persistence.format "binary"."""
+
+    persistence = {"mode": "immediate", "format": "binary"}
+
+    def setUp(self):
+        """Set up a binary-format state manager with items to reference."""
+        super().setUp()
+        with open(self.root / "data" / "items.json", "w") as f:
+            json.dump(ITEMS, f)
+
+    def test_saves_binary_files(self):
+        """Test saves are written as .sav files and read back."""
+        state = self.state_manager.load_player_state("p1")
+        state["inventory"].append(copy.deepcopy(ITEMS[0]))
+        self.state_manager.save_player_state(state, "p1")
+
+        path = self.state_manager.get_player_state_path("p1")
+        self.assertEqual(path.suffix, ".sav")
+        self.assertEqual(path.read_bytes()[:len(MAGIC)], MAGIC)
+        reloaded = self._make_state_manager().load_player_state("p1")
+        self.assertEqual(reloaded["inventory"], [ITEMS[0]])
+        self.assertIs(self.state_manager.item_catalog.registry, ITEM_REGISTRY)
+
+    def test_converts_json_saves(self):
+        """Test an existing JSON save is rewritten in the binary format on load."""
+        json_path = self.state_manager.get_player_state_path("p1").with_suffix(".json")
+        json_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(json_path, "w") as f:
+            json.dump(dict(self.template, current_node="forest_entry"), f, indent=2)
+
+        self.assertEqual(self.state_manager.load_player_state("p1")["current_node"], "forest_entry")
+        self.assertFalse(json_path.exists())
+        self.assertTrue(json_path.with_suffix(".sav").exists())
+
+        # A reset must not bring the old save back
+        self.state_manager.delete_player_state("p1")
+        self.assertEqual(self.state_manager.load_player_state("p1")["current_node"], "intro_01")
+
+    def test_journal_snapshots_use_binary_format(self):
+        """Test journal mode writes binary snapshots and replays onto them."""
+        self.settings["persistence"] = {"mode": "journal", "format": "binary", "snapshot_every": 2}
+        state_manager = self._make_state_manager()
+        try:
+            state = state_manager.load_player_state("p2")
+            for hp in (40, 30, 20):
+                state["stats"]["hp"] = hp
+                state_manager.save_player_state(state, "p2", event="combat")
+            self.assertEqual(state_manager.get_player_state_path("p2").read_bytes()[:len(MAGIC)], MAGIC)
+            self.assertEqual(self._make_state_manager().load_player_state("p2")["stats"]["hp"], 20)
+        finally:
+            state_manager.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,147 @@
+"""
+Test suite for the SQLite save store.
+Tests per-player saves, importing file saves, cohort queries and pooled concurrent writes.
+"""
+
+import json
+import sqlite3
+import threading
+import unittest
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from engine.flags import FlagSet
+from engine.save_store import SaveStore
+from tests.persistence_case import PersistenceTestCase
+
+
+class TestSqliteSaveStore(PersistenceTestCase):
+    """Test cases for the "sqlite" save backend."""
+
+    template = {
+        "stats": {"level": 1, "hp": 50},
+        "inventory": [{"name": "Herb", "type": "consumable"}],
+        "flags": {},
+        "equipment": {"weapon": None, "armor": None, "accessory": None},
+        "current_node": "intro_01"
+    }
+    persistence = {"backend": "sqlite", "pool_size": 3}
+    paths = {"save_database": "data/player/saves.db"}
+
+    def setUp(self):
+        """Set up a state manager backed by a SQLite save store."""
+        super().setUp()
+        self.store = self.state_manager.save_store
+
+    def _play(self, player_id, node_id, **flags):
+        state = self.state_manager.load_player_state(player_id)
+        state["current_node"] = node_id
+        state["flags"].update(flags)
+        self.state_manager.save_player_state(state, player_id, event="choice")
+        return state
+
+    def test_saves_are_per_player(self):
+        """Test players get separate saves that survive a restart."""
+        self._play("p1", "village_square", met_elder=True)
+        self._play("p2", "forest_entry")
+        self._play(None, "death")
+
+        state_manager = self._make_state_manager()
+        try:
+            p1 = state_manager.load_player_state("p1")
+            self.assertEqual(p1["current_node"], "village_square")
+            self.assertIsInstance(p1["flags"], FlagSet)
+            self.assertTrue(p1["flags"]["met_elder"])
+            self.assertEqual(p1["equipment"], self.template["equipment"])
+            self.assertEqual(state_manager.load_player_state("p2")["current_node"], "forest_entry")
+            self.assertEqual(state_manager.load_player_state(None)["current_node"], "death")
+        finally:
+            state_manager.close()
+
+        # No JSON save files are written
+        self.assertEqual(list((self.root / "data" / "player").glob("**/*.json")),
+                         [self.root / "data" / "player" / "player_template.json"])
+
+    def test_delete_starts_over_from_template(self):
+        """Test deleting a save (as /reset does) only affects that player."""
+        self._play("p1", "village_square")
+        self._play("p2", "forest_entry")
+        self.state_manager.delete_player_state("p1")
+
+        self.assertEqual(self.state_manager.load_player_state("p1")["current_node"], "intro_01")
+        self.assertEqual(self.state_manager.load_player_state("p2")["current_node"], "forest_entry")
+
+    def test_imports_file_saves(self):
+        """Test an existing JSON save is moved into the store on first load."""
+        path = self.state_manager.get_player_state_path("veteran")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump({**self.template, "current_node": "ending_peace"}, f)
+
+        self.assertEqual(self.state_manager.load_player_state("veteran")["current_node"], "ending_peace")
+        self.assertEqual(self.store.players_at_node("ending_peace"), ["veteran"])
+
+    def test_cohort_queries(self):
+        """Test querying saves by node and flag without loading them."""
+        self._play("a", "cave_gate", has_torch=True)
+        self._play("b", "cave_gate", has_torch=False)
+        self._play("c", "village_square", has_torch=True)
+
+        self.assertEqual(self.store.players_at_node("cave_gate"), ["a", "b"])
+        self.assertEqual(self.store.players_with_flag("has_torch"), ["a", "c"])
+        self.assertEqual(self.store.players_with_flag("has_torch", False), ["b"])
+        self.assertEqual(self.store.node_counts(), {"cave_gate": 2, "village_square": 1})
+
+        with sqlite3.connect(str(self.store.path)) as connection:
+            self.assertEqual(connection.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+
+    def test_flag_names_are_not_parsed_as_paths(self):
+        """Test flag names with quotes or dots are matched literally."""
+        self._play("a", "cave_gate", **{'said "yes"': True, "gate.open": True})
+        self._play("b", "cave_gate", gate=True)
+        self.assertEqual(self.store.players_with_flag('said "yes"'), ["a"])
+        self.assertEqual(self.store.players_with_flag("gate.open"), ["a"])
+        self.assertEqual(self.store.players_with_flag("gate"), ["b"])
+        self.assertEqual(self.store.players_with_flag('"'), [])
+
+    def test_save_store_is_abstract(self):
+        """Test backends must implement load, save and delete."""
+        with self.assertRaises(TypeError):
+            SaveStore()
+
+        class LoadOnly(SaveStore):
+            def load(self, player_id):
+                return None
+
+        with self.assertRaises(TypeError):
+            LoadOnly()
+
+    def test_concurrent_saves_share_the_pool(self):
+        """Test many threads saving at once through a small pool."""
+        errors = []
+
+        def play(player_id):
+            try:
+                state = self.state_manager.load_player_state(player_id)
+                for hp in range(50, 30, -1):
+                    state["stats"]["hp"] = hp
+                    self.state_manager.save_player_state(state, player_id, event="combat")
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=play, args=(f"p{i}",)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        for i in range(8):
+            self.assertEqual(self.store.load(f"p{i}")["stats"]["hp"], 31)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,331 @@
+"""
+Test suite for the HTTP and WebSocket API.
+Tests versioned state deltas, node ETags, WebSocket actions, combat logging and content reloads.
+"""
+
+import asyncio
+import json
+import shutil
+import tempfile
+import unittest
+import sys
+from pathlib import Path
+from unittest import mock
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+import server
+from engine.content_store import content_hash, get_content_store
+from engine.json_patch import apply_patch
+
+
+NODES = {
+    "intro_01": {"text": "You wake up.", "choices": [
+        {"label": "Get up", "effects": {"flags": {"awake": True}, "experience": 5}, "next": "square"},
+        {"label": "Lift the bed", "requirements": {"stats": {"strength": 99}}, "next": "square"}
+    ]},
+    "square": {"text": "A square.", "choices": [{"label": "Back", "next": "intro_01"}]}
+}
+
+
+class ServerTestCase(unittest.TestCase):
+    """Runs the app against a throwaway content root instead of the real game data."""
+
+    def setUp(self):
+        """Set up a content root, engines and a session registry for the app."""
+        self.root = Path(tempfile.mkdtemp())
+        (self.root / "config").mkdir()
+        (self.root / "data" / "player").mkdir(parents=True)
+        (self.root / "data" / "nodes").mkdir()
+        template = {"stats": {"hp": 50, "strength": 5, "free_stat_points": 2}, "inventory": [],
+                    "flags": {}, "current_node": "intro_01"}
+        self._write("data/player/player_template.json", template)
+        self._write("data/nodes/nodes.json", NODES)
+        self._write("data/enemies.json", [])
+        self._write("data/items.json", [])
+        self._write("config/settings.json", {
+            "scaling": {"hp_per_point": 5, "mp_per_point": 5, "other_stats_per_point": 1},
+            "experience": {"exp_per_node": 10, "level_up_threshold": 100, "threshold_increase_per_level": 50},
+            "player": {"level_up_points": 2},
+            "content": {"use_bundle": False},
+            "persistence": {"mode": "immediate"},
+            "paths": {
+                "player_state": "data/player/player_state.json",
+                "world_state": "data/world/world_state.json",
+                "nodes": "data/nodes"
+            }
+        })
+
+        self.engines = server.GameEngines(self.root / "config" / "settings.json")
+        self.sessions = server.create_session_registry(self.engines)
+        for name, value in (("engines", self.engines), ("sessions", self.sessions)):
+            patcher = mock.patch.object(server, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.client = TestClient(server.app)
+        self.headers = {"X-Session-Id": "tester"}
+
+    def tearDown(self):
+        self.engines.state_manager.close()
+        shutil.rmtree(self.root)
+
+    def _write(self, name, data):
+        with open(self.root / name, "w") as f:
+            json.dump(data, f)
+
+    def _state(self, **params):
+        response = self.client.get("/state", headers=self.headers, params=params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+
+class TestVersionedState(ServerTestCase):
+    """Test cases for versioned state and `since` deltas."""
+
+    def test_full_state_carries_version(self):
+        """Test plain requests get the whole state, and an unchanged state keeps its version."""
+        state = self._state()
+        self.assertEqual(state["mode"], "STORY")
+        self.assertEqual(state["narrative"]["node_id"], "intro_01")
+        self.assertEqual(self._state()["version"], state["version"])
+
+    def test_since_returns_patch_to_current_state(self):
+        """Test a known base version gets JSON-patch ops that rebuild the new state."""
+        base = self._state()
+        response = self.client.post("/choice", json={"choice_index": 0}, headers=self.headers,
+                                    params={"since": base["version"]})
+        self.assertEqual(response.status_code, 200)
+        delta = response.json()["new_state"]
+        self.assertEqual(delta["since"], base["version"])
+        self.assertGreater(delta["version"], base["version"])
+
+        current = self._state()
+        self.assertEqual(current["version"], delta["version"])
+        base.pop("version")
+        current.pop("version")
+        self.assertEqual(apply_patch(base, delta["ops"]), current)
+        self.assertEqual(current["narrative"]["node_id"], "square")
+
+    def test_unknown_since_falls_back_to_full_state(self):
+        """Test an unknown base version (evicted, aged out) gets the full state."""
+        version = self._state()["version"]
+        fallback = self._state(since=version - 1000)
+        self.assertEqual(set(fallback), {"version", "state"})
+        self.assertEqual(fallback["version"], version)
+        self.assertEqual(fallback["state"]["narrative"]["node_id"], "intro_01")
+
+    def test_failed_action_changes_nothing(self):
+        """Test a rejected choice returns an error and leaves the state version alone."""
+        version = self._state()["version"]
+        response = self.client.post("/choice", json={"choice_index": 1}, headers=self.headers)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self._state()["version"], version)
+
+
+class TestNodeContent(ServerTestCase):
+    """Test cases for /nodes/{node_id} caching."""
+
+    def test_if_none_match_returns_304(self):
+        """Test a matching ETag revalidates without a body."""
+        response = self.client.get("/nodes/intro_01")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["text"], "You wake up.")
+        etag = response.headers["etag"]
+        self.assertEqual(etag, f'"{self._state()["narrative"]["node_hash"]}"')
+        self.assertEqual(response.headers["cache-control"], "no-cache")
+
+        cached = self.client.get("/nodes/intro_01", headers={"If-None-Match": f"W/{etag}, \"other\""})
+        self.assertEqual(cached.status_code, 304)
+        self.assertEqual(cached.content, b"")
+        self.assertEqual(cached.headers["etag"], etag)
+
+        pinned = self.client.get("/nodes/intro_01", params={"v": etag.strip('"')})
+        self.assertIn("immutable", pinned.headers["cache-control"])
+        self.assertEqual(self.client.get("/nodes/nowhere").status_code, 404)
+
+    def test_etag_changes_with_node(self):
+        """Test editing a node changes its ETag, so cached copies stop matching."""
+        etag = self.client.get("/nodes/intro_01").headers["etag"]
+
+        nodes = json.loads(json.dumps(NODES))
+        nodes["intro_01"]["text"] = "You wake up again."
+        hashes = {node_id: content_hash(node) for node_id, node in nodes.items()}
+        self.engines.swap_content(self.engines.content.with_nodes(nodes, hashes))
+
+        response = self.client.get("/nodes/intro_01", headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["text"], "You wake up again.")
+        self.assertNotEqual(response.headers["etag"], etag)
+        self.assertEqual(response.headers["etag"], f'"{self._state()["narrative"]["node_hash"]}"')
+
+
+class TestWebSocket(ServerTestCase):
+    """Test cases for the /ws action channel."""
+
+    def _connect(self, session_id="tester"):
+        return self.client.websocket_connect(f"/ws?session_id={session_id}")
+
+    def test_actions_reply_with_state_deltas(self):
+        """Test actions share the HTTP handlers and reply with versioned state."""
+        with self._connect() as socket:
+            socket.send_json({"id": 1, "type": "state"})
+            reply = socket.receive_json()
+            self.assertEqual((reply["id"], reply["ok"]), (1, True))
+            version = reply["state"]["version"]
+
+            socket.send_json({"id": 2, "type": "choice", "since": version, "choice_index": 0})
+            reply = socket.receive_json()
+            self.assertTrue(reply["ok"])
+            self.assertEqual(reply["result"]["next_node"], "square")
+            self.assertEqual(reply["state"]["since"], version)
+            self.assertTrue(reply["state"]["ops"])
+
+            socket.send_json({"id": 3, "type": "allocate", "stat_name": "strength"})
+            reply = socket.receive_json()
+            self.assertEqual(reply["state"]["player"]["stats"]["strength"], 6)
+
+        # Same session as the HTTP API
+        self.assertEqual(self._state()["narrative"]["node_id"], "square")
+
+    def test_error_replies(self):
+        """Test bad messages get error replies and leave the connection open."""
+        with self._connect() as socket:
+            socket.send_text("not json")
+            self.assertEqual(socket.receive_json(), {"id": None, "ok": False, "status": 400, "error": "Invalid message"})
+
+            socket.send_json({"id": 1, "type": "teleport"})
+            reply = socket.receive_json()
+            self.assertEqual((reply["ok"], reply["status"]), (False, 400))
+
+            socket.send_json({"id": 2, "type": "choice", "choice_index": "first"})
+            reply = socket.receive_json()
+            self.assertEqual((reply["id"], reply["ok"], reply["status"]), (2, False, 422))
+
+            socket.send_json({"id": 3, "type": "choice", "choice_index": 1})
+            reply = socket.receive_json()
+            self.assertEqual((reply["ok"], reply["status"]), (False, 400))
+            self.assertEqual(reply["error"], "Choice requirements not met")
+
+            socket.send_json({"id": 4, "type": "combat_action", "action": "attack"})
+            self.assertEqual(socket.receive_json()["status"], 400)
+
+            socket.send_json({"id": 5, "type": "state"})
+            self.assertTrue(socket.receive_json()["ok"])
+
+    def test_invalid_session_id_is_refused(self):
+        """Test unsafe session IDs close the socket before it is accepted."""
+        with self.assertRaises(WebSocketDisconnect) as caught:
+            with self._connect("../player_state") as socket:
+                socket.receive_json()
+        self.assertEqual(caught.exception.code, 1008)
+
+
+class TestSaving(ServerTestCase):
+    """Test cases for persisting sessions from request handlers."""
+
+    def test_saves_run_off_the_event_loop(self):
+        """Test every action's save runs on the threadpool, never on the event loop."""
+        saves = []
+        save_player_state = self.engines.state_manager.save_player_state
+
+        def recording_save(state, player_id=None, event=None):
+            try:
+                asyncio.get_running_loop()
+                saves.append((event, "event loop"))
+            except RuntimeError:
+                saves.append((event, "threadpool"))
+            save_player_state(state, player_id, event=event)
+
+        with mock.patch.object(self.engines.state_manager, "save_player_state", recording_save):
+            self.client.post("/choice", json={"choice_index": 0}, headers=self.headers)
+            self.client.post("/allocate", json={"stat_name": "strength"}, headers=self.headers)
+            with self.client.websocket_connect("/ws?session_id=tester") as socket:
+                socket.send_json({"id": 1, "type": "choice", "choice_index": 0})
+                self.assertTrue(socket.receive_json()["ok"])
+
+        # None: the new save created from the template when the session first loads
+        self.assertEqual([event for event, _ in saves], [None, "choice", "allocate", "choice"])
+        self.assertEqual({where for _, where in saves}, {"threadpool"})
+        reloaded = self.engines.state_manager.load_player_state("tester")
+        self.assertEqual((reloaded["current_node"], reloaded["stats"]["strength"]), ("intro_01", 6))
+
+
+class TestSessionEviction(ServerTestCase):
+    """Test cases for the app's session LRU."""
+
+    def test_sessions_in_combat_are_not_evicted(self):
+        """Test a fight in progress survives eviction pressure, and the session is evictable once it ends."""
+        self.engines.state_manager.settings["server"] = {"max_sessions": 1}
+        sessions = server.create_session_registry(self.engines)
+        with mock.patch.object(server, "sessions", sessions), mock.patch.object(server, "combat_log"):
+            self.client.post("/debug/combat", headers=self.headers)
+            fight = sessions.peek("tester").current_combat
+            for other in ("other_1", "other_2"):
+                self.client.get("/state", headers={"X-Session-Id": other})
+            self.assertIs(sessions.peek("tester").current_combat, fight)
+            self.assertNotIn("other_1", sessions)
+
+            while sessions.peek("tester").in_combat:
+                response = self.client.post("/combat/action", json={"action": "attack"}, headers=self.headers)
+                self.assertEqual(response.status_code, 200)
+            self.client.get("/state", headers={"X-Session-Id": "other_3"})
+            self.assertNotIn("tester", sessions)
+
+
+class TestCombatLog(ServerTestCase):
+    """Test cases for the combat replay log."""
+
+    def test_logged_fight_replays_from_the_record_alone(self):
+        """Test a finished fight's log entry carries everything needed to replay it."""
+        combat_log = mock.Mock()
+        with mock.patch.object(server, "combat_log", combat_log):
+            # Starting stats differ from the template, so the record must carry them
+            self.client.post("/allocate", json={"stat_name": "strength"}, headers=self.headers)
+            self.client.post("/debug/combat", headers=self.headers)
+            for _ in range(50):
+                self.client.post("/combat/action", json={"action": "attack"}, headers=self.headers)
+                if combat_log.write.called:
+                    break
+
+        (lines,), _ = combat_log.write.call_args
+        record = json.loads(lines[0])
+        self.assertEqual(record["player"]["stats"]["strength"], 6)
+
+        fight = self.sessions.get("tester").current_combat
+        replayed = self.engines.combat_engine.replay(record)
+        self.assertEqual(replayed.victory, record["victory"])
+        self.assertEqual(replayed.log, fight.log)
+        self.assertEqual(replayed.enemy.hp, fight.enemy.hp)
+
+
+class TestContentReload(ServerTestCase):
+    """Test cases for swapping in hot-reloaded content."""
+
+    def _swap(self, nodes):
+        hashes = {node_id: content_hash(node) for node_id, node in nodes.items()}
+        self.engines.swap_content(self.engines.content.with_nodes(nodes, hashes))
+
+    def test_shared_store_follows_reload(self):
+        """Test get_content_store returns the reloaded content, not the startup one."""
+        self._swap({"intro_01": NODES["intro_01"], "square": NODES["square"], "well": {"text": "A well."}})
+        self.assertIs(get_content_store(self.engines.state_manager), self.engines.content)
+        self.assertIn("well", get_content_store(self.engines.state_manager).nodes)
+
+    def test_socket_players_leave_removed_nodes(self):
+        """Test a WebSocket player on a node removed by a reload is moved to the start."""
+        with self.client.websocket_connect("/ws?session_id=tester") as socket:
+            socket.send_json({"id": 1, "type": "choice", "choice_index": 0})
+            self.assertEqual(socket.receive_json()["state"]["narrative"]["node_id"], "square")
+
+            self._swap({"intro_01": {"text": "You wake up.", "choices": []}})
+            socket.send_json({"id": 2, "type": "state"})
+            self.assertEqual(socket.receive_json()["state"]["narrative"]["node_id"], "intro_01")
+
+
+if __name__ == "__main__":
+    unittest.main()
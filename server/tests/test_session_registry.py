@@ -0,0 +1,156 @@
+"""
+Test suite for SessionRegistry.
+Tests LRU eviction, lazy and concurrent loading, and session ID validation.
+"""
+
+import threading
+import unittest
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from engine.session_registry import SessionRegistry, is_valid_session_id
+
+
+class TestSessionRegistry(unittest.TestCase):
+    """Test cases for SessionRegistry."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.loaded = []
+        self.evicted = []
+        self.registry = SessionRegistry(
+            loader=self._load,
+            max_sessions=2,
+            on_evict=self.evicted.append
+        )
+
+    def _load(self, session_id):
+        self.loaded.append(session_id)
+        return {"id": session_id}
+
+    def test_get_loads_once(self):
+        """Test a resident session is not reloaded."""
+        first = self.registry.get("a")
+        second = self.registry.get("a")
+        self.assertIs(first, second)
+        self.assertEqual(self.loaded, ["a"])
+
+    def test_evicts_least_recently_used(self):
+        """Test the oldest untouched session is evicted at capacity."""
+        self.registry.get("a")
+        self.registry.get("b")
+        self.registry.get("a")  # "b" is now least recently used
+        self.registry.get("c")
+
+        self.assertEqual(len(self.registry), 2)
+        self.assertNotIn("b", self.registry)
+        self.assertEqual(self.evicted, [{"id": "b"}])
+
+    def test_evicted_session_rehydrates(self):
+        """Test an evicted session is loaded again on next access."""
+        self.registry.get("a")
+        self.registry.get("b")
+        self.registry.get("c")
+        self.registry.get("a")
+        self.assertEqual(self.loaded, ["a", "b", "c", "a"])
+
+    def test_busy_sessions_are_not_evicted(self):
+        """Test a session marked busy survives eviction."""
+        busy = set()
+        registry = SessionRegistry(loader=self._load, max_sessions=1,
+                                   on_evict=self.evicted.append,
+                                   is_busy=lambda session: session["id"] in busy)
+        registry.get("a")
+        busy.add("a")
+        registry.get("b")
+        self.assertIn("a", registry)
+        self.assertEqual(len(registry), 2)
+
+        busy.clear()
+        registry.get("c")
+        self.assertEqual(len(registry), 1)
+        self.assertIn("c", registry)
+
+    def test_pinned_sessions_survive_eviction(self):
+        """Test a session looked up for a request is not evicted before the request locks it."""
+        registry = SessionRegistry(loader=self._load, max_sessions=1, on_evict=self.evicted.append)
+        pinned = registry.get("a", pin=True)
+
+        # Other requests force eviction before "a"'s request gets to take its lock
+        registry.get("b")
+        registry.get("c")
+        self.assertIs(registry.get("a"), pinned)
+        self.assertEqual(self.loaded.count("a"), 1)
+        self.assertNotIn(pinned, self.evicted)
+
+        # Pins are counted; the last release makes it evictable again
+        registry.get("a", pin=True)
+        registry.release("a")
+        registry.get("d")
+        self.assertIn("a", registry)
+        registry.release("a")
+        registry.get("e")
+        self.assertNotIn("a", registry)
+        self.assertIn(pinned, self.evicted)
+
+    def test_slow_load_does_not_block_other_sessions(self):
+        """Test a load runs outside the registry lock and is shared by concurrent requests."""
+        release = threading.Event()
+        started = threading.Event()
+
+        def load(session_id):
+            if session_id == "slow":
+                started.set()
+                release.wait(5)
+            return self._load(session_id)
+
+        registry = SessionRegistry(loader=load, max_sessions=4)
+        results = []
+        waiters = [threading.Thread(target=lambda: results.append(registry.get("slow"))) for _ in range(2)]
+        for waiter in waiters:
+            waiter.start()
+        self.assertTrue(started.wait(5))
+
+        # Other sessions load while "slow" is still loading
+        self.assertEqual(registry.get("fast"), {"id": "fast"})
+        release.set()
+        for waiter in waiters:
+            waiter.join(5)
+        self.assertIs(results[0], results[1])
+        self.assertEqual(self.loaded.count("slow"), 1)
+
+    def test_failed_load_is_retried(self):
+        """Test a loader error reaches the caller and the next get tries again."""
+        attempts = []
+
+        def load(session_id):
+            attempts.append(session_id)
+            if len(attempts) == 1:
+                raise OSError("disk unavailable")
+            return self._load(session_id)
+
+        registry = SessionRegistry(loader=load)
+        with self.assertRaises(OSError):
+            registry.get("a")
+        self.assertEqual(registry.get("a"), {"id": "a"})
+
+    def test_flush_all(self):
+        """Test flush evicts every session."""
+        self.registry.get("a")
+        self.registry.get("b")
+        self.registry.flush_all()
+        self.assertEqual(len(self.registry), 0)
+        self.assertEqual(len(self.evicted), 2)
+
+    def test_session_id_validation(self):
+        """Test unsafe session IDs are rejected."""
+        self.assertTrue(is_valid_session_id("3f2b9c1e-aaaa-4bbb-8ccc-1234567890ab"))
+        self.assertFalse(is_valid_session_id("../player_state"))
+        self.assertFalse(is_valid_session_id(""))
+
+
+if __name__ == "__main__":
+    unittest.main()
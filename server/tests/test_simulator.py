@@ -0,0 +1,73 @@
+"""
+Test suite for the balance simulator.
+Tests seeded determinism and result aggregation.
+"""
+
+import random
+import unittest
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from engine.content_store import ContentStore
+from engine.simulator import BalanceSimulator, PlayerBuild, make_builds
+
+
+class TestBalanceSimulator(unittest.TestCase):
+    """Test cases for BalanceSimulator."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.settings = {
+            "scaling": {"hp_per_point": 5, "mp_per_point": 5, "other_stats_per_point": 1},
+            "experience": {"exp_per_node": 10, "level_up_threshold": 100, "threshold_increase_per_level": 50},
+            "player": {"level_up_points": 2}
+        }
+        content = ContentStore(
+            nodes={},
+            enemies=[{"id": "wolf_01", "name": "Wolf", "hp": 30, "attack_power": 9, "defence": 2, "exp_reward": 25,
+                      "difficulty": 2, "loot_table": [{"item_id": "dagger_01", "chance": 0.3}]}],
+            items=[{"id": "dagger_01", "name": "Rusty Dagger", "type": "weapon", "effect": {"strength": 2}}]
+        )
+        self.simulator = BalanceSimulator(self.settings, content)
+        self.build = PlayerBuild("base", {"hp": 50, "strength": 5, "defence": 5, "agility": 5, "vitality": 5})
+
+    def test_seeded_runs_are_reproducible(self):
+        """Test the same seed gives identical aggregates, independent of global RNG."""
+        first = self.simulator.run([self.build], ["wolf_01"], fights=300, seed=7, chunk_size=100)[0]
+        random.random()
+        second = self.simulator.run([self.build], ["wolf_01"], fights=300, seed=7, chunk_size=100)[0]
+        self.assertEqual(first.to_dict(), second.to_dict())
+        self.assertEqual(first.fights, 300)
+
+    def test_aggregates(self):
+        """Test reported metrics are consistent."""
+        result = self.simulator.run([self.build], ["wolf_01"], fights=200, seed=1)[0]
+        self.assertGreater(result.win_rate, 0.9)
+        self.assertGreater(result.mean_turns, 1)
+        self.assertEqual(result.total_xp, result.wins * 25)
+        self.assertGreater(result.xp_per_minute, 0)
+
+    def test_equipment_is_resolved_by_id(self):
+        """Test equipped item IDs shorten fights."""
+        armed = PlayerBuild("armed", dict(self.build.stats), {"weapon": "dagger_01"})
+        unarmed_result, armed_result = self.simulator.run([self.build, armed], ["wolf_01"], fights=200, seed=3)
+        self.assertLess(armed_result.mean_turns, unarmed_result.mean_turns)
+
+    def test_unknown_enemy(self):
+        """Test unknown enemy IDs are rejected up front."""
+        with self.assertRaises(ValueError):
+            self.simulator.run([self.build], ["dragon_01"], fights=1)
+
+    def test_default_builds_spend_points(self):
+        """Test focus builds spend every free point."""
+        builds = make_builds(self.settings, {"free_stat_points": 5, "hp": 50, "strength": 5, "agility": 5})
+        brute = next(build for build in builds if build.name == "brute")
+        self.assertEqual(brute.stats["strength"], 10)
+        self.assertEqual(brute.stats["free_stat_points"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+"""
+Test suite for StateManager persistence.
+Tests per-player saves and write-behind coalescing.
+"""
+
+import json
+import unittest
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from tests.persistence_case import PersistenceTestCase
+
+
+class TestWriteBehindPersistence(PersistenceTestCase):
+    """Test cases for write-behind saves."""
+
+    # Long interval so only explicit flushes write
+    persistence = {"mode": "write_behind", "flush_interval_seconds": 3600}
+
+    def test_saves_are_deferred_and_coalesced(self):
+        """Test repeated saves produce one write with the latest state."""
+        path = self.state_manager.get_player_state_path("p1")
+        state = self.state_manager.load_player_state("p1")
+        for hp in (40, 30, 20):
+            state["stats"]["hp"] = hp
+            self.state_manager.save_player_state(state, "p1")
+
+        self.assertFalse(path.exists())
+        self.state_manager.flush()
+
+        with open(path) as f:
+            self.assertEqual(json.load(f)["stats"]["hp"], 20)
+        self.assertEqual(list(path.parent.glob("*.tmp")), [])
+
+    def test_load_sees_pending_save(self):
+        """Test a reload before flushing returns the dirty state."""
+        state = self.state_manager.load_player_state("p1")
+        state["current_node"] = "village_square"
+        self.state_manager.save_player_state(state, "p1")
+
+        reloaded = self.state_manager.load_player_state("p1")
+        self.assertEqual(reloaded["current_node"], "village_square")
+
+    def test_flush_writes_state_as_of_the_save(self):
+        """Test changes made after a save (e.g. a half-applied choice) are not flushed with it."""
+        path = self.state_manager.get_player_state_path("p1")
+        state = self.state_manager.load_player_state("p1")
+        state["stats"]["hp"] = 40
+        self.state_manager.save_player_state(state, "p1")
+
+        state["stats"]["hp"] = 1
+        state["inventory"].append({"name": "Torch"})
+        self.state_manager.flush()
+        with open(path) as f:
+            saved = json.load(f)
+        self.assertEqual(saved["stats"]["hp"], 40)
+        self.assertEqual(saved["inventory"], [])
+
+    def test_delete_discards_pending_save(self):
+        """Test deleting a save drops any unflushed changes."""
+        state = self.state_manager.load_player_state("p1")
+        state["stats"]["hp"] = 1
+        self.state_manager.save_player_state(state, "p1")
+        self.state_manager.delete_player_state("p1")
+
+        fresh = self.state_manager.load_player_state("p1")
+        self.assertEqual(fresh["stats"]["hp"], 50)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+"""
+Test suite for StatBlock.
+Tests dict compatibility, named accessors, and lossless round trips.
+"""
+
+import copy
+import json
+import unittest
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from engine.rules import RulesEngine
+from engine.stats import StatBlock, json_default
+
+
+class TestStatBlock(unittest.TestCase):
+    """Test cases for StatBlock."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.raw = {
+            "level": 1,
+            "experience": 0,
+            "free_stat_points": 5,
+            "hp": 50,
+            "mp": 25,
+            "strength": 5,
+            "defence": 5,
+            "vitality": 5,
+            "wisdom": 5,
+            "agility": 5,
+            "perception": 5,
+            "lifeforce": 100
+        }
+        self.stats = StatBlock.from_dict(self.raw)
+
+    def test_round_trip_is_lossless(self):
+        """Test converting back yields the same dict, in save-file order."""
+        self.assertEqual(self.stats.to_dict(), self.raw)
+        self.assertEqual(list(self.stats.to_dict()), list(self.raw))
+        self.assertEqual(json.loads(json.dumps(self.stats, default=json_default)), self.raw)
+
+    def test_unknown_and_non_int_stats_are_kept(self):
+        """Test stats outside the fixed layout survive a round trip."""
+        raw = {"hp": 10, "luck": 3, "strength": 2.5}
+        stats = StatBlock(raw)
+        self.assertEqual(stats.to_dict(), {"hp": 10, "strength": 2.5, "luck": 3})
+        self.assertEqual(stats.get("luck"), 3)
+
+    def test_presence_matches_dict_semantics(self):
+        """Test missing stats behave like missing dict keys."""
+        stats = StatBlock({"defence": 3})
+        self.assertNotIn("strength", stats)
+        self.assertEqual(stats.get("strength", 5), 5)
+        self.assertEqual(stats.strength, 0)
+        with self.assertRaises(KeyError):
+            stats["strength"]
+
+    def test_named_accessors(self):
+        """Test attribute accessors read and write the same slots."""
+        self.stats.hp -= 10
+        self.assertEqual(self.stats["hp"], 40)
+        self.stats["strength"] += 2
+        self.assertEqual(self.stats.strength, 7)
+
+    def test_named_accessors_read_non_int_values(self):
+        """Test attributes agree with item access for non-int and out-of-range values."""
+        stats = StatBlock({"hp": 10})
+        stats["hp"] = 2.5
+        self.assertEqual(stats.hp, 2.5)
+        self.assertEqual(StatBlock({"mp": 2 ** 70}).mp, 2 ** 70)
+        stats.hp = 7
+        self.assertEqual((stats.hp, stats["hp"]), (7, 7))
+
+    def test_rules_engine_accepts_stat_block(self):
+        """Test the rules engine works unchanged on a StatBlock."""
+        rules = RulesEngine({
+            "scaling": {"hp_per_point": 5, "mp_per_point": 5, "other_stats_per_point": 1},
+            "experience": {"exp_per_node": 10, "level_up_threshold": 100, "threshold_increase_per_level": 50},
+            "player": {"level_up_points": 2}
+        })
+        self.assertTrue(rules.allocate_stat_point(self.stats, "strength"))
+        self.assertFalse(rules.allocate_stat_point(StatBlock({"free_stat_points": 1}), "strength"))
+        self.assertTrue(rules.add_experience(self.stats, 100))
+        self.assertEqual(self.stats.level, 2)
+        self.assertEqual(rules.calculate_damage(self.stats, StatBlock({"defence": 5})), 6)
+
+    def test_copy_is_independent(self):
+        """Test copies do not share storage."""
+        clone = copy.deepcopy(self.stats)
+        clone.hp = 1
+        self.assertEqual(self.stats.hp, 50)
+        self.assertEqual(self.stats.copy(), self.stats)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+"""
+Test suite for the vectorized combat kernel.
+Tests that batch results statistically match the scalar CombatEngine.
+"""
+
+import unittest
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from engine.combat_engine import CombatAction
+from engine.content_store import ContentStore
+from engine.simulator import BalanceSimulator, PlayerBuild
+from engine.vector_combat import VectorCombatKernel, np
+
+
+@unittest.skipIf(np is None, "numpy not installed")
+class TestVectorCombatKernel(unittest.TestCase):
+    """Test cases for VectorCombatKernel."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.settings = {
+            "scaling": {"hp_per_point": 5, "mp_per_point": 5, "other_stats_per_point": 1},
+            "experience": {"exp_per_node": 10, "level_up_threshold": 100, "threshold_increase_per_level": 50},
+            "player": {"level_up_points": 2}
+        }
+        self.bandit = {"id": "bandit_01", "name": "Highwayman", "hp": 45, "attack_power": 11,
+                       "defence": 4, "exp_reward": 40, "difficulty": 3}
+        self.stats = {"hp": 50, "strength": 5, "defence": 5, "agility": 5, "vitality": 5}
+        self.kernel = VectorCombatKernel()
+
+    def test_matches_scalar_engine(self):
+        """Test win rate and turn count agree with the scalar simulator."""
+        content = ContentStore(nodes={}, enemies=[self.bandit], items=[])
+        scalar = BalanceSimulator(self.settings, content).run(
+            [PlayerBuild("base", self.stats)], ["bandit_01"], fights=4000, seed=11)[0]
+        vector = self.kernel.run(self.stats, self.bandit, n=20000, seed=11)
+
+        self.assertAlmostEqual(vector.win_rate, scalar.win_rate, delta=0.04)
+        self.assertAlmostEqual(vector.mean_turns, scalar.mean_turns, delta=0.2)
+
+    def test_deterministic_damage_is_exact(self):
+        """Test a fight with no enemy randomness in play resolves exactly."""
+        outcome = self.kernel.run({"strength": 10}, {"hp": 45, "defence": 5, "attack_power": 1}, n=10)
+        # 10 damage per hit -> 5 turns, every time
+        self.assertTrue(outcome.victory.all())
+        self.assertTrue((outcome.turns == 5).all())
+
+    def test_flee(self):
+        """Test fleeing ends fights without victory."""
+        outcome = self.kernel.run({"agility": 30}, self.bandit, n=1000, action=CombatAction.FLEE)
+        self.assertFalse(outcome.victory.any())
+        self.assertTrue(outcome.fled.all())
+
+    def test_sweep_over_grid(self):
+        """Test a stat grid sweep reports one row per grid point, improving with strength."""
+        rows = self.kernel.sweep(self.bandit, {"strength": [5, 10, 15]}, self.stats, fights_per_point=2000)
+        self.assertEqual([row["strength"] for row in rows], [5, 10, 15])
+        self.assertLess(rows[0]["win_rate"], rows[1]["win_rate"])
+        self.assertEqual(rows[2]["win_rate"], 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()